@@ -0,0 +1,168 @@
+import heapq, threading
+import numpy as np
+from .storage import load_improvements
+from .weight_store import get_store
+from .templates import get_library
+
+class ArmStats:
+    """Per-arm pull counts and reward sums, kept in arrays aligned with the weight store."""
+
+    def __init__(self, n_arms: int = 0):
+        self.counts = np.zeros(n_arms)
+        self.rewards = np.zeros(n_arms)
+        self.successes = np.zeros(n_arms)
+        self.failures = np.zeros(n_arms)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def grow(self, n_arms: int):
+        extra = n_arms - len(self)
+        if extra > 0:
+            for name in ("counts", "rewards", "successes", "failures"):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+
+    def update(self, arms, rewards):
+        arms = np.atleast_1d(np.asarray(arms, dtype=int))
+        rewards = np.atleast_1d(np.asarray(rewards, dtype=float))
+        np.add.at(self.counts, arms, 1)
+        np.add.at(self.rewards, arms, rewards)
+        np.add.at(self.successes, arms, rewards > 0)
+        np.add.at(self.failures, arms, rewards <= 0)
+
+    @property
+    def total(self) -> float:
+        return float(self.counts.sum())
+
+    def means(self) -> np.ndarray:
+        return np.divide(self.rewards, self.counts, out=np.zeros(len(self)), where=self.counts > 0)
+
+    def subset(self, arms: np.ndarray) -> "ArmStats":
+        sub = ArmStats()
+        for name in ("counts", "rewards", "successes", "failures"):
+            setattr(sub, name, getattr(self, name)[arms])
+        return sub
+
+class EpsilonGreedy:
+    name = "epsilon_greedy"
+    uses_weights = True  # exploits the tuned weights rather than raw means
+
+    def __init__(self, epsilon: float = 0.1):
+        self.epsilon = epsilon
+
+    def select(self, stats: ArmStats, k: int = 1, values=None, rng=None) -> np.ndarray:
+        rng = rng or np.random.default_rng()
+        values = stats.means() if values is None else values
+        picks = np.full(k, int(np.argmax(values)))
+        explore = rng.random(k) < self.epsilon
+        picks[explore] = rng.integers(len(values), size=int(explore.sum()))
+        return picks
+
+class UCB1:
+    name = "ucb1"
+    uses_weights = False
+
+    def __init__(self, c: float = 2.0):
+        self.c = c
+
+    def select(self, stats: ArmStats, k: int = 1, values=None, rng=None) -> np.ndarray:
+        counts, means = stats.counts.copy(), stats.means()
+        total = max(stats.total, 1.0)
+        with np.errstate(divide="ignore"):
+            bonus = np.sqrt(self.c * np.log(total + k) / counts)
+        ucb = np.where(counts > 0, means + bonus, np.inf)
+        if k == 1:
+            return np.array([int(np.argmax(ucb))])
+        # Batched picks: each pick counts as a virtual pull so concurrent users spread over arms
+        heap = [(-u, i) for i, u in enumerate(ucb)]
+        heapq.heapify(heap)
+        picks = []
+        for _ in range(k):
+            _, i = heapq.heappop(heap)
+            picks.append(i)
+            counts[i] += 1
+            heapq.heappush(heap, (-(means[i] + np.sqrt(self.c * np.log(total + k) / counts[i])), i))
+        return np.array(picks)
+
+class ThompsonSampling:
+    name = "thompson"
+    uses_weights = False
+
+    def __init__(self, prior_successes: float = 1.0, prior_failures: float = 1.0):
+        self.prior_successes = prior_successes
+        self.prior_failures = prior_failures
+
+    def select(self, stats: ArmStats, k: int = 1, values=None, rng=None) -> np.ndarray:
+        rng = rng or np.random.default_rng()
+        samples = rng.beta(stats.successes + self.prior_successes, stats.failures + self.prior_failures,
+                           size=(k, len(stats)))
+        return samples.argmax(axis=1)
+
+POLICIES = {p.name: p for p in (EpsilonGreedy, UCB1, ThompsonSampling)}
+
+def make_policy(name: str = "epsilon_greedy", **params):
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy '{name}'. Choose from: {', '.join(POLICIES)}")
+    return POLICIES[name](**params)
+
+class BanditEngine:
+    """Selects arms from the weight store with a pluggable policy and tracks per-arm rewards."""
+
+    def __init__(self, store=None):
+        self.store = store or get_store()
+        self.stats = ArmStats(len(self.store))
+        self.rng = np.random.default_rng()
+        self._lock = threading.Lock()
+        self._bootstrap()
+
+    def _bootstrap(self):
+        # One vectorized pass over the improvement log rebuilds counts and rewards
+        log = load_improvements()
+        if log.empty:
+            return
+        arms = log["suggestion_id"].astype(str).map(self.store.index)
+        known = arms.notna()
+        self.stats.update(arms[known].astype(int).to_numpy(), log.loc[known, "reward"].to_numpy(dtype=float))
+
+    def select(self, k: int = 1, policy=None, values=None) -> list:
+        policy = policy or EpsilonGreedy()
+        with self._lock:
+            if not len(self.store):
+                return []
+            self.stats.grow(len(self.store))
+            if values is None and policy.uses_weights:
+                values = self.store.weights
+            active = get_library().active_mask()
+            if active.all():
+                picks = policy.select(self.stats, k, values=values, rng=self.rng)
+            else:
+                # Soft-deleted templates are left out; picks map back to store positions
+                arms = np.flatnonzero(active)
+                if not len(arms):
+                    return []
+                sub_values = None if values is None else np.asarray(values)[arms]
+                picks = arms[policy.select(self.stats.subset(arms), k, values=sub_values, rng=self.rng)]
+        return [self.store.row(int(i)) for i in picks]
+
+    def update(self, suggestion_id: str, reward: float):
+        self.update_many([suggestion_id], [reward])
+
+    def update_many(self, suggestion_ids: list, rewards: list):
+        with self._lock:
+            pairs = [(self.store.index.get(sid), r) for sid, r in zip(suggestion_ids, rewards)]
+            pairs = [(i, r) for i, r in pairs if i is not None]
+            if not pairs:
+                return
+            self.stats.grow(len(self.store))
+            arms, values = zip(*pairs)
+            self.stats.update(arms, values)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> BanditEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = BanditEngine()
+        return _engine
@@ -0,0 +1,196 @@
+import os, re, zlib, time, atexit, threading
+import numpy as np
+from .storage import DATA_DIR, load_feedback
+from .weight_store import get_store
+from .templates import get_library
+
+LINUCB_NPZ = os.path.join(DATA_DIR, "linucb.npz")
+_WORD = re.compile(r"[a-z0-9']+")
+
+def featurize(texts, dim: int = 64) -> np.ndarray:
+    """Hashed bag-of-words rows; column 0 is a bias term, the rest are L2-normalised word counts."""
+    if isinstance(texts, str):
+        texts = [texts]
+    X = np.zeros((len(texts), dim))
+    for r, text in enumerate(texts):
+        for word in _WORD.findall(str(text or "").lower()):
+            h = zlib.crc32(word.encode("utf-8"))
+            X[r, 1 + h % (dim - 1)] += -1.0 if h & 0x80000000 else 1.0
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    X = np.divide(X, norms, out=X, where=norms > 0)
+    X[:, 0] = 1.0
+    return X
+
+class LinUCB:
+    """Disjoint LinUCB: one ridge regression per arm, stored as stacked inverse Gram matrices.
+
+    Only arms that have been updated get a slot; an arm never observed still has
+    A_inv = I and theta = 0, so its score is alpha * ||x|| and needs no storage.
+    Slots grow by doubling, so adding arms never copies the model.
+    """
+
+    name = "linucb"
+    uses_weights = False
+
+    def __init__(self, n_arms: int = 0, dim: int = 64, alpha: float = 1.0):
+        self.dim, self.alpha = dim, alpha
+        self.n_arms = n_arms
+        self.slots = {}  # arm -> slot
+        self.arms = np.zeros(0, dtype=int)  # slot -> arm
+        self.A_inv = np.zeros((0, dim, dim))
+        self.b = np.zeros((0, dim))
+        self.theta = np.zeros((0, dim))
+        self.counts = np.zeros(0, dtype=np.int64)  # updates per slot
+
+    def __len__(self):
+        return self.n_arms
+
+    def grow(self, n_arms: int):
+        self.n_arms = max(self.n_arms, n_arms)
+
+    def observed(self) -> int:
+        return len(self.slots)
+
+    def _slot(self, arm: int) -> int:
+        slot = self.slots.get(arm)
+        if slot is not None:
+            return slot
+        slot = len(self.slots)
+        if slot == len(self.arms):
+            capacity = max(8, 2 * slot)
+            self.arms = np.resize(self.arms, capacity)
+            self.A_inv = np.concatenate([self.A_inv, np.zeros((capacity - slot, self.dim, self.dim))])
+            self.b = np.concatenate([self.b, np.zeros((capacity - slot, self.dim))])
+            self.theta = np.concatenate([self.theta, np.zeros((capacity - slot, self.dim))])
+            self.counts = np.concatenate([self.counts, np.zeros(capacity - slot, dtype=np.int64)])
+        self.A_inv[slot] = np.eye(self.dim)
+        self.arms[slot] = arm
+        self.slots[arm] = slot
+        self.n_arms = max(self.n_arms, arm + 1)
+        return slot
+
+    def scores(self, X: np.ndarray) -> np.ndarray:
+        """Upper confidence bound of every arm for each context row, shape (contexts, arms)."""
+        X = np.atleast_2d(X)
+        out = np.repeat(self.alpha * np.linalg.norm(X, axis=1, keepdims=True), self.n_arms, axis=1)
+        m, d = self.observed(), self.dim
+        if m:
+            # One (m*d, d) matrix product gives A_inv @ x for every observed arm and context at once
+            AX = (self.A_inv[:m].reshape(m * d, d) @ X.T).reshape(m, d, len(X))
+            width = np.einsum("nds,sd->sn", AX, X)
+            out[:, self.arms[:m]] = X @ self.theta[:m].T + self.alpha * np.sqrt(np.maximum(width, 0.0))
+        return out
+
+    def select(self, stats=None, k: int = 1, values=None, rng=None, context=None) -> np.ndarray:
+        X = np.atleast_2d(context if context is not None else featurize([""] * k, self.dim))
+        if len(X) == 1 and k > 1:
+            X = np.repeat(X, k, axis=0)
+        return self.scores(X).argmax(axis=1)
+
+    def update(self, arm: int, x: np.ndarray, reward: float):
+        slot = self._slot(int(arm))
+        # Sherman-Morrison rank-1 update of the inverse Gram matrix
+        A_inv = self.A_inv[slot]
+        Ax = A_inv @ x
+        A_inv -= np.outer(Ax, Ax) / (1.0 + x @ Ax)
+        self.b[slot] += reward * x
+        self.theta[slot] = A_inv @ self.b[slot]
+        self.counts[slot] += 1
+
+    def set_arm(self, arm: int, A_inv: np.ndarray, b: np.ndarray, theta: np.ndarray, count: int):
+        slot = self._slot(int(arm))
+        self.A_inv[slot], self.b[slot], self.theta[slot] = A_inv, b, theta
+        self.counts[slot] = count
+
+class ContextualModel:
+    """LinUCB aligned with the weight store, saved to linucb.npz periodically and at exit."""
+
+    def __init__(self, dim: int = 64, alpha: float = 1.0, save_every: int = 50, save_interval: float = 30.0):
+        self.store = get_store()
+        self.save_every, self.save_interval = save_every, save_interval
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._last_save = time.monotonic()
+        self.model = self._load(dim, alpha)
+
+    def _load(self, dim, alpha) -> LinUCB:
+        model = LinUCB(len(self.store), dim, alpha)
+        if os.path.exists(LINUCB_NPZ):
+            saved = np.load(LINUCB_NPZ, allow_pickle=False)
+            if saved["A_inv"].shape[-1] == dim:
+                A_inv, b, theta = saved["A_inv"], saved["b"], saved["theta"]
+                if "counts" in saved:
+                    counts = saved["counts"]
+                else:
+                    # Older files saved every arm without counts; an arm was updated iff its A_inv moved off I
+                    moved = np.abs(A_inv - np.eye(dim)).reshape(len(A_inv), -1).max(axis=1, initial=0.0) > 0
+                    counts = moved.astype(np.int64)
+                for j, sid in enumerate(saved["ids"].astype(str)):
+                    i = self.store.index.get(sid)
+                    if i is not None and counts[j] > 0:
+                        model.set_arm(i, A_inv[j], b[j], theta[j], int(counts[j]))
+                return model
+        # No saved model yet: learn from the feedback log in one pass
+        log = load_feedback()
+        if not log.empty:
+            arms = log["suggestion_id"].astype(str).map(self.store.index)
+            known = arms.notna().to_numpy()
+            X = featurize(log.loc[known, "user_text"].fillna("").tolist(), dim)
+            for arm, x, reward in zip(arms[known].astype(int), X, log.loc[known, "feedback"].to_numpy(dtype=float)):
+                model.update(arm, x, reward)
+            # Saved at the next checkpoint, which also marks the contextual policy as in use
+            self._dirty = int(known.sum())
+        return model
+
+    def save(self):
+        with self._lock:
+            tmp = LINUCB_NPZ + ".tmp.npz"
+            m = self.model.observed()
+            np.savez(tmp, ids=np.array([self.store.ids[i] for i in self.model.arms[:m]], dtype=str),
+                     A_inv=self.model.A_inv[:m], b=self.model.b[:m], theta=self.model.theta[:m],
+                     counts=self.model.counts[:m])
+            os.replace(tmp, LINUCB_NPZ)
+            self._dirty = 0
+            self._last_save = time.monotonic()
+
+    def select(self, user_text: str, k: int = 1) -> list:
+        with self._lock:
+            self.model.grow(len(self.store))
+            if not len(self.model):
+                return []
+            X = np.repeat(featurize(user_text, self.model.dim), k, axis=0)
+            scores = self.model.scores(X)
+            active = get_library().active_mask()
+            if not active.any():
+                return []
+            scores[:, ~active] = -np.inf
+            picks = scores.argmax(axis=1)
+        return [self.store.row(int(i)) for i in picks]
+
+    def update(self, suggestion_id: str, user_text: str, reward: float):
+        i = self.store.index.get(suggestion_id)
+        if i is None:
+            return
+        with self._lock:
+            self.model.grow(len(self.store))
+            self.model.update(i, featurize(user_text, self.model.dim)[0], reward)
+            self._dirty += 1
+            due = self._dirty >= self.save_every or time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_contextual_model(create: bool = True):
+    """The shared contextual model. With create=False, None until the contextual policy is in use:
+    selected in this process, or saved by an earlier one. Until then clicks skip it, and its
+    first use learns them back from feedback.csv."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            if not create and not os.path.exists(LINUCB_NPZ):
+                return None
+            _model = ContextualModel()
+            atexit.register(lambda: _model._dirty and _model.save())
+        return _model
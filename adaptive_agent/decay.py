@@ -0,0 +1,146 @@
+import math, time, threading
+import numpy as np, pandas as pd
+from .storage import load_improvements
+from .weight_store import get_store
+
+def _epoch_seconds(timestamps) -> np.ndarray:
+    # improvement_log timestamps are naive UTC ISO strings
+    ts = pd.to_datetime(pd.Series(timestamps), format="ISO8601")
+    return ((ts - pd.Timestamp("1970-01-01")) / pd.Timedelta(seconds=1)).to_numpy(dtype=float)
+
+class DecayedStats:
+    """Per-suggestion reward statistics that forget old feedback.
+
+    Exponential decay: each arm keeps a reward sum and a count that are decayed
+    lazily from the time of its last update, so an update is O(1) and reading
+    every arm is one vectorized pass. Sliding window: rewards and counts are
+    also kept in a ring of time buckets covering the last window_hours.
+    """
+
+    def __init__(self, store=None, half_life_hours: float = 24.0, window_hours: float = 24.0,
+                 bucket_minutes: float = 60.0):
+        self.store = store or get_store()
+        self._lock = threading.Lock()
+        self._configure(half_life_hours, window_hours, bucket_minutes)
+        self.recompute()
+
+    def _configure(self, half_life_hours, window_hours, bucket_minutes):
+        self.half_life_hours, self.window_hours, self.bucket_minutes = half_life_hours, window_hours, bucket_minutes
+        self.rate = math.log(2) / (half_life_hours * 3600)
+        self.bucket_seconds = bucket_minutes * 60
+        self.n_buckets = max(1, math.ceil(window_hours * 60 / bucket_minutes))
+
+    def _reset(self, n_arms: int):
+        self.sums = np.zeros(n_arms)
+        self.counts = np.zeros(n_arms)
+        self.last = np.zeros(n_arms)
+        self.bucket_rewards = np.zeros((n_arms, self.n_buckets))
+        self.bucket_counts = np.zeros((n_arms, self.n_buckets))
+        self.bucket_ids = np.full(self.n_buckets, -1, dtype=np.int64)
+
+    def grow(self, n_arms: int):
+        extra = n_arms - len(self.sums)
+        if extra > 0:
+            for name in ("sums", "counts", "last"):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+            for name in ("bucket_rewards", "bucket_counts"):
+                setattr(self, name, np.vstack([getattr(self, name), np.zeros((extra, self.n_buckets))]))
+
+    def recompute(self, half_life_hours: float = None, window_hours: float = None, bucket_minutes: float = None,
+                  now: float = None):
+        """Rebuild everything from improvement_log.csv in one pass, optionally with new parameters."""
+        log = load_improvements()
+        now = time.time() if now is None else now
+        with self._lock:
+            self._configure(half_life_hours or self.half_life_hours, window_hours or self.window_hours,
+                            bucket_minutes or self.bucket_minutes)
+            self._reset(len(self.store))
+            if log.empty:
+                return
+            arms = log["suggestion_id"].astype(str).map(self.store.index)
+            known = arms.notna().to_numpy()
+            if not known.any():
+                return
+            arms = arms[known].astype(int).to_numpy()
+            rewards = log.loc[known, "reward"].to_numpy(dtype=float)
+            t = _epoch_seconds(log.loc[known, "timestamp"])
+
+            decay = np.exp(-self.rate * np.maximum(now - t, 0.0))
+            np.add.at(self.sums, arms, rewards * decay)
+            np.add.at(self.counts, arms, decay)
+            self.last[:] = now
+
+            buckets = np.floor(t / self.bucket_seconds).astype(np.int64)
+            current = int(now // self.bucket_seconds)
+            recent = buckets > current - self.n_buckets
+            slots = buckets[recent] % self.n_buckets
+            np.add.at(self.bucket_rewards, (arms[recent], slots), rewards[recent])
+            np.add.at(self.bucket_counts, (arms[recent], slots), 1)
+            for b in np.unique(buckets[recent]):
+                self.bucket_ids[b % self.n_buckets] = b
+
+    def _advance_bucket(self, bucket: int) -> int:
+        slot = bucket % self.n_buckets
+        if self.bucket_ids[slot] != bucket:
+            self.bucket_rewards[:, slot] = 0
+            self.bucket_counts[:, slot] = 0
+            self.bucket_ids[slot] = bucket
+        return slot
+
+    def update(self, suggestion_id: str, reward: float, t: float = None):
+        self.update_many([suggestion_id], [reward], t)
+
+    def update_many(self, suggestion_ids: list, rewards: list, t: float = None):
+        t = time.time() if t is None else t
+        with self._lock:
+            self.grow(len(self.store))
+            slot = self._advance_bucket(int(t // self.bucket_seconds))
+            for sid, reward in zip(suggestion_ids, rewards):
+                i = self.store.index.get(sid)
+                if i is None:
+                    continue
+                decay = math.exp(-self.rate * max(t - self.last[i], 0.0))
+                self.sums[i] = self.sums[i] * decay + reward
+                self.counts[i] = self.counts[i] * decay + 1
+                self.last[i] = t
+                self.bucket_rewards[i, slot] += reward
+                self.bucket_counts[i, slot] += 1
+
+    # Reads
+    def decayed(self, now: float = None):
+        """(reward sums, counts) decayed to now."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.grow(len(self.store))
+            decay = np.exp(-self.rate * np.maximum(now - self.last, 0.0))
+            return self.sums * decay, self.counts * decay
+
+    def means(self, now: float = None) -> np.ndarray:
+        """Decayed mean reward per suggestion in [-1, 1]; 0 for suggestions without recent feedback."""
+        sums, counts = self.decayed(now)
+        return np.divide(sums, counts, out=np.zeros(len(sums)), where=counts > 1e-9)
+
+    def window(self, now: float = None):
+        """(reward sums, counts) over the last window_hours."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.grow(len(self.store))
+            live = self.bucket_ids > int(now // self.bucket_seconds) - self.n_buckets
+            return self.bucket_rewards[:, live].sum(axis=1), self.bucket_counts[:, live].sum(axis=1)
+
+    def frame(self, now: float = None) -> pd.DataFrame:
+        sums, counts = self.decayed(now)
+        window_rewards, window_counts = self.window(now)
+        return pd.DataFrame({"suggestion_id": self.store.ids[:len(sums)], "decayed_mean": self.means(now),
+                             "decayed_count": counts, "window_count": window_counts,
+                             "window_reward": window_rewards})
+
+_decayed = None
+_decayed_lock = threading.Lock()
+
+def get_decayed_stats() -> DecayedStats:
+    global _decayed
+    with _decayed_lock:
+        if _decayed is None:
+            _decayed = DecayedStats()
+        return _decayed
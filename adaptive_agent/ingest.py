@@ -0,0 +1,203 @@
+import os, glob, json, time, queue, atexit, logging, datetime, threading
+from .storage import DATA_DIR, _ensure_dir, log_feedback_rows
+from .tuner import update_weights
+from .weight_store import FileLock, get_store
+
+logger = logging.getLogger(__name__)
+
+class FeedbackIngestor:
+    """Accept/Reject clicks queued in memory and applied in micro-batches by a background thread.
+
+    submit() appends the click to a per-process write-ahead file and enqueues it,
+    so the click path is one small write. The consumer drains whatever arrives
+    within `window` seconds and applies the batch in two stages: the rewards
+    with update_weights (coalesced per suggestion), then the feedback rows in
+    one append. After each stage a marker line naming the stage and the batch's
+    event range goes into the write-ahead file, so a failed stage is retried
+    alone, and replaying the file of a process that died skips stages it
+    finished. A stage that still fails after `retries` further attempts is
+    appended to the dead-letter file with the stages still pending for the
+    batch, and the batch is counted as handled, so flush() returns and the
+    write-ahead file is truncated past it.
+    """
+
+    STAGES = ("weights", "log")
+
+    def __init__(self, window: float = 0.05, max_batch: int = 1000, alpha: float = 0.1,
+                 retries: int = 2, retry_delay: float = 0.1):
+        _ensure_dir()
+        self.window, self.max_batch, self.alpha = window, max_batch, alpha
+        self.retries, self.retry_delay = retries, retry_delay
+        self.wal_path = os.path.join(DATA_DIR, f"ingest-{os.getpid()}.wal")
+        self.dead_letter_path = os.path.join(DATA_DIR, "ingest-dead-letter.jsonl")
+        # Held for the life of the process so others know this write-ahead file is live
+        self._wal_lock = FileLock(self.wal_path + ".lock")
+        self._wal_lock.acquire()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._submitted = self._applied = 0
+        self._queue = queue.Queue()
+        self._recover()
+        self._wal = open(self.wal_path, "ab")
+        self._thread = threading.Thread(target=self._run, name="feedback-ingestor", daemon=True)
+        self._thread.start()
+
+    def submit(self, suggestion_id: str, user_text: str, suggestion_text: str, reward: int, user_id: str = None):
+        event = [datetime.datetime.utcnow().isoformat(), suggestion_id, user_text, suggestion_text, reward, user_id]
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._wal.write(line)
+            self._wal.flush()
+            # Events are numbered by their position in the write-ahead file, which markers refer to
+            self._queue.put((self._submitted, event))
+            self._submitted += 1
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until everything submitted so far has been applied."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._applied >= self._submitted, timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        with self._lock:
+            self._wal.close()
+            if self._applied >= self._submitted:
+                os.remove(self.wal_path)
+        self._wal_lock.release()
+        try:
+            os.remove(self.wal_path + ".lock")
+        except OSError:
+            pass
+
+    # Consumer
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, deadline = [item], time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._process(batch, self._mark_live)
+            with self._idle:
+                self._applied += len(batch)
+                if self._applied >= self._submitted:
+                    self._wal.truncate(0)
+                    self._submitted = self._applied = 0
+                self._idle.notify_all()
+
+    def _mark_live(self, marker: dict):
+        with self._lock:
+            self._wal.write((json.dumps(marker) + "\n").encode("utf-8"))
+            self._wal.flush()
+
+    def _process(self, batch: list, mark, done: dict = None):
+        """Run each stage over the (position, event) pairs it has not seen, marking it done after it succeeds"""
+        start, end = batch[0][0], batch[-1][0] + 1
+        for k, stage in enumerate(self.STAGES):
+            events = [event for i, event in batch if not (done and i in done[stage])]
+            if events and not self._run_stage(stage, events):
+                pending = {s: [event for i, event in batch if not (done and i in done[s])]
+                           for s in self.STAGES[k:]}
+                self._dead_letter(pending)
+                for s in self.STAGES[k:]:
+                    mark({"done": s, "start": start, "end": end, "dead_letter": True})
+                return
+            mark({"done": stage, "start": start, "end": end})
+
+    def _run_stage(self, stage: str, events: list) -> bool:
+        for attempt in range(self.retries + 1):
+            try:
+                self._apply(stage, events)
+                return True
+            except Exception:
+                if attempt < self.retries:
+                    logger.warning("Feedback %s stage failed for %d events, retrying", stage, len(events), exc_info=True)
+                    time.sleep(self.retry_delay * (attempt + 1))
+                else:
+                    logger.exception("Feedback %s stage failed for %d events; moving them to %s",
+                                     stage, len(events), self.dead_letter_path)
+        return False
+
+    def _apply(self, stage: str, events: list):
+        # Weights first: the contextual model bootstraps from feedback.csv on first use
+        if stage == "weights":
+            update_weights([(sid, reward, user_text, user_id)
+                            for _, sid, user_text, _, reward, user_id in events], alpha=self.alpha)
+        else:
+            log_feedback_rows([event[:5] for event in events])
+
+    def _dead_letter(self, pending: dict):
+        """Append a failed batch as {"failed_at", "pending": {stage: events}}; only the pending stages still need applying"""
+        entry = {"failed_at": datetime.datetime.utcnow().isoformat(), "pending": pending}
+        try:
+            with open(self.dead_letter_path, "ab") as f:
+                f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        except OSError:
+            logger.exception("Could not write a failed feedback batch to the dead-letter file")
+
+    # Recovery
+    def _recover(self):
+        for path in sorted(glob.glob(os.path.join(DATA_DIR, "ingest-*.wal"))):
+            if path == self.wal_path:
+                self._replay(path)  # an earlier process with our pid
+                continue
+            lock = FileLock(path + ".lock")
+            if not lock.acquire(blocking=False):
+                continue  # still owned by a live process
+            try:
+                self._replay(path)
+            finally:
+                lock.release()
+            try:
+                os.remove(path + ".lock")
+            except OSError:
+                pass
+
+    def _replay(self, path: str):
+        events, done = [], {stage: set() for stage in self.STAGES}
+        torn = False
+        with open(path, "rb") as f:
+            for line in f:
+                torn = not line.endswith(b"\n")
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn final line
+                if isinstance(record, dict):
+                    done[record["done"]].update(range(record["start"], record["end"]))
+                else:
+                    events.append(record)
+        # Markers for the replay itself go to the same file, so a crash here does not repeat finished stages
+        with open(path, "ab") as wal:
+            if torn:
+                wal.write(b"\n")  # keep markers off the torn line
+
+            def mark(marker):
+                wal.write((json.dumps(marker) + "\n").encode("utf-8"))
+                wal.flush()
+            numbered = list(enumerate(events))
+            for start in range(0, len(numbered), self.max_batch):
+                self._process(numbered[start:start + self.max_batch], mark, done)
+        os.remove(path)
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+def get_ingestor() -> FeedbackIngestor:
+    global _ingestor
+    with _ingestor_lock:
+        if _ingestor is None:
+            get_store()  # registered first so its flush runs after the ingestor drains at exit
+            _ingestor = FeedbackIngestor()
+            atexit.register(_ingestor.close)
+        return _ingestor
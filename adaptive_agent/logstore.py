@@ -0,0 +1,266 @@
+import os, io, re, csv, glob, gzip, json, time, shutil, datetime, threading
+from contextlib import contextmanager
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+_QUOTE_OR_NEWLINE = re.compile(rb'["\n]')
+BLOCK = 64 * 1024
+
+class FileLock:
+    """Exclusive lock shared by every process using the same lock file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+                    return True
+                except OSError:
+                    if not blocking:
+                        raise
+        except OSError:
+            os.close(self._fd)
+            self._fd = None
+            return False
+
+    def release(self):
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+
+class RotatingLog:
+    """Append-only CSV log split into an active file and compressed, indexed segments.
+
+    The active file (e.g. feedback.csv) rotates once it exceeds max_bytes or its
+    first row is older than max_age seconds. Closed segments are written as
+    <name>.<seq>.csv.gz (or .zst) and listed, with row counts and first/last
+    timestamps, in <name>.segments.json.
+
+    Several processes may write the same log, so appends and rotation hold an
+    exclusive file lock. Rotation first renames the active file to
+    <name>.<seq>.csv and only then compresses and indexes it; a rotation cut
+    short by a crash is finished by the next one, without duplicating rows.
+    """
+
+    def __init__(self, path: str, header: list, max_bytes: int = 5_000_000, max_age: float = None,
+                 compression: str = "gzip"):
+        self.path = path
+        self.header = header
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = "zstd" if compression == "zstd" and zstandard else "gzip"
+        stem = path[:-4] if path.endswith(".csv") else path
+        self.stem = stem
+        self.index_path = stem + ".segments.json"
+        self._active_started = None  # (inode, first row timestamp) of the active file
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(stem + ".lock")
+        self._recovered = False
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            self._file_lock.acquire()
+            try:
+                yield
+            finally:
+                self._file_lock.release()
+
+    # Segment index
+    def segments(self) -> list:
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_segments(self, segments: list):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(segments, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def _open_segment(self, name: str):
+        path = os.path.join(os.path.dirname(self.path), name)
+        if name.endswith(".zst"):
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to read {name}")
+            return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")),
+                                    encoding="utf-8", newline="")
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+
+    # Writing
+    def _ensure_active(self):
+        if not os.path.exists(self.path):
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(self.header)
+
+    def _started_at(self):
+        # Another process may have rotated since we looked, so the cache is keyed by inode
+        inode = os.stat(self.path).st_ino
+        if self._active_started is None or self._active_started[0] != inode:
+            with open(self.path, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                first = next(reader, None)
+            if not first:
+                return None
+            self._active_started = (inode, datetime.datetime.fromisoformat(first[0]).timestamp())
+        return self._active_started[1]
+
+    def _should_rotate(self) -> bool:
+        size = os.path.getsize(self.path)
+        if size >= self.max_bytes:
+            return True
+        if self.max_age and size > 0:
+            started = self._started_at()
+            return started is not None and time.time() - started >= self.max_age
+        return False
+
+    def rotate(self):
+        with self._locked():
+            self._rotate()
+
+    def _pending(self) -> list:
+        """Active files renamed for rotation but not yet compressed and indexed."""
+        pattern = os.path.join(glob.escape(os.path.dirname(self.path)), glob.escape(os.path.basename(self.stem)))
+        return sorted(glob.glob(pattern + ".[0-9][0-9][0-9][0-9][0-9].csv"))
+
+    def _recover(self) -> list:
+        """Finish any rotation a crashed process left behind; returns the segment index."""
+        segments = self.segments()
+        for pending in self._pending():
+            self._close_segment(pending, segments)
+        return segments
+
+    def _rotate(self):
+        segments = self._recover()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= len(self._header_bytes()):
+            return
+        seq = segments[-1]["seq"] + 1 if segments else 1
+        pending = f"{self.stem}.{seq:05d}.csv"
+        os.replace(self.path, pending)
+        self._ensure_active()
+        self._close_segment(pending, segments)
+
+    def _close_segment(self, pending: str, segments: list):
+        """Compress a renamed active file and index it; safe to repeat after a crash."""
+        seq = int(pending[-9:-4])
+        suffix = "zst" if self.compression == "zstd" else "gz"
+        name = f"{os.path.basename(self.stem)}.{seq:05d}.csv.{suffix}"
+        target = os.path.join(os.path.dirname(self.path), name)
+
+        if not any(segment["seq"] == seq for segment in segments):
+            rows, first_ts, last_ts = 0, None, None
+            with open(pending, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    rows += 1
+                    first_ts = first_ts or row[0]
+                    last_ts = row[0]
+            if rows:
+                with open(pending, "rb") as src, open(target + ".tmp", "wb") as raw:
+                    if self.compression == "zstd":
+                        with zstandard.ZstdCompressor().stream_writer(raw) as dst:
+                            shutil.copyfileobj(src, dst)
+                    else:
+                        with gzip.GzipFile(fileobj=raw, mode="wb") as dst:
+                            shutil.copyfileobj(src, dst)
+                os.replace(target + ".tmp", target)
+                segments.append({"seq": seq, "file": name, "rows": rows, "first_ts": first_ts,
+                                 "last_ts": last_ts, "bytes": os.path.getsize(target)})
+                self._save_segments(segments)
+        os.remove(pending)
+
+    def append(self, rows: list):
+        with self._locked():
+            if not self._recovered:
+                self._recover()
+                self._recovered = True
+            self._ensure_active()
+            if self._should_rotate():
+                self._rotate()
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows(rows)
+
+    # Reading
+    def _tail_bytes(self, path: str, n: int):
+        """Last n records of a CSV file, or the whole file (header included) if it is shorter."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buf = b""
+            while pos > 0:
+                step = min(BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+                # A newline ends a record when an even number of quotes follows it
+                quotes, starts = 0, []
+                for m in reversed(list(_QUOTE_OR_NEWLINE.finditer(buf))):
+                    if m.group() == b'"':
+                        quotes += 1
+                    elif quotes % 2 == 0 and m.end() < len(buf):
+                        starts.append(m.end())
+                        if len(starts) == n:
+                            return buf[starts[-1]:], False
+            return buf, True
+
+    def tail(self, n: int = 10) -> pd.DataFrame:
+        """Last n rows, reading backwards from the end of the active file."""
+        with self._locked():
+            self._ensure_active()
+            frames = []
+            data, whole = self._tail_bytes(self.path, n)
+            frame = pd.read_csv(io.BytesIO(data if whole else self._header_bytes() + data))
+            frames.append(frame)
+            missing = n - len(frame)
+            for segment in reversed(self.segments()):
+                if missing <= 0:
+                    break
+                with self._open_segment(segment["file"]) as f:
+                    older = pd.read_csv(f).tail(missing)
+                frames.insert(0, older)
+                missing -= len(older)
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def _header_bytes(self) -> bytes:
+        out = io.StringIO()
+        csv.writer(out).writerow(self.header)
+        return out.getvalue().encode("utf-8")
+
+    def iter_chunks(self, chunksize: int = 100_000, **read_csv_args):
+        """Stream every row, oldest segment first, in DataFrame chunks."""
+        self._ensure_active()
+        for segment in self.segments():
+            with self._open_segment(segment["file"]) as f:
+                yield from pd.read_csv(f, chunksize=chunksize, **read_csv_args)
+        yield from pd.read_csv(self.path, chunksize=chunksize, **read_csv_args)
+
+    def read_all(self, **read_csv_args) -> pd.DataFrame:
+        frames = [chunk for chunk in self.iter_chunks(**read_csv_args) if not chunk.empty]
+        if not frames:
+            return pd.read_csv(io.BytesIO(self._header_bytes()), **read_csv_args)
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
@@ -0,0 +1,146 @@
+"""Offline policy evaluation over feedback.csv.
+
+Streams the log, rotated segments included, in chunks, replays it through
+candidate policies and reports replay and inverse-propensity (IPS) reward
+estimates plus a regret curve against the best single template in hindsight. The log does not record
+propensities, so IPS uses each template's empirical share of the log. Each
+policy runs in its own process; memory is bounded by the chunk size.
+
+    python -m adaptive_agent.offline_eval --policies epsilon_greedy ucb1 thompson linucb:alpha=0.5
+"""
+import os, json, argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np, pandas as pd
+from .storage import FEEDBACK_CSV, FEEDBACK_HEADER
+from .logstore import RotatingLog
+from .bandit import ArmStats, make_policy
+from .contextual import LinUCB, featurize
+
+COLUMNS = ["suggestion_id", "user_text", "feedback"]
+
+def iter_chunks(path: str = FEEDBACK_CSV, chunksize: int = 100_000):
+    # Rotated segments are read oldest first, then the active file
+    log = RotatingLog(path, FEEDBACK_HEADER)
+    for chunk in log.iter_chunks(chunksize, usecols=COLUMNS, dtype={"suggestion_id": str, "user_text": str}):
+        chunk["user_text"] = chunk["user_text"].fillna("")
+        yield chunk
+
+def log_summary(path: str = FEEDBACK_CSV, chunksize: int = 100_000) -> dict:
+    """First pass: arms, logging propensities and per-arm mean reward."""
+    counts, rewards = pd.Series(dtype=float), pd.Series(dtype=float)
+    for chunk in iter_chunks(path, chunksize):
+        grouped = chunk.groupby("suggestion_id")["feedback"]
+        counts = counts.add(grouped.size(), fill_value=0)
+        rewards = rewards.add(grouped.sum(), fill_value=0)
+    total = float(counts.sum())
+    means = rewards / counts
+    return {
+        "arms": counts.index.tolist(),
+        "events": int(total),
+        "propensities": (counts / total).tolist() if total else [],
+        "best_arm": means.idxmax() if total else None,
+        "best_mean": float(means.max()) if total else 0.0,
+    }
+
+def parse_policy(spec: str):
+    """'ucb1' or 'epsilon_greedy:epsilon=0.05' or 'linucb:alpha=0.5,dim=32'."""
+    name, _, args = spec.partition(":")
+    params = {k: float(v) for k, v in (a.split("=") for a in args.split(",") if a)}
+    return name, params
+
+def evaluate_policy(spec: str, path: str, summary: dict, chunksize: int = 100_000,
+                    batch_size: int = 256, curve_points: int = 100, seed: int = 0) -> dict:
+    """Replay the log through one policy, updating it only on events where it agrees with the log."""
+    name, params = parse_policy(spec)
+    arms = summary["arms"]
+    index = {sid: i for i, sid in enumerate(arms)}
+    propensity = np.asarray(summary["propensities"])
+    rng = np.random.default_rng(seed)
+
+    contextual = name == "linucb"
+    if contextual:
+        dim = int(params.pop("dim", 64))
+        policy, stats = LinUCB(len(arms), dim, **params), None
+    else:
+        policy, stats = make_policy(name, **params), ArmStats(len(arms))
+
+    step = max(1, summary["events"] // curve_points)
+    seen = matched = 0
+    replay_total = ips_total = 0.0
+    curve, next_point = [], step
+
+    for chunk in iter_chunks(path, chunksize):
+        logged = chunk["suggestion_id"].map(index).to_numpy(dtype=int)
+        rewards = chunk["feedback"].to_numpy(dtype=float)
+        texts = chunk["user_text"].tolist()
+        for start in range(0, len(chunk), batch_size):
+            a = logged[start:start + batch_size]
+            r = rewards[start:start + batch_size]
+            if contextual:
+                X = featurize(texts[start:start + batch_size], policy.dim)
+                picks = policy.select(k=len(a), context=X)
+            else:
+                picks = policy.select(stats, len(a), rng=rng)
+            hit = picks == a
+
+            # Replay counts agreeing events; IPS reweights them by the logging propensity
+            replay_total += r[hit].sum()
+            ips_total += (r[hit] / propensity[a[hit]]).sum()
+            if contextual:
+                for arm, x, reward in zip(a[hit], X[hit], r[hit]):
+                    policy.update(arm, x, reward)
+            elif hit.any():
+                stats.update(a[hit], r[hit])
+
+            seen += len(a)
+            matched += int(hit.sum())
+            while seen >= next_point:
+                curve.append({"events": seen, "matched": matched,
+                              "regret": round(summary["best_mean"] * matched - replay_total, 4)})
+                next_point += step
+
+    return {
+        "policy": spec,
+        "events": seen,
+        "matched": matched,
+        "replay_reward": round(replay_total / matched, 4) if matched else None,
+        "ips_reward": round(ips_total / seen, 4) if seen else None,
+        "regret_curve": curve,
+    }
+
+def evaluate(policies, path: str = FEEDBACK_CSV, chunksize: int = 100_000, batch_size: int = 256,
+             workers: int = None, seed: int = 0) -> dict:
+    summary = log_summary(path, chunksize)
+    if not summary["events"]:
+        return {"summary": summary, "results": []}
+    workers = workers or min(len(policies), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(evaluate_policy, spec, path, summary, chunksize, batch_size, seed=seed)
+                   for spec in policies]
+        results = [f.result() for f in futures]
+    return {"summary": summary, "results": results}
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline evaluation of suggestion policies on feedback.csv")
+    parser.add_argument("--log", default=FEEDBACK_CSV)
+    parser.add_argument("--policies", nargs="+", default=["epsilon_greedy", "ucb1", "thompson", "linucb"])
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", help="write the full report, including regret curves, as JSON")
+    args = parser.parse_args()
+
+    report = evaluate(args.policies, args.log, args.chunksize, args.batch_size, args.workers)
+    summary = report["summary"]
+    print(f"{summary['events']} logged events over {len(summary['arms'])} templates; "
+          f"best template {summary['best_arm']} averages {summary['best_mean']:.3f}")
+    for r in report["results"]:
+        final_regret = r["regret_curve"][-1]["regret"] if r["regret_curve"] else 0.0
+        print(f"{r['policy']:<28} matched {r['matched']:>9}  replay {r['replay_reward']}  "
+              f"ips {r['ips_reward']}  regret {final_regret}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
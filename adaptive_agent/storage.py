@@ -1,10 +1,22 @@
 import os, csv, datetime, pandas as pd
+from .logstore import RotatingLog
 
 DATA_DIR = "data"
 WEIGHTS_CSV = os.path.join(DATA_DIR, "weights.csv")
 FEEDBACK_CSV = os.path.join(DATA_DIR, "feedback.csv")
 IMPROVE_CSV = os.path.join(DATA_DIR, "improvement_log.csv")
 
+FEEDBACK_HEADER = ["timestamp","suggestion_id","user_text","suggestion_text","feedback"]
+IMPROVE_HEADER = ["timestamp","suggestion_id","prev_weight","reward","new_weight"]
+
+# Logs rotate by size (bytes) and optionally age (hours) into compressed segments
+LOG_MAX_BYTES = int(os.getenv("ADAPTIVE_LOG_MAX_BYTES", "5000000"))
+LOG_MAX_AGE = float(os.getenv("ADAPTIVE_LOG_MAX_AGE_HOURS", "0")) * 3600 or None
+LOG_COMPRESSION = os.getenv("ADAPTIVE_LOG_COMPRESSION", "gzip")
+
+FEEDBACK_LOG = RotatingLog(FEEDBACK_CSV, FEEDBACK_HEADER, LOG_MAX_BYTES, LOG_MAX_AGE, LOG_COMPRESSION)
+IMPROVE_LOG = RotatingLog(IMPROVE_CSV, IMPROVE_HEADER, LOG_MAX_BYTES, LOG_MAX_AGE, LOG_COMPRESSION)
+
 DEFAULT_TEMPLATES = [
     ("SUG-1", "Try a 25-minute focused study sprint, then 5-minute break.", 0.0),
     ("SUG-2", "Plan tomorrow’s top 3 tasks tonight.", 0.0),
@@ -14,42 +26,63 @@ DEFAULT_TEMPLATES = [
 def _ensure_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
+_initialized = False
+
 def _init_csvs():
+    # Files are created once per process; later calls skip the existence checks
+    global _initialized
+    if _initialized:
+        return
     _ensure_dir()
     if not os.path.exists(WEIGHTS_CSV):
         with open(WEIGHTS_CSV, "w", newline="", encoding="utf-8") as f:
             w = csv.writer(f); w.writerow(["suggestion_id","text","weight"])
             for sid, txt, wt in DEFAULT_TEMPLATES: w.writerow([sid, txt, wt])
-    if not os.path.exists(FEEDBACK_CSV):
-        with open(FEEDBACK_CSV, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f); w.writerow(["timestamp","suggestion_id","user_text","suggestion_text","feedback"])
-    if not os.path.exists(IMPROVE_CSV):
-        with open(IMPROVE_CSV, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f); w.writerow(["timestamp","suggestion_id","prev_weight","reward","new_weight"])
+    _initialized = True
 
 def load_weights() -> pd.DataFrame:
     _init_csvs()
     return pd.read_csv(WEIGHTS_CSV)
 
 def save_weights(df: pd.DataFrame):
-    df.to_csv(WEIGHTS_CSV, index=False)
+    # Write beside the target and swap in, so a crash never leaves a truncated weights.csv
+    tmp = WEIGHTS_CSV + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, WEIGHTS_CSV)
 
 def log_feedback(suggestion_id, user_text, suggestion_text, reward: int):
     _init_csvs()
     ts = datetime.datetime.utcnow().isoformat()
-    with open(FEEDBACK_CSV, "a", newline="", encoding="utf-8") as f:
-        csv.writer(f).writerow([ts, suggestion_id, user_text, suggestion_text, reward])
+    FEEDBACK_LOG.append([[ts, suggestion_id, user_text, suggestion_text, reward]])
 
 def log_improvement(suggestion_id, prev_w, reward, new_w):
     _init_csvs()
     ts = datetime.datetime.utcnow().isoformat()
-    with open(IMPROVE_CSV, "a", newline="", encoding="utf-8") as f:
-        csv.writer(f).writerow([ts, suggestion_id, prev_w, reward, new_w])
+    IMPROVE_LOG.append([[ts, suggestion_id, prev_w, reward, new_w]])
+
+def log_feedback_rows(rows: list):
+    # rows are [timestamp, suggestion_id, user_text, suggestion_text, feedback], written in one append
+    _init_csvs()
+    FEEDBACK_LOG.append(rows)
+
+def log_improvement_rows(rows: list):
+    # rows are (suggestion_id, prev_weight, reward, new_weight), stamped and written in one append
+    _init_csvs()
+    ts = datetime.datetime.utcnow().isoformat()
+    IMPROVE_LOG.append([[ts, sid, prev_w, reward, new_w] for sid, prev_w, reward, new_w in rows])
 
 def load_feedback() -> pd.DataFrame:
     _init_csvs()
-    return pd.read_csv(FEEDBACK_CSV)
+    return FEEDBACK_LOG.read_all()
 
 def load_improvements() -> pd.DataFrame:
     _init_csvs()
-    return pd.read_csv(IMPROVE_CSV)
+    return IMPROVE_LOG.read_all()
+
+def tail_feedback(n: int = 10) -> pd.DataFrame:
+    _init_csvs()
+    return FEEDBACK_LOG.tail(n)
+
+def tail_improvements(n: int = 10) -> pd.DataFrame:
+    _init_csvs()
+    return IMPROVE_LOG.tail(n)
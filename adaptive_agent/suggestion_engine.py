@@ -1,12 +1,24 @@
-import numpy as np
-from .storage import load_weights
+from .bandit import get_engine, make_policy
+from .contextual import get_contextual_model
+from .decay import get_decayed_stats
+from .user_store import get_user_store
 
-def choose_suggestion(epsilon: float = 0.1):
-    df = load_weights()
-    if df.empty:
-        return None
-    if np.random.rand() < epsilon:
-        row = df.sample(1).iloc[0]             # explore
-    else:
-        row = df.sort_values("weight", ascending=False).iloc[0]  # exploit
-    return dict(suggestion_id=row["suggestion_id"], text=row["text"], weight=float(row["weight"]))
+def choose_suggestions(n: int, epsilon: float = 0.1, policy: str = "epsilon_greedy", user_text: str = "",
+                       user_id: str = None):
+    """Pick suggestions for n concurrent users in one vectorized call."""
+    if policy == "linucb":
+        return get_contextual_model().select(user_text, n)
+    engine = get_engine()
+    engine.store.sync()
+    if policy == "decayed":
+        # Epsilon-greedy on time-decayed mean rewards, so stale feedback fades out
+        return engine.select(n, make_policy("epsilon_greedy", epsilon=epsilon), values=get_decayed_stats().means())
+    params = {"epsilon": epsilon} if policy == "epsilon_greedy" else {}
+    # Personal weights replace the global ones for weight-based policies
+    values = get_user_store().effective_weights(user_id, engine.store.weights) if user_id else None
+    return engine.select(n, make_policy(policy, **params), values=values)
+
+def choose_suggestion(epsilon: float = 0.1, policy: str = "epsilon_greedy", user_text: str = "",
+                      user_id: str = None):
+    rows = choose_suggestions(1, epsilon=epsilon, policy=policy, user_text=user_text, user_id=user_id)
+    return rows[0] if rows else None
@@ -0,0 +1,215 @@
+import os, io, re, json, hashlib, datetime, threading
+import numpy as np, pandas as pd
+from .storage import DATA_DIR, _ensure_dir
+from .weight_store import get_store
+
+TEMPLATES_CSV = os.path.join(DATA_DIR, "templates.csv")
+TEMPLATE_COLUMNS = ["suggestion_id", "text_hash", "category", "tags", "active", "created_at"]
+_PUNCT = re.compile(r"[^\w\s]")
+
+def normalize_text(text: str) -> str:
+    return " ".join(_PUNCT.sub(" ", str(text or "").lower()).split())
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()[:16]
+
+def _tags(value) -> str:
+    # Stored as a ';'-separated string; accepts lists or comma/semicolon separated text
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        items = re.split(r"[;,]", "" if value is None or (isinstance(value, float) and np.isnan(value)) else str(value))
+    return ";".join(sorted({t.strip().lower() for t in items if str(t).strip()}))
+
+class TemplateLibrary:
+    """Metadata for suggestion templates: category, tags, dedup hash and soft-delete flag.
+
+    Texts and weights stay in the weight store (weights.csv); this keeps one row
+    per suggestion_id in templates.csv plus an active mask aligned with the
+    store's arm positions, which the bandit policies use to skip deleted templates.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or get_store()
+        self._lock = threading.RLock()
+        self._signature = None
+        self._mask = None
+        self._load()
+
+    # Persistence
+    def _load(self):
+        _ensure_dir()
+        if os.path.exists(TEMPLATES_CSV):
+            meta = pd.read_csv(TEMPLATES_CSV, dtype={"category": str, "tags": str}, keep_default_na=False)
+            meta["active"] = meta["active"].astype(str).str.lower().isin(["true", "1"])
+        else:
+            meta = pd.DataFrame(columns=TEMPLATE_COLUMNS)
+        meta = meta.set_index("suggestion_id")
+        # Templates that predate the library (e.g. the defaults) get a metadata row
+        missing = [sid for sid in self.store.ids if sid not in meta.index]
+        if missing:
+            now = datetime.datetime.utcnow().isoformat()
+            extra = pd.DataFrame({"text_hash": [text_hash(self.store.texts[self.store.index[s]]) for s in missing],
+                                  "category": "", "tags": "", "active": True, "created_at": now},
+                                 index=pd.Index(missing, name="suggestion_id"))
+            meta = pd.concat([meta, extra]) if len(meta) else extra
+        self.meta = meta
+        self.hashes = dict(zip(meta["text_hash"], meta.index))
+        self._mask = None
+        if missing or not os.path.exists(TEMPLATES_CSV):
+            self._save()
+        self._signature = self._file_signature()
+
+    def _save(self):
+        tmp = TEMPLATES_CSV + ".tmp"
+        self.meta.reset_index()[TEMPLATE_COLUMNS].to_csv(tmp, index=False)
+        os.replace(tmp, TEMPLATES_CSV)
+        self._signature = self._file_signature()
+        self._mask = None
+
+    @staticmethod
+    def _file_signature():
+        try:
+            st = os.stat(TEMPLATES_CSV)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        if self._file_signature() != self._signature or len(self.meta) < len(self.store):
+            self._load()
+
+    # Reads
+    def active_mask(self) -> np.ndarray:
+        """Boolean array over store positions; False for soft-deleted templates."""
+        with self._lock:
+            self._refresh()
+            if self._mask is None or len(self._mask) != len(self.store):
+                active = self.meta["active"].reindex(self.store.ids, fill_value=True)
+                self._mask = active.to_numpy(dtype=bool)
+            return self._mask
+
+    def frame(self, include_deleted: bool = False) -> pd.DataFrame:
+        with self._lock:
+            self._refresh()
+            df = self.store.frame().join(self.meta[["category", "tags", "active"]], on="suggestion_id")
+        return df if include_deleted else df[df["active"]].reset_index(drop=True)
+
+    def categories(self) -> list:
+        with self._lock:
+            return sorted(c for c in self.meta["category"].unique() if c)
+
+    # Writes
+    def _next_ids(self, n: int) -> list:
+        numbers = [int(m.group(1)) for m in map(re.compile(r"SUG-(\d+)$").match, self.store.ids) if m]
+        start = max(numbers, default=0) + 1
+        return [f"SUG-{i}" for i in range(start, start + n)]
+
+    def add_templates(self, rows: list) -> dict:
+        """Add dicts with text and optional category, tags and weight; duplicates are skipped.
+
+        New arms start at the given weight, else at the mean weight of active
+        templates in the same category, else at the mean over all active templates.
+        """
+        with self.store.transaction(), self._lock:
+            self._refresh()
+            weights = self.store.frame().join(self.meta[["category", "active"]], on="suggestion_id")
+            weights = weights[weights["active"]]
+            category_means = weights.groupby("category")["weight"].mean().to_dict()
+            fallback = float(weights["weight"].mean()) if len(weights) else 0.0
+
+            seen, fresh, duplicates, invalid = set(), [], 0, 0
+            for row in rows:
+                text = " ".join(str(row.get("text") or "").split())
+                if not normalize_text(text):
+                    invalid += 1
+                    continue
+                h = text_hash(text)
+                if h in self.hashes or h in seen:
+                    duplicates += 1
+                    continue
+                seen.add(h)
+                category = str(row.get("category") or "").strip().lower()
+                weight = row.get("weight")
+                try:
+                    weight = float(weight)
+                    if np.isnan(weight):
+                        raise ValueError
+                except (TypeError, ValueError):
+                    weight = category_means.get(category, fallback)
+                fresh.append((text, h, category, _tags(row.get("tags")), max(-1.0, min(1.0, weight))))
+
+            ids = self._next_ids(len(fresh))
+            if fresh:
+                self.store.add(ids, [f[0] for f in fresh], [f[4] for f in fresh])
+                now = datetime.datetime.utcnow().isoformat()
+                extra = pd.DataFrame({"text_hash": [f[1] for f in fresh], "category": [f[2] for f in fresh],
+                                      "tags": [f[3] for f in fresh], "active": True, "created_at": now},
+                                     index=pd.Index(ids, name="suggestion_id"))
+                self.meta = pd.concat([self.meta, extra])
+                self.hashes.update(zip(extra["text_hash"], ids))
+                self._save()
+        return {"added": ids, "duplicates": duplicates, "invalid": invalid}
+
+    def add_template(self, text: str, category: str = "", tags=None, weight: float = None):
+        result = self.add_templates([{"text": text, "category": category, "tags": tags, "weight": weight}])
+        return result["added"][0] if result["added"] else None
+
+    def import_file(self, source, fmt: str = None) -> dict:
+        """Bulk import from a CSV (text[,category,tags,weight]) or JSON (strings or objects) file or buffer."""
+        name = getattr(source, "name", source if isinstance(source, str) else "")
+        fmt = fmt or ("json" if str(name).lower().endswith(".json") else "csv")
+        if fmt == "json":
+            if hasattr(source, "read"):
+                data = json.loads(source.read())
+            else:
+                with open(source, "rb") as f:
+                    data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get("templates", [])
+            rows = [{"text": item} if isinstance(item, str) else dict(item) for item in data]
+        else:
+            if hasattr(source, "read"):
+                source = io.BytesIO(source.read())
+            df = pd.read_csv(source, dtype=str, keep_default_na=False)
+            df.columns = [c.strip().lower() for c in df.columns]
+            if "text" not in df.columns:
+                raise ValueError("CSV needs a 'text' column")
+            rows = df.to_dict("records")
+        return self.add_templates(rows)
+
+    def set_active(self, suggestion_ids: list, active: bool):
+        """Soft delete (active=False) or restore templates; weights and history are kept."""
+        with self.store.transaction(), self._lock:
+            self._refresh()
+            ids = [sid for sid in suggestion_ids if sid in self.meta.index]
+            if ids:
+                self.meta.loc[ids, "active"] = active
+                self._save()
+        return len(ids)
+
+    def delete(self, suggestion_ids: list):
+        return self.set_active(suggestion_ids, False)
+
+    def restore(self, suggestion_ids: list):
+        return self.set_active(suggestion_ids, True)
+
+    def tag(self, suggestion_ids: list, tags=None, category: str = None):
+        with self.store.transaction(), self._lock:
+            self._refresh()
+            ids = [sid for sid in suggestion_ids if sid in self.meta.index]
+            if tags is not None:
+                self.meta.loc[ids, "tags"] = _tags(tags)
+            if category is not None:
+                self.meta.loc[ids, "category"] = category.strip().lower()
+            self._save()
+
+_library = None
+_library_lock = threading.Lock()
+
+def get_library() -> TemplateLibrary:
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = TemplateLibrary()
+        return _library
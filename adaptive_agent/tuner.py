@@ -1,16 +1,46 @@
-from .storage import load_weights, save_weights, log_improvement
+from .storage import log_improvement_rows
+from .weight_store import get_store
+from .bandit import get_engine
+from .decay import get_decayed_stats
+from .contextual import get_contextual_model
+from .user_store import get_user_store
 
 def clamp(x, lo=-1.0, hi=1.0):
     return max(lo, min(hi, x))
 
-def update_weight(suggestion_id: str, reward: int, alpha: float = 0.1):
-    df = load_weights()
-    idx = df.index[df["suggestion_id"] == suggestion_id]
-    if len(idx) == 0:
-        return
-    i = idx[0]
-    prev = float(df.at[i, "weight"])
-    newv = clamp(prev + alpha * reward)
-    df.at[i, "weight"] = newv
-    save_weights(df)
-    log_improvement(suggestion_id, prev, reward, newv)
+def update_weight(suggestion_id: str, reward: int, alpha: float = 0.1, user_text: str = None,
+                  user_id: str = None):
+    update_weights([(suggestion_id, reward, user_text, user_id)], alpha=alpha)
+
+def update_weights(events: list, alpha: float = 0.1):
+    """Apply (suggestion_id, reward, user_text, user_id) events as one batch.
+
+    Rewards are coalesced per suggestion and written with a single journal
+    write and a single improvement-log append (one row per event).
+    """
+    store = get_store()
+    # Models bootstrap from the logs on first use, so create them before this batch is logged
+    engine, decayed = get_engine(), get_decayed_stats()
+    # Read, write and log under the cross-process lock so no update is lost and
+    # improvement_log.csv stays in the same order as the weight changes
+    with store.transaction():
+        events = [e for e in events if e[0] in store.index]
+        if not events:
+            return
+        current, log_rows = {}, []
+        for sid, reward, _, _ in events:
+            prev = current.get(sid, store.get(sid))
+            current[sid] = newv = clamp(prev + alpha * reward)
+            log_rows.append((sid, prev, reward, newv))
+        store.set_many(list(current), list(current.values()))
+        log_improvement_rows(log_rows)
+    engine.update_many([e[0] for e in events], [e[1] for e in events])
+    decayed.update_many([e[0] for e in events], [e[1] for e in events])
+    contextual = get_contextual_model(create=False)
+    if contextual is not None:
+        for sid, reward, user_text, _ in events:
+            if user_text is not None:
+                contextual.update(sid, user_text, reward)
+    users = [(user_id, store.index[sid], reward) for sid, reward, _, user_id in events if user_id]
+    if users:
+        get_user_store().update_many(users)
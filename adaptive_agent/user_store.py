@@ -0,0 +1,134 @@
+import os, time, sqlite3, threading
+from collections import OrderedDict
+import numpy as np
+from .storage import DATA_DIR, _ensure_dir
+
+USERS_DB = os.path.join(DATA_DIR, "user_weights.sqlite3")
+
+class UserStore:
+    """Per-user reward sums and counts layered over the global weights.
+
+    A user's effective weight for a template is the global weight shrunk
+    toward their own mean reward as evidence grows:
+        (prior_strength * global + user_reward_sum) / (prior_strength + user_count)
+    Each (user, arm) pair is one SQLite row keyed by weight-store position, so
+    an update touches only the arms it rewards. Every write bumps the user's
+    version; the in-memory LRU of recently used users is checked against it
+    on each read, so changes made by other processes are picked up.
+    """
+
+    def __init__(self, path: str = USERS_DB, prior_strength: float = 5.0, cache_size: int = 1024):
+        _ensure_dir()
+        self.prior_strength = prior_strength
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS user_arm_stats (
+            user_id TEXT NOT NULL, arm INTEGER NOT NULL, reward_sum REAL NOT NULL, count REAL NOT NULL,
+            PRIMARY KEY (user_id, arm)) WITHOUT ROWID""")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS user_versions (
+            user_id TEXT PRIMARY KEY, version INTEGER NOT NULL, updated_at REAL NOT NULL)""")
+        self._migrate_blobs()
+
+    def _migrate_blobs(self):
+        """Split rows written by the one-blob-per-user layout into per-arm rows."""
+        if not self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_arms'").fetchone():
+            return
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            for user_id, rewards, counts in self._db.execute("SELECT user_id, rewards, counts FROM user_arms").fetchall():
+                rewards, counts = np.frombuffer(rewards, dtype=np.float32), np.frombuffer(counts, dtype=np.float32)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO user_arm_stats (user_id, arm, reward_sum, count) VALUES (?, ?, ?, ?)",
+                    [(user_id, int(arm), float(rewards[arm]), float(counts[arm])) for arm in np.flatnonzero(counts)])
+                self._bump(user_id, now)
+            self._db.execute("DROP TABLE user_arms")
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _bump(self, user_id: str, now: float):
+        self._db.execute(
+            "INSERT INTO user_versions (user_id, version, updated_at) VALUES (?, 1, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at",
+            (user_id, now))
+
+    def _version(self, user_id: str) -> int:
+        row = self._db.execute("SELECT version FROM user_versions WHERE user_id = ?", (user_id,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def _read(self, user_id: str):
+        rows = self._db.execute(
+            "SELECT arm, reward_sum, count FROM user_arm_stats WHERE user_id = ?", (user_id,)).fetchall()
+        size = max((arm for arm, _, _ in rows), default=-1) + 1
+        rewards, counts = np.zeros(size, dtype=np.float32), np.zeros(size, dtype=np.float32)
+        for arm, reward_sum, count in rows:
+            rewards[arm], counts[arm] = reward_sum, count
+        return rewards, counts
+
+    def _remember(self, user_id: str, state):
+        self._cache[user_id] = state
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _state(self, user_id: str):
+        cached = self._cache.get(user_id)
+        # Read the version and the rows in one snapshot so they agree
+        self._db.execute("BEGIN")
+        try:
+            version = self._version(user_id)
+            if cached is None or cached[0] != version:
+                cached = (version,) + self._read(user_id)
+        finally:
+            self._db.execute("COMMIT")
+        self._remember(user_id, cached)
+        return cached[1:]
+
+    def effective_weights(self, user_id: str, global_weights: np.ndarray) -> np.ndarray:
+        with self._lock:
+            rewards, counts = self._state(user_id)
+        n = min(len(rewards), len(global_weights))
+        weights = np.array(global_weights, dtype=float)
+        weights[:n] = (self.prior_strength * weights[:n] + rewards[:n]) / (self.prior_strength + counts[:n])
+        return weights
+
+    def update(self, user_id: str, arm: int, reward: float):
+        self.update_many([(user_id, arm, reward)])
+
+    def update_many(self, updates: list):
+        """Apply (user_id, arm, reward) updates in one transaction."""
+        deltas = {}
+        for user_id, arm, reward in updates:
+            reward_sum, count = deltas.get((user_id, int(arm)), (0.0, 0))
+            deltas[(user_id, int(arm))] = (reward_sum + float(reward), count + 1)
+        with self._lock:
+            # Increments happen inside SQLite, so concurrent writers never lose each other's updates
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "INSERT INTO user_arm_stats (user_id, arm, reward_sum, count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(user_id, arm) DO UPDATE SET reward_sum = reward_sum + excluded.reward_sum, "
+                    "count = count + excluded.count",
+                    [(user_id, arm, reward_sum, count) for (user_id, arm), (reward_sum, count) in deltas.items()])
+                now = time.time()
+                for user_id in {user_id for user_id, _ in deltas}:
+                    self._bump(user_id, now)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+_users = None
+_users_lock = threading.Lock()
+
+def get_user_store() -> UserStore:
+    global _users
+    with _users_lock:
+        if _users is None:
+            _users = UserStore()
+        return _users
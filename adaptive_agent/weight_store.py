@@ -0,0 +1,165 @@
+import os, time, atexit, threading
+from contextlib import contextmanager
+import numpy as np, pandas as pd
+from .logstore import FileLock
+from .storage import WEIGHTS_CSV, _ensure_dir, load_weights, save_weights
+
+def _signature(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+class WeightStore:
+    """Weights held in memory as arrays keyed by suggestion_id.
+
+    Every change is appended to a journal (fsynced when durable=True) and the
+    full weights.csv is only rewritten on flush, after flush_every changes or
+    flush_interval seconds. Loading replays the journal over weights.csv, so
+    a crash loses nothing that was journaled.
+
+    Several processes may share the files: changes happen inside transaction(),
+    which holds an exclusive file lock and first applies whatever other
+    processes journaled or flushed since this process last looked.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, flush_every: int = 200, durable: bool = True):
+        self.journal_path = WEIGHTS_CSV + ".journal"
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.durable = durable
+        _ensure_dir()
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(WEIGHTS_CSV + ".lock")
+        self._depth = 0
+        self.reload()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            if not self._depth:
+                self._file_lock.acquire()
+            self._depth += 1
+            try:
+                if self._depth == 1:
+                    self._catch_up()
+                yield self
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self._file_lock.release()
+
+    def reload(self):
+        with self.transaction():
+            self._reload()
+
+    def sync(self):
+        """Pick up changes made by other processes."""
+        with self.transaction():
+            pass
+
+    def _reload(self):
+        df = load_weights()
+        self._csv_signature = _signature(WEIGHTS_CSV)
+        self.ids = df["suggestion_id"].astype(str).tolist()
+        self.texts = df["text"].astype(str).tolist()
+        self.weights = df["weight"].to_numpy(dtype=float, copy=True)
+        self.index = {sid: i for i, sid in enumerate(self.ids)}
+        self._journal_offset = 0
+        self._pending = self._replay_journal()
+        self._last_flush = time.monotonic()
+
+    def _catch_up(self):
+        if not hasattr(self, "ids"):
+            return
+        journal_size = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+        # Another process flushed: weights.csv was replaced and the journal restarted
+        if _signature(WEIGHTS_CSV) != self._csv_signature or journal_size < self._journal_offset:
+            self._reload()
+        elif journal_size > self._journal_offset:
+            self._pending += self._replay_journal()
+
+    def _replay_journal(self) -> int:
+        if not os.path.exists(self.journal_path):
+            return 0
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            # A line without its newline was torn by a crash; writers hold the lock, so nobody is mid-write
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(self._journal_offset + end)
+        lines = data[:end].decode("utf-8").split("\n")[:-1]
+        for line in lines:
+            sid, _, value = line.rpartition(",")
+            i = self.index.get(sid)
+            if i is not None:
+                self.weights[i] = float(value)
+        self._journal_offset += end
+        return len(lines)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get(self, suggestion_id: str):
+        i = self.index.get(suggestion_id)
+        return None if i is None else float(self.weights[i])
+
+    def row(self, i: int) -> dict:
+        return dict(suggestion_id=self.ids[i], text=self.texts[i], weight=float(self.weights[i]))
+
+    def set(self, suggestion_id: str, value: float):
+        self.set_many([suggestion_id], [value])
+
+    def set_many(self, suggestion_ids: list, values: list):
+        """Set several weights with one journal write (and one fsync)."""
+        with self.transaction():
+            values = [float(v) for v in values]
+            self.weights[[self.index[sid] for sid in suggestion_ids]] = values
+            data = "".join(f"{sid},{v!r}\n" for sid, v in zip(suggestion_ids, values)).encode("utf-8")
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+                if self.durable:
+                    f.flush(); os.fsync(f.fileno())
+            self._journal_offset += len(data)
+            self._pending += len(values)
+            if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def add(self, suggestion_ids: list, texts: list, values: list):
+        """Append new templates and rewrite weights.csv so other processes pick them up."""
+        with self.transaction():
+            for sid, text in zip(suggestion_ids, texts):
+                self.index[sid] = len(self.ids)
+                self.ids.append(sid)
+                self.texts.append(text)
+            self.weights = np.concatenate([self.weights, np.asarray(values, dtype=float)])
+            self._pending += len(suggestion_ids)
+            self.flush()
+
+    def frame(self) -> pd.DataFrame:
+        with self._lock:
+            return pd.DataFrame({"suggestion_id": self.ids, "text": self.texts, "weight": self.weights.copy()})
+
+    def flush(self):
+        with self.transaction():
+            if self._pending:
+                save_weights(self.frame())
+                open(self.journal_path, "w").close()
+                self._csv_signature = _signature(WEIGHTS_CSV)
+                self._journal_offset = 0
+                self._pending = 0
+            self._last_flush = time.monotonic()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store() -> WeightStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = WeightStore()
+            atexit.register(_store.flush)
+        return _store
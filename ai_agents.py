@@ -8,11 +8,20 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import smtplib
 
-try:
-    from groq import Groq
-except ImportError:
-    print("Groq library not installed. Please install with: pip install groq")
-    Groq = None
+_groq_class = None
+
+
+def _load_groq():
+    """Import the Groq client on first use; pages that never call an agent skip the import"""
+    global _groq_class
+    if _groq_class is None:
+        try:
+            from groq import Groq
+            _groq_class = Groq
+        except ImportError:
+            print("Groq library not installed. Please install with: pip install groq")
+            _groq_class = False
+    return _groq_class or None
 
 # Email imports with fallback
 try:
@@ -35,7 +44,8 @@ class GroqAgent:
         self.system_prompt = system_prompt
         self.client = None
         
-        if Groq and Config.GROQ_API_KEY:
+        Groq = _load_groq() if Config.GROQ_API_KEY else None
+        if Groq:
             try:
                 self.client = Groq(api_key=Config.GROQ_API_KEY)
             except Exception as e:
@@ -0,0 +1,74 @@
+"""
+Benchmark for Adaptive Feedback Agent clicks
+Compares the original CSV reread/rewrite path with the in-memory WeightStore path
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from adaptive_agent import storage
+from adaptive_agent.tuner import clamp
+
+
+def legacy_click(reward: int, alpha: float = 0.1):
+    """Get suggestion + Accept/Reject as implemented before the weight store"""
+    df = storage.load_weights()
+    row = df.sort_values("weight", ascending=False).iloc[0]
+    sid = row["suggestion_id"]
+
+    df = storage.load_weights()
+    i = df.index[df["suggestion_id"] == sid][0]
+    prev = float(df.at[i, "weight"])
+    newv = clamp(prev + alpha * reward)
+    df.at[i, "weight"] = newv
+    storage.save_weights(df)
+    storage.log_improvement(sid, prev, reward, newv)
+
+
+def store_click(store, reward: int, alpha: float = 0.1):
+    """Get suggestion + Accept/Reject through the WeightStore"""
+    i = int(np.argmax(store.weights))
+    sid = store.ids[i]
+    prev = store.get(sid)
+    newv = clamp(prev + alpha * reward)
+    store.set(sid, newv)
+    storage.log_improvement(sid, prev, reward, newv)
+
+
+def measure(label: str, click, clicks: int):
+    rng = np.random.default_rng(0)
+    rewards = rng.choice([-1, 1], size=clicks)
+    start = time.perf_counter()
+    for reward in rewards:
+        click(int(reward))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {clicks / elapsed:>10.0f} clicks/s")
+
+
+def main(clicks: int = 500):
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            storage._initialized = False
+            from adaptive_agent.weight_store import WeightStore
+
+            measure("before: CSV reread + rewrite", legacy_click, clicks)
+            durable = WeightStore(durable=True)
+            measure("after: WeightStore (fsync)", lambda r: store_click(durable, r), clicks)
+            durable.flush()
+            fast = WeightStore(durable=False)
+            measure("after: WeightStore (no fsync)", lambda r: store_click(fast, r), clicks)
+            fast.flush()
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
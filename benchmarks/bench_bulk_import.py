@@ -0,0 +1,82 @@
+"""
+Benchmark for HackaAIverse bulk imports
+Registers a synthetic spreadsheet of teams, then imports judges' scoresheets for them, in a scratch data directory
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def team_sheet(count: int, rng: random.Random, bad_rows: int) -> str:
+    import pandas as pd
+
+    rows = [{
+        "Team Name": f"Team {i:05d}",
+        "Members": "; ".join(f"Student {rng.randint(0, 99999)}" for _ in range(rng.randint(1, 5))),
+        "Email": f"team{i}@college{rng.randint(0, 300)}.edu",
+        "College": f"College {rng.randint(0, 300)}",
+        "Contact Number": str(rng.randint(6000000000, 9999999999))
+    } for i in range(count)]
+    for i in rng.sample(range(count), bad_rows):
+        rows[i]["Email"] = "not-an-email"
+    return pd.DataFrame(rows).to_csv(index=False)
+
+
+def score_sheet(team_names, criteria, max_score: int, rng: random.Random) -> str:
+    import pandas as pd
+
+    return pd.DataFrame([
+        {"Team": name.lower(), **{c: rng.randint(1, max_score) for c in criteria}, "Comments": ""}
+        for name in team_names
+    ]).to_csv(index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=5000)
+    parser.add_argument("--bad-rows", type=int, default=25)
+    parser.add_argument("--judges", type=int, default=3, help="scoresheets, each covering every team")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATA_DIR"] = tmp
+        from bulk_import import read_table
+        from config import Config
+        from data_manager import DataManager
+
+        data_manager = DataManager()
+        sheet = team_sheet(args.teams, rng, args.bad_rows)
+
+        start = time.perf_counter()
+        frame = read_table(io.StringIO(sheet), "teams.csv")
+        parsed = time.perf_counter()
+        result = data_manager.register_teams(frame)
+        done = time.perf_counter()
+
+        print(f"Parsed {len(frame)} rows in {parsed - start:.3f}s")
+        print(f"Registered {len(result['registered'])} teams, rejected {len(result['errors'])} rows "
+              f"in {done - parsed:.3f}s")
+
+        # Each snapshot rewrite of the leaderboard counts as one aggregate update
+        snapshots = []
+        data_manager.subscribe(lambda event: snapshots.append(event["type"]))
+        team_names = [team["team_name"] for team in data_manager.get_teams()]
+        for judge in range(args.judges):
+            sheet = score_sheet(team_names, Config.JUDGING_CRITERIA, Config.MAX_SCORE_PER_CRITERIA, rng)
+            start = time.perf_counter()
+            result = data_manager.submit_scores(read_table(io.StringIO(sheet), "scores.csv"), f"Judge {judge + 1}")
+            print(f"Judge {judge + 1}: imported {len(result['submitted'])} scores, rejected {len(result['errors'])} "
+                  f"rows in {time.perf_counter() - start:.3f}s")
+        print(f"Leaderboard recomputed {len(snapshots)} times for {args.judges} scoresheets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark for HackaAIverse college canonicalization
+Resolves synthetic college names, their repeats and misspellings against a scratch college index
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SUFFIXES = ["University", "Institute of Technology", "College of Engineering", "College"]
+
+
+def college_names(count: int, rng: random.Random):
+    words = lambda: " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+                             for _ in range(rng.randint(1, 3)))
+    return [f"{words()} {rng.choice(SUFFIXES)}" for _ in range(count)]
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Drop one letter from a word longer than four letters"""
+    words = name.split()
+    i = rng.choice([i for i, word in enumerate(words) if len(word) > 4])
+    j = rng.randrange(1, len(words[i]))
+    words[i] = words[i][:j] + words[i][j + 1:]
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--colleges", type=int, default=5000)
+    parser.add_argument("--typos", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    from college_index import CollegeIndex
+
+    names = college_names(args.colleges, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = CollegeIndex(os.path.join(tmp, "colleges.json"))
+
+        start = time.perf_counter()
+        ids = index.resolve_many(names)
+        print(f"Resolved {len(names)} new names into {len(index.colleges())} colleges "
+              f"in {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        again = index.resolve_many(names)
+        print(f"Resolved them again in {time.perf_counter() - start:.3f}s "
+              f"({sum(a == b for a, b in zip(ids, again))} unchanged)")
+
+        picks = rng.sample(range(len(names)), min(args.typos, len(names)))
+        start = time.perf_counter()
+        matched = index.resolve_many([misspell(names[i], rng) for i in picks], create=False)
+        print(f"Matched {sum(matched[k] == ids[i] for k, i in enumerate(picks))}/{len(picks)} misspellings "
+              f"in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
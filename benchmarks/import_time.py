@@ -0,0 +1,82 @@
+"""
+Cold-start import benchmark for HackaAIverse
+Runs `python -X importtime` in fresh interpreters and reports what each entry module costs
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ["config", "data_manager", "ai_agents", "adaptive_agent.suggestion_engine", "project"]
+
+
+def import_profile(module: str):
+    """One fresh interpreter: {imported module: cumulative microseconds}, or an error string"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        last = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+        return None, last
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: self [us] | cumulative | imported package"
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile, None
+
+
+def measure(module: str, runs: int):
+    totals, heaviest = [], {}
+    for _ in range(runs):
+        profile, error = import_profile(module)
+        if profile is None:
+            return {"module": module, "error": error}
+        totals.append(profile.get(module, sum(profile.values())))
+        for name, cumulative in profile.items():
+            heaviest.setdefault(name, []).append(cumulative)
+    top = sorted(((statistics.median(v), k) for k, v in heaviest.items() if k != module), reverse=True)
+    return {"module": module, "median_ms": statistics.median(totals) / 1000,
+            "min_ms": min(totals) / 1000, "top": [(name, us / 1000) for us, name in top[:8]]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--baseline", help="JSON file from a previous --save to compare against")
+    parser.add_argument("--save", help="write the medians to this JSON file")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    medians = {}
+    for module in args.modules:
+        result = measure(module, args.runs)
+        if "error" in result:
+            print(f"{module:<36} skipped: {result['error']}")
+            continue
+        medians[module] = result["median_ms"]
+        change = ""
+        if module in baseline:
+            change = f"  ({result['median_ms'] - baseline[module]:+.1f} ms vs baseline)"
+        print(f"{module:<36} median {result['median_ms']:7.1f} ms  min {result['min_ms']:7.1f} ms{change}")
+        for name, ms in result["top"][:5]:
+            print(f"    {name:<32} {ms:7.1f} ms")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(medians, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Multi-process stress check for Adaptive Feedback Agent weight updates
+Many processes call update_weight at once; the final weights must match the improvement log
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ALPHA = 0.01
+
+
+def worker(seed: int, updates: int, data_root: str):
+    os.chdir(data_root)
+    from adaptive_agent.tuner import update_weight
+    from adaptive_agent.weight_store import get_store
+
+    rng = random.Random(seed)
+    ids = list(get_store().ids)
+    for _ in range(updates):
+        update_weight(rng.choice(ids), rng.choice((1, -1)), alpha=ALPHA)
+    get_store().flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=500, help="updates per process")
+    args = parser.parse_args()
+
+    data_root = tempfile.mkdtemp(prefix="adaptive_stress_")
+    os.chdir(data_root)
+    from adaptive_agent import storage
+    from adaptive_agent.tuner import clamp
+    initial = storage.load_weights().set_index("suggestion_id")["weight"].to_dict()
+
+    started = time.perf_counter()
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=worker, args=(seed, args.updates, data_root)) for seed in range(args.processes)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0, f"worker exited with {p.exitcode}"
+    elapsed = time.perf_counter() - started
+
+    final = storage.load_weights().set_index("suggestion_id")["weight"].to_dict()
+    log = storage.load_improvements()
+    total = args.processes * args.updates
+    assert len(log) == total, f"improvement log has {len(log)} rows, expected {total}"
+
+    # Replaying the log in order must reproduce every logged step and the final weights
+    replayed = dict(initial)
+    for sid, prev, reward, new in log[["suggestion_id", "prev_weight", "reward", "new_weight"]].itertuples(index=False):
+        assert abs(replayed[sid] - prev) < 1e-9, f"{sid}: log says prev={prev}, replay has {replayed[sid]}"
+        replayed[sid] = clamp(replayed[sid] + ALPHA * reward)
+        assert abs(replayed[sid] - new) < 1e-9, f"{sid}: log says new={new}, replay has {replayed[sid]}"
+    for sid, weight in final.items():
+        assert abs(weight - replayed[sid]) < 1e-9, f"{sid}: weights.csv={weight}, replay={replayed[sid]}"
+
+    # Without clamping the final weight is simply the sum of rewards times alpha
+    sums = log.groupby("suggestion_id")["reward"].sum()
+    for sid, weight in final.items():
+        unclamped = initial[sid] + ALPHA * sums.get(sid, 0)
+        note = "" if abs(unclamped - weight) < 1e-9 else "  (clamped along the way)"
+        print(f"{sid}: final={weight:+.4f} initial+alpha*sum(rewards)={unclamped:+.4f}{note}")
+
+    print(f"OK: {total} updates from {args.processes} processes in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} updates/s), data in {data_root}")
+
+
+if __name__ == "__main__":
+    main()
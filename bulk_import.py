@@ -0,0 +1,159 @@
+"""
+Bulk Import for HackaAIverse
+Reads uploaded spreadsheets and validates every row in one vectorized pass
+"""
+
+import re
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+MEMBER_SEPARATOR = r"\s*[;,|\n]\s*"
+
+TEAM_COLUMNS = ["team_name", "members", "email", "college", "contact_number"]
+SCORE_COLUMNS = ["team_name", "judge_name", "comments"]
+
+# Headers people commonly put on spreadsheets, mapped to the column they mean
+COLUMN_ALIASES = {"team": "team_name", "judge": "judge_name", "comment": "comments", "notes": "comments"}
+
+Rows = Union[pd.DataFrame, Iterable[Dict[str, Any]]]
+
+
+def normalize_column(name: Any) -> str:
+    """'Team Name ' -> 'team_name'"""
+    return re.sub(r"\W+", "_", str(name).strip().lower()).strip("_")
+
+
+def read_table(source: Any, filename: str = "") -> pd.DataFrame:
+    """Load a CSV or XLSX upload (path or file-like) as text with normalized column names"""
+    name = (filename or getattr(source, "name", "") or str(source)).lower()
+    if name.endswith((".xlsx", ".xls")):
+        frame = pd.read_excel(source, dtype=str)
+    else:
+        frame = pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True)
+    frame.columns = [normalize_column(c) for c in frame.columns]
+    return frame
+
+
+def _text_frame(rows: Rows, columns: List[str]) -> pd.DataFrame:
+    frame = rows.copy() if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+    frame.columns = [normalize_column(c) for c in frame.columns]
+    frame = frame.rename(columns={alias: column for alias, column in COLUMN_ALIASES.items()
+                                  if alias in frame and column not in frame})
+    frame = frame.reset_index(drop=True)
+    for column in columns:
+        if column not in frame:
+            frame[column] = ""
+    return frame
+
+
+def _clean(series: pd.Series) -> pd.Series:
+    return series.fillna("").astype(str).str.strip()
+
+
+def _collect_errors(frame: pd.DataFrame, checks: Dict[str, pd.Series]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """Combine boolean failure masks into a valid-row mask and one error entry per failing row"""
+    messages = list(checks)
+    failed = np.column_stack([checks[m].to_numpy(dtype=bool) for m in messages])
+    valid = ~failed.any(axis=1)
+    errors = [
+        # Row numbers match the spreadsheet, where the header is row 1
+        {"row": int(i) + 2, "team_name": frame.at[i, "team_name"],
+         "errors": [messages[j] for j in np.flatnonzero(failed[i])]}
+        for i in np.flatnonzero(~valid)
+    ]
+    return valid, errors
+
+
+def _members(frame: pd.DataFrame) -> pd.Series:
+    """Member lists from a 'members' column (split on ; , | or newlines) or from member_1..member_n columns"""
+    member_columns = sorted((c for c in frame.columns if re.fullmatch(r"member_?\d+", c)),
+                            key=lambda c: int(re.sub(r"\D", "", c)))
+    if member_columns and not _clean(frame["members"]).ne("").any():
+        cleaned = frame[member_columns].apply(_clean)
+        return pd.Series([[m for m in row if m] for row in cleaned.to_numpy().tolist()], index=frame.index)
+    split = _clean(frame["members"]).str.split(MEMBER_SEPARATOR, regex=True)
+    return split.map(lambda names: [m for m in names if m])
+
+
+def validate_teams(rows: Rows, existing_names: Set[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate team registrations: required fields, email format, and team names
+    duplicated within the upload or already registered.
+    Returns (valid team fields, per-row errors).
+    """
+    frame = _text_frame(rows, TEAM_COLUMNS)
+    for column in ["team_name", "email", "college", "contact_number"]:
+        frame[column] = _clean(frame[column])
+    frame["members"] = _members(frame)
+
+    names = frame["team_name"]
+    email = frame["email"]
+    checks = {
+        "team name is required": names.eq(""),
+        "at least one member is required": frame["members"].str.len().eq(0),
+        "email is required": email.eq(""),
+        "email is not a valid address": email.ne("") & ~email.str.fullmatch(EMAIL_PATTERN),
+        "college is required": frame["college"].eq(""),
+        "team name is already registered": names.isin(existing_names),
+        "team name appears earlier in the file": names.ne("") & names.duplicated(keep="first"),
+    }
+    valid, errors = _collect_errors(frame, checks)
+    teams = frame.loc[valid, TEAM_COLUMNS].to_dict("records")
+    return teams, errors
+
+
+def team_key(name: Any) -> str:
+    """Case- and spacing-insensitive lookup key for a team name"""
+    return " ".join(str(name).split()).casefold()
+
+
+def build_team_index(teams: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map team ids and normalized team names to the registered team name"""
+    index = {team_key(team["team_name"]): team["team_name"] for team in teams if team.get("team_name")}
+    index.update({str(team["id"]): team["team_name"] for team in teams if team.get("id")})
+    return index
+
+
+def validate_scores(rows: Rows, team_index: Dict[str, str], criteria: List[str], max_score: int,
+                    judge_name: str = "", scored_pairs: Optional[Set[Tuple[str, str]]] = None
+                    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate a judge scoresheet: one row per team, one column per judging criterion.
+    Teams are matched by id or by name ignoring case and spacing; judge_name fills
+    rows without a judge_name column value. Raises ValueError if criteria columns
+    are missing. Returns (valid score fields, per-row errors).
+    """
+    frame = _text_frame(rows, SCORE_COLUMNS)
+    missing = [c for c in criteria if c not in frame]
+    if missing:
+        raise ValueError(f"Scoresheet is missing criteria columns: {', '.join(missing)}")
+
+    for column in SCORE_COLUMNS:
+        frame[column] = _clean(frame[column])
+    frame["judge_name"] = frame["judge_name"].mask(frame["judge_name"].eq(""), judge_name.strip())
+    resolved = frame["team_name"].map(team_key).map(team_index)
+    resolved = resolved.fillna(frame["team_name"].map(team_index))
+
+    values = frame[criteria].apply(lambda column: pd.to_numeric(_clean(column), errors="coerce"))
+    in_range = values.ge(1) & values.le(max_score) & values.eq(values.round())
+    pairs = pd.Series(list(zip(frame["judge_name"], resolved)), index=frame.index)
+    checks = {
+        "team is not registered": frame["team_name"].ne("") & resolved.isna(),
+        "team name is required": frame["team_name"].eq(""),
+        "judge name is required": frame["judge_name"].eq(""),
+        "a criterion score is missing or not a number": values.isna().any(axis=1),
+        f"scores must be whole numbers from 1 to {max_score}": values.notna().all(axis=1) & ~in_range.all(axis=1),
+        "judge already scored this team": resolved.notna() & pairs.isin(scored_pairs or set()),
+        "team appears earlier in the file for this judge": resolved.notna() & pairs.duplicated(keep="first"),
+    }
+    valid, errors = _collect_errors(frame, checks)
+
+    scores = values.loc[valid].astype(int)
+    return [
+        {"team_name": team, "judge_name": judge, "scores": row_scores, "comments": comments}
+        for team, judge, comments, row_scores in zip(resolved[valid], frame.loc[valid, "judge_name"],
+                                                      frame.loc[valid, "comments"], scores.to_dict("records"))
+    ], errors
@@ -0,0 +1,235 @@
+"""
+College Canonicalization for HackaAIverse
+Maps free-text college names to stable college ids via normalization, aliases and trigram fuzzy matching
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+STOPWORDS = {"of", "the", "and", "for", "at", "in", "a"}
+
+# Abbreviations people type for words that appear in full college names
+ABBREVIATIONS = {
+    "univ": "university", "uni": "university", "inst": "institute", "engg": "engineering",
+    "tech": "technology", "coll": "college", "sci": "science", "mgmt": "management"
+}
+
+def normalize_college(name: Any) -> str:
+    """'Indian Institute of Technology, Delhi' -> 'indian institute technology delhi'"""
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode()
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower().replace("&", " and "))
+    words = [ABBREVIATIONS.get(word, word) for word in text.split()]
+    return " ".join(word for word in words if word not in STOPWORDS)
+
+
+def acronyms(normalized: str) -> List[str]:
+    """
+    Short forms of a normalized full name: 'indian institute technology delhi'
+    also answers to 'iitd' and 'iit delhi'. Names under three words get none,
+    since their initials would be too ambiguous.
+    """
+    words = normalized.split()
+    if len(words) < 3:
+        return []
+    return ["".join(w[0] for w in words), "".join(w[0] for w in words[:-1]) + " " + words[-1]]
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def same_words(first: str, second: str) -> bool:
+    """Whether two normalized names differ only by typos, so 'iit delhi' never matches 'iit goa'"""
+    words, others = first.split(), second.split()
+    if len(words) != len(others):
+        return False
+    return all(a == b or (a[0] == b[0] and SequenceMatcher(None, a, b).ratio() >= 0.8)
+               for a, b in zip(words, others))
+
+
+def college_id_for(normalized: str) -> str:
+    """Stable id derived from the first normalized name a college was seen under"""
+    return "col_" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:10]
+
+
+def load_known_aliases(path: Optional[str]) -> Dict[str, str]:
+    """
+    Former names and nicknames that no spelling rule can derive, from a JSON
+    object mapping each alias to the college's current name. Keys are
+    normalized, so 'NSIT' and 'Netaji Subhas Institute of Technology' both work.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            aliases = json.load(f)
+    except Exception as e:
+        print(f"Error loading college aliases: {e}")
+        return {}
+    return {normalize_college(alias): name for alias, name in aliases.items() if normalize_college(alias)}
+
+
+class CollegeIndex:
+    """
+    Canonical colleges with every spelling they are known by.
+
+    Each college keeps the normalized names it was actually entered as, plus
+    acronyms derived from them. A name resolves in dict lookups when it equals
+    a known spelling or acronym, or when one of its own acronyms equals a known
+    spelling ('Indian Institute of Technology Delhi' finds an earlier 'IIT
+    Delhi') of a college not yet known by any full name. Colleges that merely
+    share initials therefore stay apart.
+
+    Other names are compared only against spellings sharing their rarer
+    trigrams (n-gram blocking), so words like "university" never make every
+    college a candidate. The best candidate whose trigram Dice similarity
+    reaches the threshold and whose words differ only by typos absorbs the new
+    spelling; otherwise the name becomes a new college. The index is saved as
+    JSON next to the collections whenever it learns something; lookups with
+    create=False only read it.
+    """
+
+    def __init__(self, index_path: str, threshold: float = 0.85, candidates: int = 20,
+                 aliases_path: Optional[str] = None):
+        self.index_path = index_path
+        self.threshold = threshold
+        self.candidates = candidates
+        self.known_aliases = load_known_aliases(aliases_path)
+        self._lock = threading.Lock()
+        self._colleges: Dict[str, Dict[str, Any]] = {}
+        self._names: Dict[str, str] = {}
+        self._acronyms: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                colleges = json.load(f)
+        except Exception as e:
+            print(f"Error loading college index: {e}")
+            return
+        for college_id, college in colleges.items():
+            self._colleges[college_id] = college
+            for alias in college["aliases"]:
+                self._index_name(alias, college_id)
+            for acronym in college["acronyms"]:
+                self._acronyms.setdefault(acronym, college_id)
+
+    def _save(self):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._colleges, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.index_path)
+
+    def _index_name(self, alias: str, college_id: str):
+        self._names[alias] = college_id
+        for gram in trigrams(alias):
+            self._postings.setdefault(gram, set()).add(alias)
+
+    def _learn(self, college_id: str, normalized: str) -> bool:
+        """Record a spelling and its acronyms; the first college to claim one keeps it, so ids never move"""
+        college = self._colleges[college_id]
+        changed = False
+        if normalized not in self._names:
+            self._index_name(normalized, college_id)
+            college["aliases"].append(normalized)
+            changed = True
+        for acronym in acronyms(normalized):
+            if acronym not in self._acronyms:
+                self._acronyms[acronym] = college_id
+                college["acronyms"].append(acronym)
+                changed = True
+        return changed
+
+    def _exact(self, normalized: str) -> Optional[str]:
+        for lookup in (self._names, self._acronyms):
+            if normalized in lookup:
+                return lookup[normalized]
+        for acronym in acronyms(normalized):
+            college_id = self._names.get(acronym)
+            if college_id and not any(len(a.split()) >= 3 for a in self._colleges[college_id]["aliases"]):
+                return college_id
+        return None
+
+    def _fuzzy(self, normalized: str) -> Optional[str]:
+        grams = trigrams(normalized)
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        blocking = rarest[:max(3, len(rarest) // 2)]
+        shared = Counter(alias for gram in blocking for alias in self._postings.get(gram, ()))
+        best_id, best_score = None, self.threshold
+        for alias, _ in shared.most_common(self.candidates):
+            other = trigrams(alias)
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score >= best_score and same_words(normalized, alias):
+                best_id, best_score = self._names[alias], score
+        return best_id
+
+    def _resolve(self, name: str, create: bool) -> tuple:
+        """(college id or None, whether the index changed)"""
+        normalized = normalize_college(name)
+        if not normalized:
+            return None, False
+        display = " ".join(str(name).split())
+        if normalized in self.known_aliases:
+            display = self.known_aliases[normalized]
+            normalized = normalize_college(display)
+        college_id = self._exact(normalized) or self._fuzzy(normalized)
+        if not create:
+            return college_id, False
+        if college_id is None:
+            college_id = college_id_for(normalized)
+            self._colleges[college_id] = {"name": display, "aliases": [], "acronyms": []}
+            self._learn(college_id, normalized)
+            return college_id, True
+
+        college = self._colleges[college_id]
+        changed = self._learn(college_id, normalized)
+        # Prefer the fullest spelling as the display name: 'IIT Delhi' becomes the full institute name
+        if len(normalized.split()) > len(normalize_college(college["name"]).split()):
+            college["name"] = display
+            changed = True
+        return college_id, changed
+
+    def resolve(self, name: str, create: bool = True) -> Optional[str]:
+        """College id for a free-text name; new names become new colleges unless create is False"""
+        return self.resolve_many([name], create)[0]
+
+    def resolve_many(self, names: Iterable[str], create: bool = True) -> List[Optional[str]]:
+        """
+        College ids for many names, saving the index at most once. With create
+        False nothing is learned or saved, and unknown names map to None.
+        """
+        with self._lock:
+            ids, changed = [], False
+            for name in names:
+                college_id, learned = self._resolve(name, create)
+                ids.append(college_id)
+                changed = changed or learned
+            if changed:
+                try:
+                    self._save()
+                except Exception as e:
+                    print(f"Error saving college index: {e}")
+            return ids
+
+    def name(self, college_id: Optional[str]) -> str:
+        """Display name of a college id"""
+        college = self._colleges.get(college_id)
+        return college["name"] if college else ""
+
+    def colleges(self) -> Dict[str, Dict[str, Any]]:
+        """Every canonical college with its spellings and acronyms"""
+        with self._lock:
+            return {college_id: {"name": c["name"], "aliases": list(c["aliases"]), "acronyms": list(c["acronyms"])}
+                    for college_id, c in self._colleges.items()}
@@ -3,6 +3,7 @@ Configuration module for HackaAIverse - AI Agent-Based Hackathon System
 """
 
 import os
+import re
 from dotenv import load_dotenv
 from typing import Dict, List
 
@@ -40,6 +41,15 @@ class Config:
     # Judging Configuration
     JUDGING_CRITERIA = os.getenv("JUDGING_CRITERIA", "usefulness,creativity,teamwork,tech_stack,clarity").split(",")
     MAX_SCORE_PER_CRITERIA = int(os.getenv("MAX_SCORE_PER_CRITERIA", "10"))
+    SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.8"))
+    COLLEGE_MATCH_THRESHOLD = float(os.getenv("COLLEGE_MATCH_THRESHOLD", "0.85"))
+    JUDGING_START = os.getenv("JUDGING_START", "18:00")
+    JUDGING_END = os.getenv("JUDGING_END", "18:30")
+    JUDGE_SLOT_MINUTES = int(os.getenv("JUDGE_SLOT_MINUTES", "10"))
+    
+    # UI Configuration
+    PAGE_SIZE = int(os.getenv("PAGE_SIZE", "10"))
+    LEADERBOARD_REFRESH_SECONDS = int(os.getenv("LEADERBOARD_REFRESH_SECONDS", "5"))
     
     # Event Configuration
     EVENT_DATE = os.getenv("EVENT_DATE", "2024-08-15")
@@ -47,11 +57,67 @@ class Config:
     SUBMISSION_DEADLINE = os.getenv("SUBMISSION_DEADLINE", "2024-08-15T18:00:00")
     
     # File paths
-    PROBLEM_FILE = os.path.join(DATA_DIR, "problems.json")
-    TEAMS_FILE = os.path.join(DATA_DIR, "teams.json")
-    PROJECTS_FILE = os.path.join(DATA_DIR, "projects.json")
-    SCORES_FILE = os.path.join(DATA_DIR, "scores.json")
-    OUTREACH_FILE = os.path.join(DATA_DIR, "outreach.json")
+    # Former names and nicknames of colleges, shared by every event: {"alias": "current name"}
+    COLLEGE_ALIASES_FILE = os.getenv("COLLEGE_ALIASES_FILE", os.path.join(DATA_DIR, "college_aliases.json"))
+    EVENT_SNAPSHOT_EVERY = int(os.getenv("EVENT_SNAPSHOT_EVERY", "200"))
+    
+    # Multi-event partitions: every event's files are listed by event_files();
+    # the default event keeps them in DATA_DIR, every other event under PARTITIONS_DIR/<event_id>
+    DEFAULT_EVENT_ID = os.getenv("DEFAULT_EVENT_ID", "default")
+    PARTITIONS_DIR = os.path.join(DATA_DIR, "partitions")
+    MAX_ACTIVE_EVENTS = int(os.getenv("MAX_ACTIVE_EVENTS", "8"))
+    EVENT_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+    
+    @classmethod
+    def validate_event_id(cls, event_id: str) -> str:
+        """Return the event id, or raise ValueError if it is not a safe directory name"""
+        if not isinstance(event_id, str) or not cls.EVENT_ID_PATTERN.match(event_id):
+            raise ValueError(f"Invalid event id '{event_id}': use lowercase letters, digits, '-' and '_'")
+        return event_id
+    
+    @classmethod
+    def event_data_dir(cls, event_id: str) -> str:
+        """Directory holding one event's collections"""
+        if event_id == cls.DEFAULT_EVENT_ID:
+            return cls.DATA_DIR
+        return os.path.join(cls.PARTITIONS_DIR, cls.validate_event_id(event_id))
+    
+    @classmethod
+    def event_files(cls, event_id: str) -> Dict[str, str]:
+        """Paths of every file DataManager keeps for one event"""
+        data_dir = cls.event_data_dir(event_id)
+        return {
+            "problems": os.path.join(data_dir, "problems.json"),
+            "teams": os.path.join(data_dir, "teams.json"),
+            "projects": os.path.join(data_dir, "projects.json"),
+            "scores": os.path.join(data_dir, "scores.json"),
+            "outreach": os.path.join(data_dir, "outreach.json"),
+            "colleges": os.path.join(data_dir, "colleges.json"),
+            "assignments": os.path.join(data_dir, "judge_assignments.json"),
+            "search_index": os.path.join(data_dir, "search_index.jsonl"),
+            "similarity": os.path.join(data_dir, "similarity_vectors.f32"),
+            "leaderboard_snapshot": os.path.join(data_dir, "leaderboard_snapshot.json"),
+            "events": os.path.join(data_dir, "events.jsonl"),
+            "snapshots": os.path.join(data_dir, "snapshots")
+        }
+    
+    @classmethod
+    def event_exists(cls, event_id: str) -> bool:
+        """Whether an event's data directory has been created"""
+        try:
+            return os.path.isdir(cls.event_data_dir(event_id))
+        except ValueError:
+            return False
+    
+    @classmethod
+    def list_events(cls) -> List[str]:
+        """The default event followed by every partitioned event, alphabetically"""
+        partitions = []
+        if os.path.isdir(cls.PARTITIONS_DIR):
+            partitions = sorted(name for name in os.listdir(cls.PARTITIONS_DIR)
+                                if cls.EVENT_ID_PATTERN.match(name) and name != cls.DEFAULT_EVENT_ID
+                                and os.path.isdir(os.path.join(cls.PARTITIONS_DIR, name)))
+        return [cls.DEFAULT_EVENT_ID] + partitions
     
     @classmethod
     def validate_config(cls) -> Dict[str, bool]:
@@ -64,17 +130,24 @@ class Config:
         }
         return validation
     
+    _ready_events = set()
+
     @classmethod
-    def create_data_directory(cls):
-        """Create data directory if it doesn't exist"""
-        os.makedirs(cls.DATA_DIR, exist_ok=True)
+    def create_data_directory(cls, event_id: str = None):
+        """Create an event's data directory if it doesn't exist (once per process)"""
+        event_id = event_id or cls.DEFAULT_EVENT_ID
+        if event_id in cls._ready_events:
+            return
+        files = cls.event_files(event_id)
+        os.makedirs(cls.event_data_dir(event_id), exist_ok=True)
         
         # Create empty JSON files if they don't exist
-        for file_path in [cls.PROBLEM_FILE, cls.TEAMS_FILE, cls.PROJECTS_FILE, cls.SCORES_FILE, cls.OUTREACH_FILE]:
-            if not os.path.exists(file_path):
-                with open(file_path, 'w') as f:
+        for name in ["problems", "teams", "projects", "scores", "outreach"]:
+            if not os.path.exists(files[name]):
+                with open(files[name], 'w') as f:
                     import json
                     json.dump([], f)
+        cls._ready_events.add(event_id)
 
 # Competition categories
 COMPETITION_CATEGORIES = [
@@ -84,6 +157,9 @@ COMPETITION_CATEGORIES = [
     "Open Innovation"
 ]
 
+# Outreach contact statuses
+OUTREACH_STATUSES = ["contacted", "responded", "interested", "registered", "declined"]
+
 # Default problem statements
 DEFAULT_PROBLEMS = [
     {
@@ -133,6 +209,3 @@ HACKATHON_SCHEDULE = {
     "18:00-18:30": "Judging & Evaluation",
     "18:30-19:00": "Results Announcement & Closing Ceremony"
 }
-
-# Initialize configuration
-Config.create_data_directory()
@@ -3,18 +3,71 @@ Data Management Module for HackaAIverse
 Handles JSON-based data storage and retrieval
 """
 
+import functools
+import hashlib
 import json
 import os
+import threading
 import uuid
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, TYPE_CHECKING
 from config import Config
+from college_index import CollegeIndex, normalize_college
+from mapped_collection import MappedCollection, file_signature
+from judge_scheduler import build_schedule
+
+# The search and similarity modules pull in NumPy; they are imported
+# when first used so pages that only read collections start faster
+if TYPE_CHECKING:
+    from event_store import EventStore
+    from outreach_crm import OutreachCRM
+    from search_index import SearchIndex
+    from similarity_index import SimilarityIndex
+
+def _serialized(method):
+    """Run a read-modify-write method under its event's write lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class DataManager:
-    """Handles all data operations for the hackathon system"""
+    """Handles all data operations for one hackathon event"""
     
-    def __init__(self):
-        Config.create_data_directory()
+    def __init__(self, event_id: str = None):
+        self.event_id = Config.validate_event_id(event_id or Config.DEFAULT_EVENT_ID)
+        self.files = Config.event_files(self.event_id)
+        self._event_files = {self.files[name] for name in self.EVENT_COLLECTIONS}
+        Config.create_data_directory(self.event_id)
+        # Writes to one event never wait on another event's lock
+        self._write_lock = threading.RLock()
+        self._mapped: Dict[str, MappedCollection] = {}
+        self._search_index: Optional["SearchIndex"] = None
+        self._similarity_index: Optional["SimilarityIndex"] = None
+        self._event_store: Optional["EventStore"] = None
+        self._outreach_crm: Optional["OutreachCRM"] = None
+        self._college_index: Optional[CollegeIndex] = None
+        self._versions: Dict[str, int] = {}
+        self._subscribers: Dict[int, Callable[[Dict[str, Any]], None]] = {}
+        self._events: deque = deque(maxlen=200)
+        self._event_seq = 0
+        self._next_token = 0
+        self._events_lock = threading.Lock()
+        # Spectator-facing snapshot served by leaderboard_api.py, rewritten whenever rankings can change
+        self._snapshot_hash: Optional[str] = None
+        self.subscribe(lambda event: event["type"] in self.LEADERBOARD_EVENTS and self.write_leaderboard_snapshot())
+    
+    def release_caches(self):
+        """Drop in-memory caches and indexes; they are rebuilt from disk on next use. Locks and versions stay."""
+        with self._write_lock:
+            self._mapped = {}
+            self._search_index = None
+            self._similarity_index = None
+            self._event_store = None
+            self._outreach_crm = None
+            self._college_index = None
     
     def load_json(self, file_path: str) -> List[Dict[str, Any]]:
         """Load data from JSON file"""
@@ -29,23 +82,186 @@ class DataManager:
     
     def save_json(self, file_path: str, data: List[Dict[str, Any]]) -> bool:
         """Save data to JSON file"""
+        if self._event_store is None and file_path in self._event_files:
+            # The audit log's baseline snapshot must predate the first change it records
+            self._get_event_store()
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            # Write to a sibling file and swap it in so mapped readers never see a partial file
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, file_path)
+            self._versions[file_path] = self._versions.get(file_path, 0) + 1
             return True
         except Exception as e:
             print(f"Error saving {file_path}: {e}")
             return False
     
+    # Collection versions, used as cache keys by the UI
+    READ_DEPENDENCIES = {
+        "get_problems": ("problems",),
+        "query_problems": ("problems",),
+        "get_teams": ("teams",),
+        "query_teams": ("teams",),
+        "get_projects": ("projects",),
+        "get_project_by_team": ("projects",),
+        "get_scores": ("scores",),
+        "get_team_scores": ("scores",),
+        "get_leaderboard": ("teams", "projects", "scores"),
+        "search": ("problems", "projects"),
+        "find_similar_projects": ("projects",),
+        "similarity_report": ("projects",),
+        "get_judge_assignments": ("assignments",),
+        "get_judge_queue": ("assignments", "scores"),
+        "get_judging_progress": ("assignments", "scores"),
+        "get_outreach_data": ("outreach",),
+        "query_outreach": ("outreach",),
+        "get_outreach_funnel": ("outreach",),
+        "get_outreach_attribution": ("outreach", "teams", "colleges"),
+        "get_statistics": ("teams", "projects", "scores", "outreach", "colleges"),
+    }
+    
+    def collection_version(self, file_path: str) -> tuple:
+        """Write counter for a collection, plus its file signature to catch writes from other processes"""
+        return (self._versions.get(file_path, 0), tuple(file_signature(file_path) or ()))
+    
+    def read_version(self, method: str) -> tuple:
+        """Combined version of every collection a read method depends on"""
+        return tuple(self.collection_version(self.files[name]) for name in self.READ_DEPENDENCIES[method])
+    
+    # Change notifications
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> int:
+        """Call callback(event) after every team registration, project or score submission; returns a token"""
+        with self._events_lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = callback
+            return self._next_token
+    
+    def unsubscribe(self, token: int):
+        """Stop notifying a subscriber"""
+        with self._events_lock:
+            self._subscribers.pop(token, None)
+    
+    def events_since(self, seq: int) -> List[Dict[str, Any]]:
+        """Recent events newer than seq (only the last 200 are kept)"""
+        with self._events_lock:
+            return [event for event in self._events if event["seq"] > seq]
+    
+    @property
+    def event_seq(self) -> int:
+        return self._event_seq
+    
+    def _publish(self, event_type: str, **details):
+        with self._events_lock:
+            self._event_seq += 1
+            event = {"seq": self._event_seq, "type": event_type,
+                     "timestamp": datetime.now().isoformat(), **details}
+            self._events.append(event)
+            subscribers = list(self._subscribers.values())
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error notifying subscriber of {event_type}: {e}")
+    
+    # Audit Log
+    EVENT_COLLECTIONS = ("problems", "teams", "projects", "scores", "outreach", "assignments")
+    
+    def _get_event_store(self) -> "EventStore":
+        if self._event_store is None:
+            from event_store import EventStore
+            self._event_store = EventStore(
+                self.files["events"], self.files["snapshots"], Config.EVENT_SNAPSHOT_EVERY,
+                baseline=lambda: {name: self.load_json(self.files[name]) for name in self.EVENT_COLLECTIONS}
+            )
+        return self._event_store
+    
+    def _record(self, event_type: str, collection: str, record: Dict[str, Any] = None,
+                records: List[Dict[str, Any]] = None):
+        """Append a saved mutation to the audit log"""
+        try:
+            self._get_event_store().append(event_type, collection, record, records)
+        except Exception as e:
+            print(f"Error recording {event_type} event: {e}")
+    
+    def _record_many(self, event_type: str, collection: str, records: List[Dict[str, Any]]):
+        """Append a bulk write to the audit log as one batch"""
+        try:
+            self._get_event_store().append_many(event_type, collection, records)
+        except Exception as e:
+            print(f"Error recording {event_type} events: {e}")
+    
+    def get_recent_changes(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the latest recorded mutations, newest first"""
+        return self._get_event_store().recent(limit)
+    
+    def get_record_history(self, collection: str, record_id: str) -> List[Dict[str, Any]]:
+        """Get every recorded version of one record, oldest first"""
+        return self._get_event_store().history(collection, record_id)
+    
+    def get_state_at(self, timestamp: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Get every collection as it was at an ISO timestamp"""
+        return self._get_event_store().state_at(timestamp)
+    
+    def _collection(self, file_path: str) -> MappedCollection:
+        """Get the memory-mapped view of a collection file"""
+        collection = self._mapped.get(file_path)
+        if collection is None:
+            collection = self._mapped.setdefault(file_path, MappedCollection(file_path))
+        return collection
+    
+    def lookup_json(self, file_path: str, key: str, value: Any) -> List[Dict[str, Any]]:
+        """Load only the records whose key matches, via the memory-mapped offset index"""
+        try:
+            return self._collection(file_path).get(key, value)
+        except Exception as e:
+            print(f"Error reading {file_path} via index: {e}")
+            return [record for record in self.load_json(file_path) if record.get(key) == value]
+    
+    def query_json(self, file_path: str, offset: int = 0, limit: int = 10,
+                   filters: Dict[str, Any] = None, search: str = "",
+                   search_fields: List[str] = None) -> Dict[str, Any]:
+        """Return one page of a collection plus the total number of matching records"""
+        offset = max(0, offset)
+        filters = {k: v for k, v in (filters or {}).items() if v not in (None, "", "All")}
+        search = (search or "").strip().lower()
+        
+        # Unfiltered pages are decoded straight from the offset index
+        if not filters and not search:
+            try:
+                collection = self._collection(file_path)
+                return {"items": collection.slice(offset, limit), "total": len(collection),
+                        "offset": offset, "limit": limit}
+            except Exception as e:
+                print(f"Error reading {file_path} via index: {e}")
+        
+        records = self.load_json(file_path)
+        if filters:
+            records = [r for r in records if all(r.get(k) == v for k, v in filters.items())]
+        if search:
+            fields = search_fields or []
+            records = [r for r in records if any(search in self._searchable_text(r.get(f)) for f in fields)]
+        
+        return {"items": records[offset:offset + limit], "total": len(records),
+                "offset": offset, "limit": limit}
+    
+    @staticmethod
+    def _searchable_text(value: Any) -> str:
+        if isinstance(value, list):
+            return " ".join(str(v) for v in value).lower()
+        return str(value or "").lower()
+    
     # Problem Statements Management
     def get_problems(self) -> List[Dict[str, Any]]:
         """Get all problem statements"""
-        return self.load_json(Config.PROBLEM_FILE)
+        return self.load_json(self.files["problems"])
     
+    @_serialized
     def add_problem(self, title: str, description: str, category: str = "Open Innovation", 
                    difficulty: str = "Medium", tech_stack: List[str] = None) -> str:
         """Add a new problem statement"""
         problems = self.get_problems()
+        source_version = file_signature(self.files["problems"])
         problem_id = str(uuid.uuid4())[:8]
         
         new_problem = {
@@ -59,19 +275,34 @@ class DataManager:
         }
         
         problems.append(new_problem)
-        self.save_json(Config.PROBLEM_FILE, problems)
+        self.save_json(self.files["problems"], problems)
+        self._record("problem_added", "problems", new_problem)
+        self._index_document("problem", self.files["problems"], source_version,
+                             problem_id, self._problem_text(new_problem))
         return problem_id
     
+    def query_problems(self, offset: int = 0, limit: int = 10, category: str = None,
+                       search: str = "") -> Dict[str, Any]:
+        """Get one page of problem statements, optionally filtered by category and text"""
+        if search and search.strip():
+            problems = [hit["record"] for hit in self.search(search, "problem", limit=None)]
+            if category not in (None, "", "All"):
+                problems = [p for p in problems if p.get("category") == category]
+            return {"items": problems[offset:offset + limit], "total": len(problems),
+                    "offset": offset, "limit": limit}
+        return self.query_json(self.files["problems"], offset, limit, {"category": category}, search,
+                               ["title", "description", "tech_stack"])
+    
     def get_problem_by_id(self, problem_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific problem by ID"""
-        problems = self.get_problems()
-        return next((p for p in problems if p.get("id") == problem_id), None)
+        return next(iter(self.lookup_json(self.files["problems"], "id", problem_id)), None)
     
     # Team Management
     def get_teams(self) -> List[Dict[str, Any]]:
         """Get all registered teams"""
-        return self.load_json(Config.TEAMS_FILE)
+        return self.load_json(self.files["teams"])
     
+    @_serialized
     def register_team(self, team_name: str, members: List[str], email: str, 
                      college: str = "", contact_number: str = "") -> str:
         """Register a new team"""
@@ -88,30 +319,64 @@ class DataManager:
             "members": members,
             "email": email,
             "college": college,
+            "college_id": self._get_college_index().resolve(college),
             "contact_number": contact_number,
             "registered_at": datetime.now().isoformat(),
             "status": "registered"
         }
         
         teams.append(new_team)
-        self.save_json(Config.TEAMS_FILE, teams)
+        self.save_json(self.files["teams"], teams)
+        self._record("team_registered", "teams", new_team)
+        self._publish("team_registered", team_name=team_name)
         return team_id
     
+    @_serialized
+    def register_teams(self, rows, all_or_nothing: bool = False) -> Dict[str, Any]:
+        """Register many teams from a DataFrame or list of dicts with one validation pass and one write"""
+        from bulk_import import validate_teams
+        
+        teams = self.get_teams()
+        valid, errors = validate_teams(rows, {team.get("team_name") for team in teams})
+        if errors and all_or_nothing:
+            return {"registered": [], "errors": errors}
+        
+        registered_at = datetime.now().isoformat()
+        college_ids = self._get_college_index().resolve_many(fields["college"] for fields in valid)
+        new_teams = [
+            {"id": str(uuid.uuid4())[:8], **fields, "college_id": college_id,
+             "registered_at": registered_at, "status": "registered"}
+            for fields, college_id in zip(valid, college_ids)
+        ]
+        if new_teams:
+            teams.extend(new_teams)
+            self.save_json(self.files["teams"], teams)
+            self._record_many("team_registered", "teams", new_teams)
+            self._publish("teams_imported", count=len(new_teams))
+        return {"registered": [team["id"] for team in new_teams], "errors": errors}
+    
+    def query_teams(self, offset: int = 0, limit: int = 10, college: str = None,
+                    search: str = "") -> Dict[str, Any]:
+        """Get one page of registered teams, optionally filtered by college and text"""
+        return self.query_json(self.files["teams"], offset, limit, {"college": college}, search,
+                               ["team_name", "members", "college", "email"])
+    
     def get_team_by_name(self, team_name: str) -> Optional[Dict[str, Any]]:
         """Get team by name"""
-        teams = self.get_teams()
-        return next((t for t in teams if t.get("team_name") == team_name), None)
+        return next(iter(self.lookup_json(self.files["teams"], "team_name", team_name)), None)
     
     # Project Submissions Management
     def get_projects(self) -> List[Dict[str, Any]]:
         """Get all project submissions"""
-        return self.load_json(Config.PROJECTS_FILE)
+        return self.load_json(self.files["projects"])
     
+    @_serialized
     def submit_project(self, team_name: str, project_title: str, description: str,
                       github_link: str = "", demo_link: str = "", tech_stack: List[str] = None,
                       problem_id: str = "") -> str:
         """Submit a project"""
         projects = self.get_projects()
+        source_version = file_signature(self.files["projects"])
         
         # Check if team exists
         team = self.get_team_by_name(team_name)
@@ -120,6 +385,12 @@ class DataManager:
         
         # Check if team already submitted
         existing_project = next((p for p in projects if p.get("team_name") == team_name), None)
+        
+        # Flag near-duplicates of other teams' submissions before saving
+        vector, similar_submissions = self._flag_similar_projects(
+            projects, project_title, description, existing_project["id"] if existing_project else None
+        )
+        
         if existing_project:
             # Update existing submission
             existing_project.update({
@@ -129,9 +400,11 @@ class DataManager:
                 "demo_link": demo_link,
                 "tech_stack": tech_stack or [],
                 "problem_id": problem_id,
+                "similar_submissions": similar_submissions,
                 "updated_at": datetime.now().isoformat()
             })
             submission_id = existing_project["id"]
+            indexed_project = existing_project
         else:
             # Create new submission
             submission_id = str(uuid.uuid4())[:8]
@@ -144,24 +417,33 @@ class DataManager:
                 "demo_link": demo_link,
                 "tech_stack": tech_stack or [],
                 "problem_id": problem_id,
+                "similar_submissions": similar_submissions,
                 "submitted_at": datetime.now().isoformat(),
                 "status": "submitted"
             }
             projects.append(new_project)
+            indexed_project = new_project
         
-        self.save_json(Config.PROJECTS_FILE, projects)
+        self.save_json(self.files["projects"], projects)
+        self._record("project_updated" if existing_project else "project_submitted", "projects", indexed_project)
+        self._index_document("project", self.files["projects"], source_version,
+                             submission_id, self._project_text(indexed_project))
+        if vector is not None:
+            self._similarity_index.upsert(submission_id, vector, file_signature(self.files["projects"]))
+        self._publish("project_submitted", team_name=team_name, submission_id=submission_id,
+                      project_title=project_title, updated=bool(existing_project))
         return submission_id
     
     def get_project_by_team(self, team_name: str) -> Optional[Dict[str, Any]]:
         """Get project submission by team name"""
-        projects = self.get_projects()
-        return next((p for p in projects if p.get("team_name") == team_name), None)
+        return next(iter(self.lookup_json(self.files["projects"], "team_name", team_name)), None)
     
     # Scoring Management
     def get_scores(self) -> List[Dict[str, Any]]:
         """Get all scores"""
-        return self.load_json(Config.SCORES_FILE)
+        return self.load_json(self.files["scores"])
     
+    @_serialized
     def submit_score(self, team_name: str, judge_name: str, scores: Dict[str, int],
                     comments: str = "") -> str:
         """Submit scores for a team"""
@@ -182,18 +464,51 @@ class DataManager:
         }
         
         all_scores.append(new_score)
-        self.save_json(Config.SCORES_FILE, all_scores)
+        self.save_json(self.files["scores"], all_scores)
+        self._record("score_submitted", "scores", new_score)
+        self._publish("score_submitted", team_name=team_name, judge_name=judge_name,
+                      score_id=score_id, total_score=total_score)
         return score_id
     
+    @_serialized
+    def submit_scores(self, rows, judge_name: str = "", all_or_nothing: bool = False) -> Dict[str, Any]:
+        """Submit a whole scoresheet (DataFrame or list of dicts) with one validation pass and one write"""
+        from bulk_import import build_team_index, validate_scores
+        
+        all_scores = self.get_scores()
+        valid, errors = validate_scores(
+            rows, build_team_index(self.get_teams()), Config.JUDGING_CRITERIA, Config.MAX_SCORE_PER_CRITERIA,
+            judge_name, {(s.get("judge_name"), s.get("team_name")) for s in all_scores}
+        )
+        if errors and all_or_nothing:
+            return {"submitted": [], "errors": errors}
+        
+        submitted_at = datetime.now().isoformat()
+        new_scores = [
+            {"id": str(uuid.uuid4())[:8], "team_name": entry["team_name"], "judge_name": entry["judge_name"],
+             "scores": entry["scores"], "total_score": sum(entry["scores"].values()),
+             "comments": entry["comments"], "submitted_at": submitted_at}
+            for entry in valid
+        ]
+        if new_scores:
+            all_scores.extend(new_scores)
+            self.save_json(self.files["scores"], all_scores)
+            self._record_many("score_submitted", "scores", new_scores)
+            # One notification for the whole sheet, so the leaderboard is recomputed once
+            self._publish("scores_imported", count=len(new_scores),
+                          judges=sorted({score["judge_name"] for score in new_scores}))
+        return {"submitted": [score["id"] for score in new_scores], "errors": errors}
+    
     def get_team_scores(self, team_name: str) -> List[Dict[str, Any]]:
         """Get all scores for a specific team"""
-        all_scores = self.get_scores()
-        return [score for score in all_scores if score.get("team_name") == team_name]
+        return self.lookup_json(self.files["scores"], "team_name", team_name)
     
     def calculate_team_average_score(self, team_name: str) -> Dict[str, float]:
         """Calculate average scores for a team"""
-        team_scores = self.get_team_scores(team_name)
-        
+        return self._average_scores(self.get_team_scores(team_name))
+    
+    @staticmethod
+    def _average_scores(team_scores: List[Dict[str, Any]]) -> Dict[str, float]:
         if not team_scores:
             return {"total_average": 0.0, "criteria_averages": {}}
         
@@ -228,13 +543,29 @@ class DataManager:
     
     def get_leaderboard(self) -> List[Dict[str, Any]]:
         """Generate leaderboard with team rankings"""
-        teams = self.get_teams()
-        leaderboard = []
+        return self.build_leaderboard(self.get_teams(), self.get_projects(), self.get_scores())
+    
+    def get_leaderboard_at(self, timestamp: str) -> List[Dict[str, Any]]:
+        """Rebuild the leaderboard as it stood at an ISO timestamp, from the audit log"""
+        state = self.get_state_at(timestamp)
+        return self.build_leaderboard(state.get("teams", []), state.get("projects", []), state.get("scores", []))
+    
+    @classmethod
+    def build_leaderboard(cls, teams: List[Dict[str, Any]], projects: List[Dict[str, Any]],
+                          scores: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rank teams by average score from plain collection lists"""
+        projects_by_team = {}
+        for project in projects:
+            projects_by_team.setdefault(project.get("team_name"), project)
+        scores_by_team: Dict[str, List[Dict[str, Any]]] = {}
+        for score in scores:
+            scores_by_team.setdefault(score.get("team_name"), []).append(score)
         
+        leaderboard = []
         for team in teams:
             team_name = team["team_name"]
-            project = self.get_project_by_team(team_name)
-            score_data = self.calculate_team_average_score(team_name)
+            project = projects_by_team.get(team_name)
+            score_data = cls._average_scores(scores_by_team.get(team_name, []))
             
             leaderboard_entry = {
                 "team_name": team_name,
@@ -257,50 +588,388 @@ class DataManager:
         
         return leaderboard
     
+    # Published events that add, rescore or retitle a leaderboard row
+    LEADERBOARD_EVENTS = {"team_registered", "teams_imported", "project_submitted", "score_submitted",
+                          "scores_imported"}
+    
+    def _published_rankings_hash(self) -> Optional[str]:
+        if self._snapshot_hash is None:
+            try:
+                with open(self.files["leaderboard_snapshot"], "r", encoding="utf-8") as f:
+                    self._snapshot_hash = json.load(f).get("rankings_hash")
+            except (OSError, ValueError):
+                pass
+        return self._snapshot_hash
+    
+    def write_leaderboard_snapshot(self) -> bool:
+        """Write the public leaderboard (no contact details) for the read-only API when the rankings changed"""
+        rankings = [
+            {key: entry[key] for key in ("rank", "team_name", "college", "project_title", "total_average",
+                                         "criteria_averages", "judge_count", "has_submission")}
+            for entry in self.get_leaderboard()
+        ]
+        # The API's ETag comes from this hash, so unchanged rankings keep serving 304s
+        rankings_hash = hashlib.sha1(json.dumps(rankings, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        if rankings_hash == self._published_rankings_hash():
+            return True
+        snapshot = {
+            "hackathon": Config.HACKATHON_NAME,
+            "event": self.event_id,
+            "generated_at": datetime.now().isoformat(),
+            "version": self._event_seq,
+            "rankings_hash": rankings_hash,
+            "teams": rankings
+        }
+        try:
+            temp_path = f"{self.files['leaderboard_snapshot']}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_path, self.files["leaderboard_snapshot"])
+            self._snapshot_hash = rankings_hash
+            return True
+        except Exception as e:
+            print(f"Error writing leaderboard snapshot: {e}")
+            return False
+    
+    # Full-text Search
+    SEARCH_SOURCES = {
+        "problem": "problems",
+        "project": "projects"
+    }
+    
+    @staticmethod
+    def _problem_text(problem: Dict[str, Any]) -> str:
+        return " ".join([problem.get("title", ""), problem.get("description", ""),
+                         " ".join(problem.get("tech_stack", []))])
+    
+    @staticmethod
+    def _project_text(project: Dict[str, Any]) -> str:
+        return " ".join([project.get("project_title", ""), project.get("description", ""),
+                         " ".join(project.get("tech_stack", []))])
+    
+    def _get_search_index(self) -> "SearchIndex":
+        if self._search_index is None:
+            from search_index import SearchIndex
+            self._search_index = SearchIndex(self.files["search_index"])
+        return self._search_index
+    
+    def _index_document(self, doc_type: str, file_path: str, source_version: Optional[List[int]],
+                        doc_id: str, text: str):
+        """Incrementally index one saved record if the index was current before the write"""
+        try:
+            index = self._get_search_index()
+            if index.is_current(doc_type, source_version):
+                index.add(doc_type, doc_id, text, file_signature(file_path))
+        except Exception as e:
+            print(f"Error updating search index: {e}")
+    
+    def _sync_search_index(self, doc_type: str) -> "SearchIndex":
+        """Rebuild one document type if its source file changed outside DataManager"""
+        index = self._get_search_index()
+        file_path = self.files[self.SEARCH_SOURCES[doc_type]]
+        signature = file_signature(file_path)
+        if not index.is_current(doc_type, signature):
+            to_text = self._problem_text if doc_type == "problem" else self._project_text
+            records = self.load_json(file_path)
+            index.rebuild(doc_type, ((r["id"], to_text(r)) for r in records if r.get("id")), signature)
+        return index
+    
+    def search(self, query: str, doc_type: str = None, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """Search problems and/or projects, best BM25 matches first"""
+        doc_types = [doc_type] if doc_type else list(self.SEARCH_SOURCES)
+        try:
+            for kind in doc_types:
+                index = self._sync_search_index(kind)
+            hits = index.search(query, doc_type, limit)
+        except Exception as e:
+            print(f"Error searching: {e}")
+            return []
+        
+        results = []
+        for kind, doc_id, score in hits:
+            record = next(iter(self.lookup_json(self.files[self.SEARCH_SOURCES[kind]], "id", doc_id)), None)
+            if record:
+                results.append({"type": kind, "id": doc_id, "score": score, "record": record})
+        return results
+    
+    # Submission Similarity
+    @staticmethod
+    def _similarity_text(project: Dict[str, Any]) -> str:
+        return f"{project.get('project_title', '')} {project.get('description', '')}"
+    
+    def _sync_similarity_index(self, projects: List[Dict[str, Any]] = None) -> "SimilarityIndex":
+        """Load the similarity index, re-vectorising all projects if the file changed externally"""
+        if self._similarity_index is None:
+            from similarity_index import SimilarityIndex
+            self._similarity_index = SimilarityIndex(self.files["similarity"])
+        index = self._similarity_index
+        signature = file_signature(self.files["projects"])
+        if not index.is_current(signature):
+            if projects is None:
+                projects = self.get_projects()
+            index.rebuild(((p["id"], self._similarity_text(p)) for p in projects if p.get("id")), signature)
+        return index
+    
+    def _flag_similar_projects(self, projects: List[Dict[str, Any]], project_title: str,
+                               description: str, submission_id: Optional[str]):
+        """Vectorise a submission and list other teams' projects above the similarity threshold"""
+        try:
+            index = self._sync_similarity_index(projects)
+            vector = index.vectorize([f"{project_title} {description}"])[0]
+            by_id = {p.get("id"): p for p in projects}
+            similar = [
+                {"id": doc_id, "team_name": by_id[doc_id].get("team_name", ""), "score": score}
+                for doc_id, score in index.nearest(vector, 5, Config.SIMILARITY_THRESHOLD, exclude=submission_id)
+                if doc_id in by_id
+            ]
+            return vector, similar
+        except Exception as e:
+            print(f"Error checking submission similarity: {e}")
+            return None, []
+    
+    def find_similar_projects(self, team_name: str, threshold: float = None, k: int = 5) -> List[Dict[str, Any]]:
+        """Get the submissions most similar to a team's project"""
+        project = self.get_project_by_team(team_name)
+        if not project:
+            return []
+        
+        index = self._sync_similarity_index()
+        threshold = Config.SIMILARITY_THRESHOLD if threshold is None else threshold
+        similar = []
+        for doc_id, score in index.similar_to(project["id"], k, threshold):
+            other = next(iter(self.lookup_json(self.files["projects"], "id", doc_id)), None)
+            if other:
+                similar.append({"team_name": other.get("team_name", ""),
+                                "project_title": other.get("project_title", ""),
+                                "score": score})
+        return similar
+    
+    def similarity_report(self, threshold: float = None) -> List[Dict[str, Any]]:
+        """Get every pair of submissions above the similarity threshold, most similar first"""
+        projects = self.get_projects()
+        index = self._sync_similarity_index(projects)
+        threshold = Config.SIMILARITY_THRESHOLD if threshold is None else threshold
+        by_id = {p.get("id"): p for p in projects}
+        
+        report = []
+        for first_id, second_id, score in index.all_pairs(threshold):
+            if first_id in by_id and second_id in by_id:
+                report.append({
+                    "team_a": by_id[first_id].get("team_name", ""),
+                    "project_a": by_id[first_id].get("project_title", ""),
+                    "team_b": by_id[second_id].get("team_name", ""),
+                    "project_b": by_id[second_id].get("project_title", ""),
+                    "score": score
+                })
+        return report
+    
+    # Judge Scheduling
+    @_serialized
+    def generate_judge_schedule(self, judges: List[Dict[str, Any]], judges_per_team: int = 2,
+                                slot_minutes: int = None) -> Dict[str, Any]:
+        """Assign judges to every registered team and save each judge's timed queue"""
+        teams = self.get_teams()
+        
+        # Use the category of each team's chosen problem so judges can be matched on expertise
+        problem_categories = {p.get("id"): p.get("category") for p in self.get_problems()}
+        project_problems = {p.get("team_name"): p.get("problem_id") for p in self.get_projects()}
+        scheduled_teams = [
+            {**team, "category": problem_categories.get(project_problems.get(team["team_name"]))}
+            for team in self._with_college_ids(teams, "college")
+        ]
+        # Judges are matched to known colleges only, so a judge's affiliation never creates one
+        college_ids = self._get_college_index().resolve_many((j.get("college", "") for j in judges), create=False)
+        judges = [{**judge, "college_id": college_id} for judge, college_id in zip(judges, college_ids)]
+        
+        schedule = build_schedule(
+            scheduled_teams, judges, judges_per_team,
+            slot_minutes or Config.JUDGE_SLOT_MINUTES,
+            Config.JUDGING_START, Config.JUDGING_END
+        )
+        self.save_json(self.files["assignments"], schedule["assignments"])
+        self._record("judges_scheduled", "assignments", records=schedule["assignments"])
+        return schedule
+    
+    def get_judge_assignments(self) -> List[Dict[str, Any]]:
+        """Get the saved judge-to-team assignments"""
+        return self.load_json(self.files["assignments"])
+    
+    def get_judge_queue(self, judge_name: str) -> List[Dict[str, Any]]:
+        """Get a judge's assigned teams in slot order, marking the ones they have scored"""
+        queue = sorted(
+            (a for a in self.get_judge_assignments() if a.get("judge_name") == judge_name),
+            key=lambda a: a.get("slot", 0)
+        )
+        for entry in queue:
+            entry["completed"] = any(
+                score.get("judge_name") == judge_name
+                for score in self.get_team_scores(entry["team_name"])
+            )
+        return queue
+    
+    def get_judging_progress(self) -> Dict[str, Any]:
+        """Get completion of the judging schedule per judge and per team"""
+        assignments = self.get_judge_assignments()
+        scored_pairs = {(s.get("judge_name"), s.get("team_name")) for s in self.get_scores()}
+        
+        judges: Dict[str, Dict[str, int]] = {}
+        teams: Dict[str, Dict[str, int]] = {}
+        for entry in assignments:
+            done = int((entry["judge_name"], entry["team_name"]) in scored_pairs)
+            for bucket, key in ((judges, entry["judge_name"]), (teams, entry["team_name"])):
+                progress = bucket.setdefault(key, {"assigned": 0, "completed": 0})
+                progress["assigned"] += 1
+                progress["completed"] += done
+        
+        completed = sum(p["completed"] for p in judges.values())
+        return {
+            "total_assignments": len(assignments),
+            "completed_assignments": completed,
+            "completion_rate": round(completed / len(assignments) * 100, 1) if assignments else 0,
+            "judges": judges,
+            "teams": teams
+        }
+    
     # Outreach Management
     def get_outreach_data(self) -> List[Dict[str, Any]]:
         """Get outreach campaign data"""
-        return self.load_json(Config.OUTREACH_FILE)
+        return self.load_json(self.files["outreach"])
     
+    def _sync_outreach_crm(self, contacts: List[Dict[str, Any]] = None) -> "OutreachCRM":
+        """Load the outreach indexes, rebuilding them if the file changed outside DataManager"""
+        if self._outreach_crm is None:
+            from outreach_crm import OutreachCRM
+            self._outreach_crm = OutreachCRM()
+        crm = self._outreach_crm
+        signature = file_signature(self.files["outreach"])
+        if not crm.is_current(signature):
+            crm.rebuild(self.get_outreach_data() if contacts is None else contacts, signature)
+        return crm
+    
+    def query_outreach(self, offset: int = 0, limit: int = 10, status: str = None,
+                       search: str = "") -> Dict[str, Any]:
+        """Get one page of outreach contacts, optionally filtered by status and text"""
+        if status not in (None, "", "All") and not (search or "").strip():
+            # Status filter alone: page through the status index, decoding only the page
+            try:
+                with self._write_lock:
+                    positions = self._sync_outreach_crm().positions_with_status(status)
+                collection = self._collection(self.files["outreach"])
+                items = [record for p in positions[offset:offset + limit] for record in collection.slice(p, 1)]
+                return {"items": items, "total": len(positions), "offset": offset, "limit": limit}
+            except Exception as e:
+                print(f"Error reading outreach via index: {e}")
+        return self.query_json(self.files["outreach"], offset, limit, {"status": status}, search,
+                               ["college_name", "contact_person", "contact_email"])
+    
+    @_serialized
     def add_outreach_contact(self, college_name: str, contact_person: str, 
                            contact_email: str, contact_phone: str = "",
                            outreach_method: str = "", status: str = "contacted") -> str:
         """Add outreach contact information"""
         outreach_data = self.get_outreach_data()
+        crm = self._sync_outreach_crm(outreach_data)
         contact_id = str(uuid.uuid4())[:8]
+        contacted_at = datetime.now().isoformat()
         
         new_contact = {
             "id": contact_id,
             "college_name": college_name,
+            "college_id": self._get_college_index().resolve(college_name),
             "contact_person": contact_person,
             "contact_email": contact_email,
             "contact_phone": contact_phone,
             "outreach_method": outreach_method,
             "status": status,
-            "contacted_at": datetime.now().isoformat(),
-            "responses": []
+            "contacted_at": contacted_at,
+            # Status changes are kept as responses so time in each stage can be measured
+            "responses": [] if status == "contacted" else [{"status": status, "note": "", "timestamp": contacted_at}]
         }
         
         outreach_data.append(new_contact)
-        self.save_json(Config.OUTREACH_FILE, outreach_data)
+        self.save_json(self.files["outreach"], outreach_data)
+        crm.add(new_contact, len(outreach_data) - 1, file_signature(self.files["outreach"]))
+        self._record("outreach_added", "outreach", new_contact)
         return contact_id
     
+    @_serialized
     def update_outreach_status(self, contact_id: str, status: str, response_note: str = "") -> bool:
         """Update outreach contact status"""
         outreach_data = self.get_outreach_data()
+        crm = self._sync_outreach_crm(outreach_data)
+        position = crm.position(contact_id)
+        if position is None:
+            return False
         
-        for contact in outreach_data:
-            if contact.get("id") == contact_id:
-                contact["status"] = status
-                if response_note:
-                    contact["responses"].append({
-                        "note": response_note,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                self.save_json(Config.OUTREACH_FILE, outreach_data)
-                return True
-        
-        return False
+        contact = outreach_data[position]
+        if contact.get("status") == status and not response_note:
+            return True
+        contact["status"] = status
+        contact.setdefault("responses", []).append({
+            "status": status,
+            "note": response_note,
+            "timestamp": datetime.now().isoformat()
+        })
+        self.save_json(self.files["outreach"], outreach_data)
+        crm.update(contact, file_signature(self.files["outreach"]))
+        self._record("outreach_status_updated", "outreach", contact)
+        return True
+    
+    def get_outreach_funnel(self) -> Dict[str, Any]:
+        """Get contacts reaching each outreach stage, conversion between stages and time spent in each"""
+        # The indexes are maintained by writers, so readers take the same lock
+        with self._write_lock:
+            return self._sync_outreach_crm().funnel()
+    
+    def get_outreach_attribution(self) -> List[Dict[str, Any]]:
+        """Get each contacted college with the teams that registered from it"""
+        contacts = self.get_outreach_data()
+        with self._write_lock:
+            crm = self._sync_outreach_crm(contacts)
+            return crm.attribution(self._with_college_ids(contacts, "college_name"),
+                                   self._with_college_ids(self.get_teams(), "college"),
+                                   self._get_college_index().name)
+    
+    # College Canonicalization
+    def _get_college_index(self) -> CollegeIndex:
+        if self._college_index is None:
+            self._college_index = CollegeIndex(self.files["colleges"], Config.COLLEGE_MATCH_THRESHOLD,
+                                               aliases_path=Config.COLLEGE_ALIASES_FILE)
+        return self._college_index
+    
+    def _with_college_ids(self, records: List[Dict[str, Any]], field: str,
+                          create: bool = False) -> List[Dict[str, Any]]:
+        """
+        Records with a college_id, resolving only those saved before colleges
+        were canonicalized. Unless create is True this only reads the index, and
+        colleges it does not know get a college_id of None.
+        """
+        missing = [i for i, record in enumerate(records) if "college_id" not in record]
+        if not missing:
+            return records
+        college_ids = self._get_college_index().resolve_many((records[i].get(field, "") for i in missing), create)
+        records = list(records)
+        for i, college_id in zip(missing, college_ids):
+            records[i] = {**records[i], "college_id": college_id}
+        return records
+    
+    @_serialized
+    def backfill_college_ids(self) -> int:
+        """Save a college_id on every team and outreach contact that lacks one; returns how many were filled"""
+        filled = 0
+        for collection, field in (("teams", "college"), ("outreach", "college_name")):
+            records = self.load_json(self.files[collection])
+            resolved = self._with_college_ids(records, field, create=True)
+            if resolved is records:
+                continue
+            filled += sum(a is not b for a, b in zip(records, resolved))
+            self.save_json(self.files[collection], resolved)
+            self._record("college_ids_backfilled", collection, records=resolved)
+        return filled
+    
+    def get_colleges(self) -> Dict[str, Dict[str, Any]]:
+        """Get every canonical college with the spellings it has been entered as"""
+        return self._get_college_index().colleges()
     
     # Statistics and Analytics
     def get_statistics(self) -> Dict[str, Any]:
@@ -308,10 +977,18 @@ class DataManager:
         teams = self.get_teams()
         projects = self.get_projects()
         scores = self.get_scores()
-        outreach = self.get_outreach_data()
+        outreach_funnel = self.get_outreach_funnel()
         
-        # Team statistics
-        colleges = list(set(team.get("college", "Unknown") for team in teams))
+        # Team statistics, counting each canonical college once however its name was typed.
+        # Older teams from colleges the index has not learned yet are grouped by their own name.
+        college_index = self._get_college_index()
+        college_teams, college_names = Counter(), {}
+        for team in self._with_college_ids(teams, "college"):
+            key = team["college_id"] or normalize_college(team.get("college"))
+            if key:
+                college_teams[key] += 1
+                college_names.setdefault(key, college_index.name(team["college_id"]) or " ".join(str(team.get("college")).split()))
+        colleges = [college_names[key] for key, _ in college_teams.most_common()]
         
         # Submission statistics
         submission_rate = len(projects) / len(teams) * 100 if teams else 0
@@ -319,18 +996,45 @@ class DataManager:
         # Scoring statistics
         scored_teams = len(set(score.get("team_name") for score in scores))
         
-        # Outreach statistics
-        outreach_responses = len([c for c in outreach if c.get("status") == "responded"])
-        
         return {
             "total_teams": len(teams),
             "total_colleges": len(colleges),
             "colleges_list": colleges,
+            "college_team_counts": {college_names[key]: n for key, n in college_teams.items()},
             "total_submissions": len(projects),
             "submission_rate": round(submission_rate, 1),
             "scored_teams": scored_teams,
             "total_scores": len(scores),
-            "outreach_contacts": len(outreach),
-            "outreach_responses": outreach_responses,
+            "outreach_contacts": outreach_funnel["total"],
+            "outreach_responses": outreach_funnel["responded"],
             "last_updated": datetime.now().isoformat()
         }
+
+
+# Event partitions
+# Every event keeps one DataManager for the life of the process, so its write lock,
+# collection versions and event sequence are never duplicated. Only the caches and
+# indexes of the MAX_ACTIVE_EVENTS most recently used events stay in memory.
+_partitions: Dict[str, DataManager] = {}
+_active: "OrderedDict[str, None]" = OrderedDict()
+_partitions_lock = threading.Lock()
+
+def get_partition(event_id: str = None) -> DataManager:
+    """The shared DataManager for one event"""
+    event_id = Config.validate_event_id(event_id or Config.DEFAULT_EVENT_ID)
+    with _partitions_lock:
+        manager = _partitions.get(event_id)
+    
+    if manager is None:
+        # Build outside the registry lock so loading one event never blocks requests for another
+        manager = DataManager(event_id)
+    with _partitions_lock:
+        manager = _partitions.setdefault(event_id, manager)
+        _active[event_id] = None
+        _active.move_to_end(event_id)
+        evicted = []
+        while len(_active) > max(1, Config.MAX_ACTIVE_EVENTS):
+            evicted.append(_partitions[_active.popitem(last=False)[0]])
+    for idle in evicted:
+        idle.release_caches()
+    return manager
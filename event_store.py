@@ -0,0 +1,227 @@
+"""
+Event Store for HackaAIverse
+Append-only audit log of every data mutation, with periodic snapshots for point-in-time replay
+"""
+
+import bisect
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
+
+Collections = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+class EventStore:
+    """
+    Immutable events in a JSONL file plus materialized snapshots.
+
+    Each event records the full new state of one record ("put", keyed by id)
+    or of a whole collection ("replace"). Every snapshot_every events the
+    materialized collections are written to snapshot-<seq>.json, and
+    index.jsonl notes its timestamp and the byte offset of the next event, so
+    rebuilding state at any moment only replays the events after the nearest
+    earlier snapshot. Alongside each snapshot, offsets-<seq>.json maps every
+    record to the byte offsets of its put events, so a record's history is a
+    few seeks; recent events are read backwards from the end of the log.
+    """
+
+    def __init__(self, events_path: str, snapshot_dir: str, snapshot_every: int = 200,
+                 baseline: Optional[Callable[[], Dict[str, List[Dict[str, Any]]]]] = None):
+        self.events_path = events_path
+        self.snapshot_dir = snapshot_dir
+        self.index_path = os.path.join(snapshot_dir, "index.jsonl")
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        os.makedirs(snapshot_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._offsets: Dict[str, List[int]] = {}
+
+        if not self._index and baseline is not None and not os.path.exists(events_path):
+            # History starts from whatever the collections held before the first recorded event
+            self._state = {name: self._keyed(records) for name, records in baseline().items()}
+            self.seq = 0
+            self._write_snapshot(datetime.now().isoformat(), 0)
+
+        self._state, self.seq, offset = self._load_snapshot(self._index[-1] if self._index else None)
+        if self._index and "offsets" in self._index[-1]:
+            with open(os.path.join(snapshot_dir, self._index[-1]["offsets"]), "r", encoding="utf-8") as f:
+                self._offsets = json.load(f)
+        else:
+            # Logs written before offsets were kept are indexed with one full scan
+            start = 0
+            for event, end in self._events_from(0):
+                if end > offset:
+                    break
+                self._note_offset(event, start)
+                start = end
+        start = offset
+        for event, offset in self._events_from(offset):
+            self._apply(self._state, event)
+            self._note_offset(event, start)
+            start = offset
+            self.seq = event["seq"]
+        self._since_snapshot = self.seq - (self._index[-1]["seq"] if self._index else 0)
+
+    # Snapshots
+    def _load_index(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.endswith("\n")]
+        return [e for e in entries if os.path.exists(os.path.join(self.snapshot_dir, e["file"]))]
+
+    @staticmethod
+    def _keyed(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        return {str(record.get("id", i)): record for i, record in enumerate(records)}
+
+    def _load_snapshot(self, entry: Optional[Dict[str, Any]]) -> Tuple[Collections, int, int]:
+        if entry is None:
+            return {}, 0, 0
+        with open(os.path.join(self.snapshot_dir, entry["file"]), "r", encoding="utf-8") as f:
+            collections = json.load(f)
+        state = {name: self._keyed(records) for name, records in collections.items()}
+        return state, entry["seq"], entry["offset"]
+
+    def _write_json(self, name: str, data: Any):
+        path = os.path.join(self.snapshot_dir, name)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def _write_snapshot(self, timestamp: str, offset: int):
+        name = f"snapshot-{self.seq:08d}.json"
+        offsets_name = f"offsets-{self.seq:08d}.json"
+        self._write_json(name, {n: list(records.values()) for n, records in self._state.items()})
+        self._write_json(offsets_name, self._offsets)
+        entry = {"seq": self.seq, "timestamp": timestamp, "offset": offset, "file": name, "offsets": offsets_name}
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._index.append(entry)
+        self._since_snapshot = 0
+
+    # Events
+    @staticmethod
+    def _record_key(collection: str, record_id: str) -> str:
+        return f"{collection}/{record_id}"
+
+    def _note_offset(self, event: Dict[str, Any], offset: int):
+        if event.get("op") == "put":
+            self._offsets.setdefault(self._record_key(event["collection"], event["id"]), []).append(offset)
+
+    def _events_from(self, offset: int) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Events starting at a byte offset, each with the offset just past it"""
+        if not os.path.exists(self.events_path):
+            return
+        with open(self.events_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                offset += len(line)
+                if not line.endswith(b"\n"):
+                    return  # torn final line from a crash
+                yield json.loads(line), offset
+
+    @staticmethod
+    def _apply(state: Collections, event: Dict[str, Any]):
+        collection = state.setdefault(event["collection"], {})
+        if event["op"] == "put":
+            collection[event["id"]] = event["record"]
+        elif event["op"] == "replace":
+            # Keyed like puts, so a put after a replace overwrites the record instead of duplicating it
+            state[event["collection"]] = EventStore._keyed(event["records"])
+
+    def append(self, event_type: str, collection: str, record: Dict[str, Any] = None,
+               records: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Record one mutation: the new state of a record, or of a whole collection when records is given"""
+        with self._lock:
+            self.seq += 1
+            event = {"seq": self.seq, "timestamp": datetime.now().isoformat(), "type": event_type,
+                     "collection": collection}
+            if records is not None:
+                event.update(op="replace", records=records)
+            else:
+                event.update(op="put", id=str(record["id"]), record=record)
+            self._write_events([event])
+            return event
+
+    def append_many(self, event_type: str, collection: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record one put event per record with a single write, e.g. for a bulk import"""
+        with self._lock:
+            timestamp = datetime.now().isoformat()
+            events = []
+            for record in records:
+                self.seq += 1
+                events.append({"seq": self.seq, "timestamp": timestamp, "type": event_type,
+                               "collection": collection, "op": "put", "id": str(record["id"]), "record": record})
+            if events:
+                self._write_events(events)
+            return events
+
+    def _write_events(self, events: List[Dict[str, Any]]):
+        lines = [(json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8") for event in events]
+        with open(self.events_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(b"".join(lines))
+        for event, line in zip(events, lines):
+            self._apply(self._state, event)
+            self._note_offset(event, offset)
+            offset += len(line)
+        self._since_snapshot += len(events)
+        # A batch is snapshotted once at its end, never part-way through
+        if self._since_snapshot >= self.snapshot_every:
+            self._write_snapshot(events[-1]["timestamp"], offset)
+
+    # Queries
+    def state_at(self, timestamp: str = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Every collection as it was at an ISO timestamp (now if omitted)"""
+        with self._lock:
+            if timestamp is None:
+                return {name: list(records.values()) for name, records in self._state.items()}
+            # Latest snapshot taken at or before the timestamp, then its tail of events
+            position = bisect.bisect_right([entry["timestamp"] for entry in self._index], timestamp)
+            state, _, offset = self._load_snapshot(self._index[position - 1] if position else None)
+            for event, _ in self._events_from(offset):
+                if event["timestamp"] > timestamp:
+                    break
+                self._apply(state, event)
+        return {name: list(records.values()) for name, records in state.items()}
+
+    def history(self, collection: str, record_id: str) -> List[Dict[str, Any]]:
+        """Every recorded version of one record, oldest first"""
+        with self._lock:
+            offsets = list(self._offsets.get(self._record_key(collection, str(record_id)), ()))
+        if not offsets:
+            return []
+        events = []
+        with open(self.events_path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                events.append(json.loads(f.readline()))
+        return events
+
+    def recent(self, limit: int = 50, block_size: int = 65536) -> List[Dict[str, Any]]:
+        """The latest events, newest first, read backwards from the end of the log"""
+        if limit <= 0 or not os.path.exists(self.events_path):
+            return []
+        events = []
+        with open(self.events_path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            f.seek(max(0, position - 1))
+            torn = f.read(1) != b"\n"  # a crash can leave a partial final line
+            tail = b""
+            while position > 0 and len(events) < limit:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + tail).split(b"\n")
+                # The first piece may be the end of a line that starts in an earlier block
+                tail = lines.pop(0) if position > 0 else b""
+                if torn and lines:
+                    lines.pop()
+                    torn = False
+                for line in reversed(lines):
+                    if line and len(events) < limit:
+                        events.append(json.loads(line))
+        return events
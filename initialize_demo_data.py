@@ -3,11 +3,10 @@ Demo Data Initialization Script for HackaAIverse 2024
 This script populates the system with sample data for demonstration purposes
 """
 
-import json
 import os
 from datetime import datetime, timedelta
 from data_manager import DataManager
-from config import Config, DEFAULT_PROBLEMS
+from config import DEFAULT_PROBLEMS
 
 def initialize_demo_data():
     """Initialize the system with comprehensive demo data"""
@@ -21,8 +20,7 @@ def initialize_demo_data():
     print("📝 Adding problem statements...")
     
     # Clear existing problems and add default ones
-    with open(Config.PROBLEM_FILE, 'w') as f:
-        json.dump(DEFAULT_PROBLEMS, f, indent=2)
+    data_manager.save_json(data_manager.files["problems"], DEFAULT_PROBLEMS)
     
     # Add additional generated problems
     additional_problems = [
@@ -54,7 +52,7 @@ def initialize_demo_data():
     
     problems = data_manager.get_problems()
     problems.extend(additional_problems)
-    data_manager.save_json(Config.PROBLEM_FILE, problems)
+    data_manager.save_json(data_manager.files["problems"], problems)
     
     # 2. Register Sample Teams
     print("👥 Registering sample teams...")
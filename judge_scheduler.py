@@ -0,0 +1,151 @@
+"""
+Judge Scheduling Module for HackaAIverse
+Balanced, conflict-free judge-to-team assignment with timed judging queues
+"""
+
+import heapq
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Set
+
+
+def _normalize(value: str) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def _has_conflict(judge: Dict[str, Any], team: Dict[str, Any]) -> bool:
+    """A judge may not score a team from their own college"""
+    if judge.get("college_id") and team.get("college_id"):
+        # Canonical ids also catch the same college spelled differently ('IIT Delhi' vs the full name)
+        return judge["college_id"] == team["college_id"]
+    judge_college = _normalize(judge.get("college", ""))
+    return bool(judge_college) and judge_college == _normalize(team.get("college", ""))
+
+
+def assign_judges(teams: List[Dict[str, Any]], judges: List[Dict[str, Any]],
+                  judges_per_team: int = 2) -> Dict[str, Any]:
+    """
+    Assign judges_per_team distinct, non-conflicting judges to every team.
+
+    Greedy pass: most constrained teams first, each takes its least-loaded
+    eligible judges (preferring judges whose expertise matches the team's
+    category) up to a per-judge capacity. Repair pass: a short team takes a
+    full judge by moving one of that judge's other teams to an eligible judge
+    with spare capacity.
+    """
+    judge_names = [j["name"] for j in judges]
+    by_name = {j["name"]: j for j in judges}
+    team_names = [t["team_name"] for t in teams]
+    by_team = {t["team_name"]: t for t in teams}
+    if not judges or not teams:
+        return {"team_judges": {t: [] for t in team_names}, "judge_teams": {j: [] for j in judge_names},
+                "unfilled": {t: judges_per_team for t in team_names} if not judges else {}}
+
+    eligible: Dict[str, Set[str]] = {
+        t["team_name"]: {j["name"] for j in judges if not _has_conflict(j, t)} for t in teams
+    }
+    capacity = math.ceil(len(teams) * judges_per_team / len(judges))
+    load = {name: 0 for name in judge_names}
+    team_judges: Dict[str, List[str]] = {t: [] for t in team_names}
+    judge_teams: Dict[str, List[str]] = {j: [] for j in judge_names}
+
+    def expertise_miss(judge_name: str, team_name: str) -> int:
+        category = by_team[team_name].get("category")
+        expertise = by_name[judge_name].get("expertise") or []
+        return 0 if not category or category in expertise else 1
+
+    def assign(judge_name: str, team_name: str):
+        team_judges[team_name].append(judge_name)
+        judge_teams[judge_name].append(team_name)
+        load[judge_name] += 1
+
+    def unassign(judge_name: str, team_name: str):
+        team_judges[team_name].remove(judge_name)
+        judge_teams[judge_name].remove(team_name)
+        load[judge_name] -= 1
+
+    # Greedy pass, most constrained teams first
+    for team_name in sorted(team_names, key=lambda t: (len(eligible[t]), t)):
+        heap = [(load[j], expertise_miss(j, team_name), j) for j in eligible[team_name] if load[j] < capacity]
+        heapq.heapify(heap)
+        while heap and len(team_judges[team_name]) < judges_per_team:
+            _, _, judge_name = heapq.heappop(heap)
+            assign(judge_name, team_name)
+
+    # Repair pass: free a slot on a full judge by moving one of their other teams
+    for team_name in team_names:
+        for _ in range(judges_per_team - len(team_judges[team_name])):
+            repaired = False
+            for judge_name in sorted(eligible[team_name] - set(team_judges[team_name]), key=lambda j: load[j]):
+                if load[judge_name] < capacity:
+                    assign(judge_name, team_name)
+                    repaired = True
+                    break
+                for other_team in list(judge_teams[judge_name]):
+                    spare = [j for j in eligible[other_team] - set(team_judges[other_team])
+                             if load[j] < capacity]
+                    if spare:
+                        replacement = min(spare, key=lambda j: (load[j], expertise_miss(j, other_team)))
+                        unassign(judge_name, other_team)
+                        assign(replacement, other_team)
+                        assign(judge_name, team_name)
+                        repaired = True
+                        break
+                if repaired:
+                    break
+            if not repaired:
+                break
+
+    unfilled = {t: judges_per_team - len(js) for t, js in team_judges.items() if len(js) < judges_per_team}
+    return {"team_judges": team_judges, "judge_teams": judge_teams, "unfilled": unfilled}
+
+
+def build_schedule(teams: List[Dict[str, Any]], judges: List[Dict[str, Any]], judges_per_team: int = 2,
+                   slot_minutes: int = 10, start_time: str = "18:00",
+                   end_time: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Assign judges and lay each judge's teams out in timed slots.
+
+    Slots are filled round by round so a team is never in front of two
+    judges in the same slot.
+    """
+    result = assign_judges(teams, judges, judges_per_team)
+    remaining = {judge: list(team_list) for judge, team_list in result["judge_teams"].items()}
+    start = datetime.strptime(start_time, "%H:%M")
+
+    rows = []
+    slot = 0
+    while any(remaining.values()):
+        busy = set()
+        for judge_name, queue in remaining.items():
+            team_name = next((t for t in queue if t not in busy), None)
+            if team_name is None:
+                continue
+            queue.remove(team_name)
+            busy.add(team_name)
+            slot_start = start + timedelta(minutes=slot * slot_minutes)
+            rows.append({
+                "judge_name": judge_name,
+                "team_name": team_name,
+                "slot": slot,
+                "start": slot_start.strftime("%H:%M"),
+                "end": (slot_start + timedelta(minutes=slot_minutes)).strftime("%H:%M")
+            })
+        slot += 1
+
+    finish = start + timedelta(minutes=slot * slot_minutes)
+    overruns = False
+    if end_time and slot > 0:
+        # A window ending earlier in the day than it starts closes after midnight
+        window_end = datetime.strptime(end_time, "%H:%M")
+        if window_end < start:
+            window_end += timedelta(days=1)
+        overruns = finish > window_end
+
+    return {
+        "assignments": rows,
+        "unfilled": result["unfilled"],
+        "slots": slot,
+        "ends_at": finish.strftime("%H:%M"),
+        "overruns_window": overruns
+    }
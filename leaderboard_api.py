@@ -0,0 +1,186 @@
+"""
+Public Leaderboard API for HackaAIverse
+Read-only ASGI app serving the precomputed leaderboard snapshot with ETags and gzip
+
+Run with:  uvicorn leaderboard_api:app --port 8502
+Other events are served under /events/<event_id>/leaderboard
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import Config
+
+CACHE_SECONDS = int(os.getenv("LEADERBOARD_API_CACHE_SECONDS", "2"))
+
+
+class SnapshotCache:
+    """Snapshot bytes, their gzip encoding and ETag, reloaded only when the file changes"""
+
+    def __init__(self, file_path: str, check_interval: float = 0.5):
+        self.file_path = file_path
+        self.check_interval = check_interval
+        self._signature = None
+        self._checked_at = 0.0
+        self._entry: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        if self._entry is not None and now - self._checked_at < self.check_interval:
+            return self._entry
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.file_path)
+            except OSError:
+                return self._entry
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                with open(self.file_path, "rb") as f:
+                    body = f.read()
+                self._entry = {
+                    "body": body,
+                    "gzip": gzip.compress(body, compresslevel=6),
+                    "etag": self._etag(body),
+                    "last_modified": formatdate(stat.st_mtime, usegmt=True)
+                }
+                self._signature = signature
+            return self._entry
+
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        """Version plus rankings hash, so a rewrite with the same rankings keeps the ETag"""
+        try:
+            snapshot = json.loads(body)
+            rankings_hash = snapshot.get("rankings_hash") or hashlib.sha1(
+                json.dumps(snapshot.get("teams"), sort_keys=True).encode("utf-8")).hexdigest()
+            return f'"{snapshot.get("version", 0)}-{rankings_hash[:20]}"'
+        except (ValueError, AttributeError):
+            return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+snapshots: Dict[str, SnapshotCache] = {}
+
+
+def ensure_snapshot(event_id: str = None):
+    """Build an event's snapshot if the Streamlit app has not written one yet"""
+    event_id = event_id or Config.DEFAULT_EVENT_ID
+    if not os.path.exists(Config.event_files(event_id)["leaderboard_snapshot"]):
+        from data_manager import get_partition
+        get_partition(event_id).write_leaderboard_snapshot()
+
+
+def snapshot_for(event_id: str) -> Optional[SnapshotCache]:
+    """The snapshot cache of an existing event, or None for unknown events"""
+    cache = snapshots.get(event_id)
+    if cache is None:
+        if not Config.event_exists(event_id):
+            return None
+        try:
+            ensure_snapshot(event_id)
+        except Exception as e:
+            print(f"Error building leaderboard snapshot for {event_id}: {e}")
+        cache = snapshots.setdefault(event_id, SnapshotCache(Config.event_files(event_id)["leaderboard_snapshot"]))
+    return cache
+
+
+def _header(scope: Dict[str, Any], name: bytes) -> str:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as required for If-None-Match
+    tags = [tag.strip() for tag in if_none_match.split(",") if tag.strip()]
+    return any(tag == "*" or tag.removeprefix("W/") == etag for tag in tags)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+async def _respond(send, status: int, headers: List[Tuple[str, str]], body: bytes = b""):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    ensure_snapshot()
+                except Exception as e:
+                    print(f"Error building leaderboard snapshot: {e}")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    common = [("access-control-allow-origin", "*")]
+    path = scope["path"].rstrip("/") or "/"
+    if path == "/healthz":
+        await _respond(send, 200, common + [("content-type", "text/plain")], b"ok")
+        return
+
+    # /leaderboard for the default event, /events/<event_id>/leaderboard for the others
+    event_id = Config.DEFAULT_EVENT_ID
+    if path.startswith("/events/"):
+        event_id, _, path = path[len("/events/"):].partition("/")
+        path = "/" + path
+    cache = snapshot_for(event_id) if path in ("/", "/leaderboard", "/leaderboard.json") else None
+    if cache is None:
+        await _respond(send, 404, common + [("content-type", "text/plain")], b"not found")
+        return
+    if scope["method"] not in ("GET", "HEAD"):
+        await _respond(send, 405, common + [("allow", "GET, HEAD"), ("content-type", "text/plain")],
+                       b"method not allowed")
+        return
+
+    entry = cache.get()
+    if entry is None:
+        await _respond(send, 503, common + [("content-type", "text/plain"), ("retry-after", "5")],
+                       b"leaderboard not published yet")
+        return
+
+    headers = common + [
+        ("etag", entry["etag"]),
+        ("last-modified", entry["last_modified"]),
+        ("cache-control", f"public, max-age={CACHE_SECONDS}"),
+        ("vary", "accept-encoding"),
+    ]
+    if _etag_matches(_header(scope, b"if-none-match"), entry["etag"]):
+        await _respond(send, 304, headers)
+        return
+
+    body = entry["body"]
+    if _accepts_gzip(_header(scope, b"accept-encoding")):
+        body = entry["gzip"]
+        headers.append(("content-encoding", "gzip"))
+    headers += [("content-type", "application/json"), ("content-length", str(len(body)))]
+    await _respond(send, 200, headers, b"" if scope["method"] == "HEAD" else body)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=os.getenv("LEADERBOARD_API_HOST", "0.0.0.0"),
+                port=int(os.getenv("LEADERBOARD_API_PORT", "8502")))
@@ -0,0 +1,139 @@
+"""
+Memory-mapped read path for HackaAIverse JSON collections
+Indexes record byte offsets so single records can be decoded on demand
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+# JSON strings (with escapes) and structural brackets; everything else is skipped
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+_COLON = re.compile(rb'\s*:\s*')
+
+
+def file_signature(file_path: str) -> Optional[List[int]]:
+    """Cheap change marker for a source file (mtime and size)"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class MappedCollection:
+    """Byte-offset index over a JSON array of records stored on disk"""
+
+    def __init__(self, file_path: str, keys: Tuple[str, ...] = ("id", "team_name")):
+        self.file_path = file_path
+        self.keys = tuple(keys)
+        self._wanted = {json.dumps(key).encode("utf-8"): key for key in self.keys}
+        self._signature = None
+        self._spans: List[Tuple[int, int]] = []
+        self._index: Dict[str, Dict[Any, List[int]]] = {key: {} for key in self.keys}
+        self._lock = threading.Lock()
+
+    def _reset(self, signature):
+        self._signature = signature
+        self._spans = []
+        self._index = {key: {} for key in self.keys}
+
+    def _build(self, mm: mmap.mmap):
+        """Scan the mapped file once and record the span of every top-level record"""
+        spans = []
+        index = {key: {} for key in self.keys}
+        depth = 0
+        start = 0
+        pending = None
+
+        for match in _TOKEN.finditer(mm):
+            token = match.group()
+            head = token[:1]
+
+            if head == b'"':
+                if depth == 2:
+                    if pending is not None:
+                        index[pending].setdefault(json.loads(token), []).append(len(spans))
+                        pending = None
+                    elif token in self._wanted:
+                        colon = _COLON.match(mm, match.end())
+                        # Only string values are indexed; ids and team names are always strings
+                        if colon and mm[colon.end():colon.end() + 1] == b'"':
+                            pending = self._wanted[token]
+                continue
+
+            pending = None
+            if head in (b"{", b"["):
+                depth += 1
+                if depth == 2 and head == b"{":
+                    start = match.start()
+            else:
+                if depth == 2 and head == b"}":
+                    spans.append((start, match.end()))
+                depth -= 1
+
+        self._spans = spans
+        self._index = index
+
+    @contextmanager
+    def _mapped(self) -> Iterator[Optional[mmap.mmap]]:
+        """Map the file read-only, re-indexing first if it changed since the last scan"""
+        with self._lock:
+            if not os.path.exists(self.file_path):
+                self._reset(None)
+                yield None
+                return
+
+            with open(self.file_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if stat.st_size == 0:
+                    self._reset(signature)
+                    yield None
+                    return
+
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if signature != self._signature:
+                        self._build(mm)
+                        self._signature = signature
+                    yield mm
+
+    def __len__(self) -> int:
+        with self._mapped():
+            return len(self._spans)
+
+    def values(self, key: str) -> List[Any]:
+        """List the distinct indexed values for a key"""
+        with self._mapped():
+            return list(self._index.get(key, {}).keys())
+
+    def get(self, key: str, value: Any) -> List[Dict[str, Any]]:
+        """Decode only the records whose indexed key equals value"""
+        with self._mapped() as mm:
+            if mm is None:
+                return []
+            positions = self._index.get(key, {}).get(value, [])
+            return [json.loads(mm[start:end]) for start, end in (self._spans[p] for p in positions)]
+
+    def first(self, key: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Decode the first record whose indexed key equals value"""
+        with self._mapped() as mm:
+            if mm is None:
+                return None
+            positions = self._index.get(key, {}).get(value)
+            if not positions:
+                return None
+            start, end = self._spans[positions[0]]
+            return json.loads(mm[start:end])
+
+    def slice(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Decode a contiguous run of records by position"""
+        with self._mapped() as mm:
+            if mm is None:
+                return []
+            stop = None if limit is None else offset + limit
+            return [json.loads(mm[start:end]) for start, end in self._spans[offset:stop]]
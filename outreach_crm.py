@@ -0,0 +1,190 @@
+"""
+Outreach CRM for HackaAIverse
+Id and status indexes over outreach contacts, with a conversion funnel maintained incrementally
+"""
+
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Set
+
+# The funnel runs left to right; a contact can decline from any stage
+FUNNEL_STAGES = ["contacted", "responded", "interested", "registered"]
+DECLINED = "declined"
+
+
+def college_key(record: Dict[str, Any], field: str) -> str:
+    """Key joining outreach colleges to team colleges: the canonical college_id, else the name ignoring case and spacing"""
+    return record.get("college_id") or " ".join(str(record.get(field) or "").split()).casefold()
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def status_history(contact: Dict[str, Any]) -> List[tuple]:
+    """
+    (status, entered_at) pairs for a contact, oldest first: contacted at
+    contacted_at, then every response that records a status change. Contacts
+    saved before responses carried a status only know their current status.
+    """
+    changes = [(r["status"], r.get("timestamp")) for r in contact.get("responses", []) if r.get("status")]
+    if not changes:
+        return [(contact.get("status", "contacted"), contact.get("contacted_at"))]
+    return [("contacted", contact.get("contacted_at"))] + changes
+
+
+class OutreachCRM:
+    """
+    In-memory indexes over the outreach collection.
+
+    Every contact is reduced to a small summary (furthest funnel stage, the
+    stage it declined from, completed time spent in each stage). Funnel totals
+    are sums of these summaries, so adding or updating one contact adjusts the
+    totals by that contact's difference instead of rescanning the file.
+    """
+
+    def __init__(self):
+        self.signature: Optional[List[int]] = None
+        self._positions: Dict[str, int] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._reached = {stage: 0 for stage in FUNNEL_STAGES}
+        self._declined_from = {stage: 0 for stage in FUNNEL_STAGES}
+        self._stage_seconds = {stage: 0.0 for stage in FUNNEL_STAGES + [DECLINED]}
+        self._stage_exits = {stage: 0 for stage in FUNNEL_STAGES + [DECLINED]}
+
+    def is_current(self, signature: Optional[List[int]]) -> bool:
+        return self.signature is not None and self.signature == signature
+
+    def rebuild(self, contacts: List[Dict[str, Any]], signature: Optional[List[int]]):
+        self.__init__()
+        for position, contact in enumerate(contacts):
+            if contact.get("id"):
+                self._positions[contact["id"]] = position
+                self._apply(contact, 1)
+        self.signature = signature
+
+    # Incremental maintenance
+    @staticmethod
+    def _summarize(contact: Dict[str, Any]) -> Dict[str, Any]:
+        history = status_history(contact)
+        stages = [FUNNEL_STAGES.index(s) for s, _ in history if s in FUNNEL_STAGES]
+        furthest = max(stages) if stages else 0  # every contact has at least been contacted
+        declined_from = None
+        if contact.get("status") == DECLINED:
+            declined_from = FUNNEL_STAGES[stages[-1]] if stages else "contacted"
+
+        durations = []
+        for (stage, entered), (_, left) in zip(history, history[1:]):
+            entered, left = _parse_time(entered), _parse_time(left)
+            if entered and left and stage in FUNNEL_STAGES + [DECLINED]:
+                durations.append((stage, max(0.0, (left - entered).total_seconds())))
+        return {"status": contact.get("status", "contacted"), "furthest": furthest,
+                "declined_from": declined_from, "durations": durations}
+
+    def _apply(self, contact: Dict[str, Any], sign: int):
+        contact_id = contact["id"]
+        summary = self._summarize(contact) if sign > 0 else self._summaries.pop(contact_id)
+        if sign > 0:
+            self._summaries[contact_id] = summary
+            self._by_status.setdefault(summary["status"], set()).add(contact_id)
+        else:
+            self._by_status.get(summary["status"], set()).discard(contact_id)
+
+        for stage in FUNNEL_STAGES[:summary["furthest"] + 1]:
+            self._reached[stage] += sign
+        if summary["declined_from"]:
+            self._declined_from[summary["declined_from"]] += sign
+        for stage, seconds in summary["durations"]:
+            self._stage_seconds[stage] += sign * seconds
+            self._stage_exits[stage] += sign
+
+    def add(self, contact: Dict[str, Any], position: int, signature: Optional[List[int]] = None):
+        """Index a contact appended at position"""
+        self._positions[contact["id"]] = position
+        self._apply(contact, 1)
+        self.signature = signature
+
+    def update(self, contact: Dict[str, Any], signature: Optional[List[int]] = None):
+        """Re-index a contact whose status or responses changed"""
+        if contact["id"] in self._summaries:
+            self._apply(contact, -1)
+        self._apply(contact, 1)
+        self.signature = signature
+
+    # Queries
+    def position(self, contact_id: str) -> Optional[int]:
+        return self._positions.get(contact_id)
+
+    def positions_with_status(self, status: str) -> List[int]:
+        """File positions of the contacts currently in a status, in file order"""
+        return sorted(self._positions[i] for i in self._by_status.get(status, ()))
+
+    def status_counts(self) -> Dict[str, int]:
+        return {status: len(ids) for status, ids in self._by_status.items() if ids}
+
+    def funnel(self) -> Dict[str, Any]:
+        """Contacts reaching each stage, stage-to-stage conversion, declines and average days per stage"""
+        counts = self.status_counts()
+        stages = []
+        for i, stage in enumerate(FUNNEL_STAGES):
+            reached = self._reached[stage]
+            following = self._reached[FUNNEL_STAGES[i + 1]] if i + 1 < len(FUNNEL_STAGES) else None
+            exits = self._stage_exits[stage]
+            stages.append({
+                "stage": stage,
+                "reached": reached,
+                "current": counts.get(stage, 0),
+                "conversion": round(following / reached * 100, 1) if following is not None and reached else None,
+                "declined_here": self._declined_from[stage],
+                "avg_days_in_stage": round(self._stage_seconds[stage] / exits / 86400, 2) if exits else None
+            })
+        total = len(self._summaries)
+        return {
+            "total": total,
+            "stages": stages,
+            "declined": counts.get(DECLINED, 0),
+            "responded": self._reached["responded"]
+        }
+
+    def attribution(self, contacts: List[Dict[str, Any]], teams: List[Dict[str, Any]],
+                    college_name: Callable[[str], str] = None) -> List[Dict[str, Any]]:
+        """
+        Per outreach college: its best status and the teams registered from it,
+        before and after first contact. college_name maps a college_id to the
+        name to display.
+        """
+        colleges: Dict[str, Dict[str, Any]] = {}
+        for contact in contacts:
+            summary = self._summaries.get(contact.get("id"))
+            if summary is None:
+                continue
+            college_id = contact.get("college_id")
+            entry = colleges.setdefault(college_key(contact, "college_name"), {
+                "college": college_name(college_id) if college_name and college_id else contact.get("college_name", ""),
+                "college_id": college_id, "contacts": 0, "furthest": 0,
+                "first_contacted_at": contact.get("contacted_at") or ""
+            })
+            entry["contacts"] += 1
+            entry["furthest"] = max(entry["furthest"], summary["furthest"])
+            entry["first_contacted_at"] = min(entry["first_contacted_at"], contact.get("contacted_at") or "")
+
+        for entry in colleges.values():
+            entry.update(teams_registered=0, teams_after_contact=0)
+        for team in teams:
+            entry = colleges.get(college_key(team, "college"))
+            if entry is not None:
+                entry["teams_registered"] += 1
+                entry["teams_after_contact"] += team.get("registered_at", "") >= entry["first_contacted_at"]
+
+        report = [
+            {"college": e["college"], "college_id": e["college_id"], "contacts": e["contacts"],
+             "furthest_stage": FUNNEL_STAGES[e["furthest"]],
+             "first_contacted_at": e["first_contacted_at"], "teams_registered": e["teams_registered"],
+             "teams_after_contact": e["teams_after_contact"]}
+            for e in colleges.values()
+        ]
+        report.sort(key=lambda e: (e["teams_after_contact"], e["teams_registered"]), reverse=True)
+        return report
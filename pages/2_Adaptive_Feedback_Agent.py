@@ -1,22 +1,37 @@
+import uuid
 import streamlit as st
 import pandas as pd
 from adaptive_agent.suggestion_engine import choose_suggestion
-from adaptive_agent.tuner import update_weight
-from adaptive_agent.storage import load_weights, load_feedback, load_improvements, log_feedback
+from adaptive_agent.ingest import get_ingestor
+from adaptive_agent.storage import tail_feedback, tail_improvements
+from adaptive_agent.templates import get_library
 
 st.set_page_config(page_title="Adaptive Feedback Agent", page_icon="⚙️", layout="centered")
 st.title("⚙️ Adaptive Feedback Agent")
 
 st.markdown("Type what you just did or plan to do. I’ll suggest a next step. Accept/Reject teaches me to improve.")
 
+# Suggestions are personalised per user; anonymous visitors get a per-session id
+if "session_user" not in st.session_state:
+    st.session_state.session_user = f"session-{uuid.uuid4().hex[:12]}"
+user_name = st.text_input("Your name (optional, keeps your preferences across visits)")
+user_id = user_name.strip().lower() or st.session_state.session_user
+
 user_text = st.text_area("Recent activity (free text)", height=100, placeholder="e.g., Studied 20 mins, feeling sleepy…")
 
+policy = st.selectbox("Suggestion strategy", ["epsilon_greedy", "decayed", "ucb1", "thompson", "linucb"],
+                      format_func=lambda p: {"epsilon_greedy": "Epsilon-greedy",
+                                             "decayed": "Recent feedback (time-decayed)", "ucb1": "UCB1",
+                                             "thompson": "Thompson sampling",
+                                             "linucb": "Contextual (uses your text)"}[p])
+
 if "current" not in st.session_state:
     st.session_state.current = None  # holds the last suggestion dict
 
 col1, col2 = st.columns(2)
 if col1.button("Get suggestion"):
-    st.session_state.current = choose_suggestion(epsilon=0.1)
+    st.session_state.current = choose_suggestion(epsilon=0.1, policy=policy, user_text=user_text,
+                                                 user_id=user_id)
 
 if st.session_state.current:
     s = st.session_state.current
@@ -24,33 +39,67 @@ if st.session_state.current:
 
     a, b = st.columns(2)
     if a.button("✅ Accept"):
-        log_feedback(s["suggestion_id"], user_text, s["text"], +1)
-        update_weight(s["suggestion_id"], +1)
+        get_ingestor().submit(s["suggestion_id"], user_text, s["text"], +1, user_id=user_id)
         st.toast("Thanks! I’ll show more of good ones.")
         st.session_state.current = None
     if b.button("❌ Reject"):
-        log_feedback(s["suggestion_id"], user_text, s["text"], -1)
-        update_weight(s["suggestion_id"], -1)
+        get_ingestor().submit(s["suggestion_id"], user_text, s["text"], -1, user_id=user_id)
         st.toast("Got it. I’ll show that less.")
         st.session_state.current = None
 
 st.divider()
 st.subheader("📈 Quick stats (updates as you click)")
 try:
-    w = load_weights()
+    w = get_library().frame()
     st.metric("Templates", len(w))
     st.dataframe(w, use_container_width=True)
 except Exception:
     st.info("Weights not ready yet.")
 
+with st.expander("Manage suggestion templates"):
+    library = get_library()
+    upload = st.file_uploader("Bulk import (CSV with a 'text' column, or JSON list)", type=["csv", "json"])
+    if upload is not None and st.button("Import templates"):
+        try:
+            result = library.import_file(upload)
+            st.success(f"Added {len(result['added'])} templates "
+                       f"({result['duplicates']} duplicates, {result['invalid']} empty rows skipped).")
+        except Exception as e:
+            st.error(f"Import failed: {e}")
+
+    with st.form("add_template", clear_on_submit=True):
+        new_text = st.text_input("New suggestion")
+        c1, c2 = st.columns(2)
+        new_category = c1.text_input("Category")
+        new_tags = c2.text_input("Tags (comma separated)")
+        if st.form_submit_button("Add") and new_text.strip():
+            sid = library.add_template(new_text, new_category, new_tags)
+            if sid:
+                st.success(f"Added {sid}")
+            else:
+                st.warning("That suggestion already exists.")
+
+    all_templates = library.frame(include_deleted=True)
+    active_ids = all_templates.loc[all_templates["active"], "suggestion_id"].tolist()
+    deleted_ids = all_templates.loc[~all_templates["active"], "suggestion_id"].tolist()
+    to_delete = st.multiselect("Remove templates", active_ids)
+    if to_delete and st.button("Remove selected"):
+        library.delete(to_delete)
+        st.rerun()
+    if deleted_ids:
+        to_restore = st.multiselect("Restore removed templates", deleted_ids)
+        if to_restore and st.button("Restore selected"):
+            library.restore(to_restore)
+            st.rerun()
+
 with st.expander("See feedback & improvements"):
     try:
         st.caption("Recent feedback")
-        st.dataframe(load_feedback().tail(10), use_container_width=True)
+        st.dataframe(tail_feedback(10), use_container_width=True)
     except Exception:
         st.write("No feedback yet.")
     try:
         st.caption("Weight update history")
-        st.dataframe(load_improvements().tail(10), use_container_width=True)
+        st.dataframe(tail_improvements(10), use_container_width=True)
     except Exception:
         st.write("No improvements yet.")
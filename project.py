@@ -4,37 +4,62 @@ Enhanced with Groq-powered intelligent agents
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from typing import Dict, Any
 import json
 
 # Import our custom modules
-from config import Config, COMPETITION_CATEGORIES, HACKATHON_SCHEDULE
-from data_manager import DataManager
+from config import Config, COMPETITION_CATEGORIES, HACKATHON_SCHEDULE, OUTREACH_STATUSES
+from data_manager import DataManager, get_partition
 from ai_agents import AgentFactory
 
-# Initialize components
-data_manager = DataManager()
-config_validation = Config.validate_config()
+# pandas and plotly are imported inside the pages that draw tables and charts,
+# so a rerun of any other page does not pay for them
+
+
+def current_event_id() -> str:
+    """The event this session is working on, chosen in the sidebar"""
+    event_id = st.session_state.get("event_id", Config.DEFAULT_EVENT_ID)
+    return event_id if Config.event_exists(event_id) else Config.DEFAULT_EVENT_ID
+
+
+def get_data_manager(event_id: str = None) -> DataManager:
+    """The process-wide DataManager (and its indexes) for an event, shared by every session on it"""
+    return get_partition(event_id or current_event_id())
 
-# Initialize Firebase if available (for backward compatibility)
-firebase_db = None
-try:
-    if Config.FIREBASE_KEY:
+
+@st.cache_resource(show_spinner=False)
+def get_firebase_db():
+    """Initialize Firebase once per process, only when something asks for it (backward compatibility)"""
+    if not Config.FIREBASE_KEY:
+        return None
+    try:
         import firebase_admin
         from firebase_admin import credentials, firestore
 
         if not firebase_admin._apps:
-            import json
             key_dict = json.loads(Config.FIREBASE_KEY)
             cred = credentials.Certificate(key_dict)
             firebase_admin.initialize_app(cred)
-        firebase_db = firestore.client()
-except Exception as e:
-    print(f"Firebase initialization failed: {e}")
-    firebase_db = None
+        return firestore.client()
+    except Exception as e:
+        print(f"Firebase initialization failed: {e}")
+        return None
+
+
+# Initialize components
+data_manager = get_data_manager()
+config_validation = Config.validate_config()
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def _cached_read(event_id: str, method: str, version: tuple, args: tuple, kwargs: Dict[str, Any]):
+    return getattr(get_data_manager(event_id), method)(*args, **kwargs)
+
+
+def cached_read(method: str, *args, **kwargs):
+    """Call a DataManager read method, reusing the result until a collection it reads is written"""
+    return _cached_read(data_manager.event_id, method, data_manager.read_version(method), args, kwargs)
 
 # Initialize AI Agents
 @st.cache_resource
@@ -69,6 +94,36 @@ def display_system_status():
     for item, status in status_items:
         st.sidebar.markdown(f"{status} {item}")
 
+def paged_query(key: str, method: str, **filters) -> Dict[str, Any]:
+    """Run a DataManager query method for the page currently selected under key"""
+    page_key = f"{key}_page"
+    page_size = Config.PAGE_SIZE
+    page = st.session_state.get(page_key, 1)
+
+    result = cached_read(method, offset=(page - 1) * page_size, limit=page_size, **filters)
+
+    # Filters may have shrunk the result set below the selected page
+    pages = max(1, -(-result["total"] // page_size))
+    if page > pages:
+        st.session_state[page_key] = page = pages
+        result = cached_read(method, offset=(page - 1) * page_size, limit=page_size, **filters)
+
+    return result
+
+def page_controls(key: str, result: Dict[str, Any]):
+    """Display page selector and position caption for a paginated list"""
+    total = result["total"]
+    if not total:
+        return
+
+    pages = max(1, -(-total // result["limit"]))
+    if pages > 1:
+        st.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    start = result["offset"] + 1
+    end = result["offset"] + len(result["items"])
+    st.caption(f"Showing {start}–{end} of {total}")
+
 def home_page():
     """Enhanced home page with comprehensive features"""
     st.title(f"🚀 {Config.HACKATHON_NAME}")
@@ -81,10 +136,12 @@ def home_page():
     with col2:
         st.metric("Registration Deadline", Config.REGISTRATION_DEADLINE)
     with col3:
-        stats = data_manager.get_statistics()
+        stats = cached_read("get_statistics")
         st.metric("Registered Teams", stats["total_teams"])
 
     # Event Schedule
+    import pandas as pd
+
     st.header("📅 Event Schedule")
     schedule_df = pd.DataFrame([
         {"Time": time, "Activity": activity}
@@ -94,20 +151,22 @@ def home_page():
 
     # Problem Statements
     st.header("💡 Problem Statements")
-    problems = data_manager.get_problems()
 
-    if not problems:
-        st.info("No problem statements available yet.")
-    else:
-        # Filter by category
+    # Filter by category and keyword
+    col1, col2 = st.columns(2)
+    with col1:
         categories = ["All"] + COMPETITION_CATEGORIES
         selected_category = st.selectbox("Filter by Category", categories)
+    with col2:
+        search = st.text_input("Search Problems", placeholder="Title, description or tech")
 
-        filtered_problems = problems
-        if selected_category != "All":
-            filtered_problems = [p for p in problems if p.get("category") == selected_category]
+    result = paged_query("home_problems", "query_problems",
+                         category=selected_category, search=search)
 
-        for i, problem in enumerate(filtered_problems):
+    if not result["total"]:
+        st.info("No problem statements available yet.")
+    else:
+        for problem in result["items"]:
             with st.expander(f"🎯 {problem['title']} ({problem.get('category', 'General')})"):
                 st.write(problem["description"])
 
@@ -119,6 +178,8 @@ def home_page():
                     if tech_stack:
                         st.write(f"**Suggested Tech:** {', '.join(tech_stack)}")
 
+        page_controls("home_problems", result)
+
 def team_registration():
     """Enhanced team registration with validation"""
     st.header("👥 Team Registration")
@@ -171,7 +232,7 @@ def project_submission():
     st.header("📤 Project Submission")
 
     # Check if team is registered
-    teams = data_manager.get_teams()
+    teams = cached_read("get_teams")
     team_names = [team["team_name"] for team in teams]
 
     if not team_names:
@@ -185,7 +246,7 @@ def project_submission():
         description = st.text_area("Project Description*", height=150)
 
         st.subheader("Problem Statement")
-        problems = data_manager.get_problems()
+        problems = cached_read("get_problems")
         problem_options = ["Custom Problem"] + [f"{p['title']} ({p.get('category', 'General')})" for p in problems]
         selected_problem = st.selectbox("Problem Statement", problem_options)
 
@@ -355,9 +416,50 @@ def judge_panel():
     # Judge information
     judge_name = st.text_input("Judge Name", value="Judge")
 
+    # Judge's queue from the judging schedule
+    queue = cached_read("get_judge_queue", judge_name)
+    if queue:
+        completed = sum(1 for entry in queue if entry["completed"])
+        st.subheader("🗓️ Your Judging Queue")
+        st.progress(completed / len(queue), text=f"{completed}/{len(queue)} teams scored")
+        for entry in queue:
+            icon = "✅" if entry["completed"] else "⏳"
+            st.write(f"{icon} {entry['start']}–{entry['end']} · {entry['team_name']}")
+
+    # Offline scoresheets, entered in one go
+    with st.expander("📥 Upload Scoresheet"):
+        criteria_columns = ", ".join(Config.JUDGING_CRITERIA)
+        st.caption(f"One row per team. Columns: team_name, {criteria_columns}, comments "
+                   f"and optionally judge_name (defaults to {judge_name}). "
+                   f"Scores are whole numbers from 1 to {Config.MAX_SCORE_PER_CRITERIA}.")
+        st.download_button("Download Blank Scoresheet",
+                           ",".join(["team_name", "judge_name", *Config.JUDGING_CRITERIA, "comments"]) + "\n",
+                           file_name="scoresheet.csv", mime="text/csv")
+        sheet = st.file_uploader("CSV or XLSX scoresheet", type=["csv", "xlsx"], key="scoresheet_upload")
+        sheet_strict = st.checkbox("Import only if every row is valid", key="scoresheet_strict")
+        if sheet is not None and st.button("Import Scores"):
+            from bulk_import import read_table
+            try:
+                result = data_manager.submit_scores(read_table(sheet, sheet.name), judge_name, sheet_strict)
+            except Exception as e:
+                st.error(f"Could not import {sheet.name}: {e}")
+            else:
+                if result["submitted"]:
+                    st.success(f"✅ Imported {len(result['submitted'])} scores")
+                elif result["errors"] and sheet_strict:
+                    st.error("Nothing was imported. Fix the rows below and upload again.")
+                if result["errors"]:
+                    import pandas as pd
+
+                    st.warning(f"⚠️ {len(result['errors'])} rows were not imported")
+                    st.dataframe(pd.DataFrame([
+                        {"Row": e["row"], "Team": e["team_name"], "Problems": "; ".join(e["errors"])}
+                        for e in result["errors"]
+                    ]), use_container_width=True)
+
     # Get teams and projects
-    teams = data_manager.get_teams()
-    projects = {p["team_name"]: p for p in data_manager.get_projects()}
+    teams = cached_read("get_teams")
+    projects = {p["team_name"]: p for p in cached_read("get_projects")}
 
     if not teams:
         st.info("No teams registered yet.")
@@ -366,9 +468,22 @@ def judge_panel():
     # Judging interface
     st.header("📊 Team Evaluation")
 
-    # Team selection
+    # Team selection, optionally narrowed by a keyword search over submissions
     team_names = [team["team_name"] for team in teams]
-    selected_team = st.selectbox("Select Team to Judge", team_names)
+    submission_search = st.text_input("Search Submissions", placeholder="Keyword or tech stack")
+    if submission_search:
+        registered = set(team_names)
+        hits = cached_read("search", submission_search, "project", limit=None)
+        team_names = [hit["record"]["team_name"] for hit in hits if hit["record"].get("team_name") in registered]
+        if not team_names:
+            st.info("No submissions match your search.")
+            return
+        st.caption(f"{len(team_names)} matching submissions, best match first")
+
+    # Default to the judge's next unscored team
+    next_team = next((entry["team_name"] for entry in queue if not entry["completed"]), None)
+    default_index = team_names.index(next_team) if next_team in team_names else 0
+    selected_team = st.selectbox("Select Team to Judge", team_names, index=default_index)
 
     if selected_team:
         team_data = next(team for team in teams if team["team_name"] == selected_team)
@@ -395,6 +510,13 @@ def judge_panel():
                     st.markdown(f"**GitHub:** [View Repository]({project_data['github_link']})")
                 if project_data.get('demo_link'):
                     st.markdown(f"**Demo:** [View Demo]({project_data['demo_link']})")
+
+                similar_projects = cached_read("find_similar_projects", selected_team)
+                if similar_projects:
+                    st.warning("🔁 **Similar Submissions**")
+                    for similar in similar_projects:
+                        st.write(f"• {similar['team_name']}: {similar['project_title']} "
+                                 f"({similar['score']:.0%} similar)")
             else:
                 st.warning("No project submitted yet")
 
@@ -437,7 +559,7 @@ def judge_panel():
                     st.error(f"Failed to submit score: {str(e)}")
 
         # Show existing scores for this team
-        team_scores = data_manager.get_team_scores(selected_team)
+        team_scores = cached_read("get_team_scores", selected_team)
         if team_scores:
             st.subheader("📈 Previous Scores")
             for score in team_scores:
@@ -447,77 +569,123 @@ def judge_panel():
                     if score.get('comments'):
                         st.write(f"**Comments:** {score['comments']}")
 
-def leaderboard():
-    """Real-time leaderboard with analytics"""
-    st.header("🏆 Live Leaderboard")
-
-    leaderboard_data = data_manager.get_leaderboard()
-
-    if not leaderboard_data:
+def leaderboard_view() -> Dict[str, Any]:
+    """This session's leaderboard, recomputed only when teams, projects or scores changed"""
+    view = st.session_state.setdefault(f"leaderboard_view_{data_manager.event_id}", {
+        "version": None, "rows": [], "changed": set(), "figure": None, "seq": data_manager.event_seq
+    })
+    version = data_manager.read_version("get_leaderboard")
+    if view["version"] == version:
+        return view
+
+    rows = [entry for entry in cached_read("get_leaderboard") if entry["total_average"] > 0]
+    previous = {entry["team_name"]: (entry["rank"], entry["total_average"]) for entry in view["rows"]}
+    changed = {entry["team_name"] for entry in rows
+               if previous.get(entry["team_name"]) != (entry["rank"], entry["total_average"])}
+    order_changed = [e["team_name"] for e in rows] != [e["team_name"] for e in view["rows"]]
+
+    if view["figure"] is None or order_changed:
+        import pandas as pd
+        import plotly.express as px
+
+        scores_df = pd.DataFrame([{"Team": entry["team_name"], "Score": entry["total_average"]} for entry in rows])
+        if not scores_df.empty:
+            fig = px.bar(scores_df, x="Team", y="Score", title="Team Scores")
+            fig.update_layout(xaxis_tickangle=45)
+            view["figure"] = fig
+    elif changed:
+        # Same ranking order: patch only the bars whose score moved
+        y = list(view["figure"].data[0].y)
+        for i, entry in enumerate(rows):
+            if entry["team_name"] in changed:
+                y[i] = entry["total_average"]
+        view["figure"].data[0].y = y
+
+    view.update(version=version, rows=rows, changed=changed if view["version"] is not None else set())
+    return view
+
+
+def live_rankings():
+    """Rankings and score chart; re-rendered by a fragment timer but recomputed only on change"""
+    view = leaderboard_view()
+
+    # Notify about submissions published since this session last looked
+    for event in data_manager.events_since(view["seq"]):
+        if event["type"] == "score_submitted":
+            st.toast(f"New score for {event['team_name']} from {event['judge_name']}")
+        elif event["type"] == "scores_imported":
+            st.toast(f"{event['count']} scores imported from {', '.join(event['judges'])}")
+        elif event["type"] == "project_submitted":
+            st.toast(f"{event['team_name']} submitted {event['project_title']}")
+        view["seq"] = event["seq"]
+
+    if not view["rows"]:
         st.info("No teams scored yet.")
         return
 
     # Display leaderboard
     st.subheader("🥇 Current Rankings")
 
-    for entry in leaderboard_data:
-        if entry["total_average"] > 0:  # Only show teams with scores
-            col1, col2, col3, col4 = st.columns([1, 3, 2, 2])
+    for entry in view["rows"]:
+        col1, col2, col3, col4 = st.columns([1, 3, 2, 2])
 
-            with col1:
-                # Rank with medal emoji
-                rank = entry["rank"]
-                if rank == 1:
-                    st.markdown("🥇 **1st**")
-                elif rank == 2:
-                    st.markdown("🥈 **2nd**")
-                elif rank == 3:
-                    st.markdown("🥉 **3rd**")
-                else:
-                    st.markdown(f"**{rank}th**")
+        with col1:
+            # Rank with medal emoji
+            rank = entry["rank"]
+            if rank == 1:
+                st.markdown("🥇 **1st**")
+            elif rank == 2:
+                st.markdown("🥈 **2nd**")
+            elif rank == 3:
+                st.markdown("🥉 **3rd**")
+            else:
+                st.markdown(f"**{rank}th**")
 
-            with col2:
-                st.write(f"**{entry['team_name']}**")
-                st.write(f"*{entry['college']}*")
+        with col2:
+            updated = " 🆕" if entry["team_name"] in view["changed"] else ""
+            st.write(f"**{entry['team_name']}**{updated}")
+            st.write(f"*{entry['college']}*")
 
-            with col3:
-                st.metric("Total Score", f"{entry['total_average']:.1f}")
-                st.write(f"Judges: {entry['judge_count']}")
+        with col3:
+            st.metric("Total Score", f"{entry['total_average']:.1f}")
+            st.write(f"Judges: {entry['judge_count']}")
 
-            with col4:
-                if entry["has_submission"]:
-                    st.write(f"✅ {entry['project_title']}")
-                else:
-                    st.write("❌ No submission")
+        with col4:
+            if entry["has_submission"]:
+                st.write(f"✅ {entry['project_title']}")
+            else:
+                st.write("❌ No submission")
 
     # Analytics
     st.subheader("📊 Competition Analytics")
+    if view["figure"] is not None:
+        st.plotly_chart(view["figure"], use_container_width=True)
 
-    # Create charts
-    if leaderboard_data:
-        # Score distribution
-        scores_df = pd.DataFrame([
-            {"Team": entry["team_name"], "Score": entry["total_average"]}
-            for entry in leaderboard_data if entry["total_average"] > 0
-        ])
 
-        if not scores_df.empty:
-            fig = px.bar(scores_df, x="Team", y="Score", title="Team Scores")
-            fig.update_layout(xaxis_tickangle=45)
-            st.plotly_chart(fig, use_container_width=True)
+def leaderboard():
+    """Real-time leaderboard with analytics"""
+    st.header("🏆 Live Leaderboard")
+
+    live = st.toggle("Live updates", value=True,
+                     help=f"Checks for new scores every {Config.LEADERBOARD_REFRESH_SECONDS}s "
+                          "and redraws only when the rankings change")
+    if live:
+        st.fragment(run_every=Config.LEADERBOARD_REFRESH_SECONDS)(live_rankings)()
+    else:
+        live_rankings()
 
-        # Statistics
-        stats = data_manager.get_statistics()
-        col1, col2, col3, col4 = st.columns(4)
+    # Statistics
+    stats = cached_read("get_statistics")
+    col1, col2, col3, col4 = st.columns(4)
 
-        with col1:
-            st.metric("Total Teams", stats["total_teams"])
-        with col2:
-            st.metric("Submissions", f"{stats['total_submissions']}")
-        with col3:
-            st.metric("Submission Rate", f"{stats['submission_rate']:.1f}%")
-        with col4:
-            st.metric("Colleges", stats["total_colleges"])
+    with col1:
+        st.metric("Total Teams", stats["total_teams"])
+    with col2:
+        st.metric("Submissions", f"{stats['total_submissions']}")
+    with col3:
+        st.metric("Submission Rate", f"{stats['submission_rate']:.1f}%")
+    with col4:
+        st.metric("Colleges", stats["total_colleges"])
 
 
 def admin_panel():
@@ -531,11 +699,14 @@ def admin_panel():
 
     st.success("✅ Admin Access Granted")
 
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Statistics", "📝 Manage Problems", "📧 Outreach", "⚙️ Settings"])
+    import pandas as pd
+
+    tab1, tab2, tab3, tab5, tab6, tab4 = st.tabs(["📊 Statistics", "📝 Manage Problems", "📧 Outreach",
+                                                  "🗓️ Judging Schedule", "🕓 Audit Log", "⚙️ Settings"])
 
     with tab1:
         st.subheader("Event Statistics")
-        stats = data_manager.get_statistics()
+        stats = cached_read("get_statistics")
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -548,12 +719,56 @@ def admin_panel():
             st.metric("Scored Teams", stats["scored_teams"])
             st.metric("Total Scores", stats["total_scores"])
 
-        # Display college list
+        # Display college list, one entry per canonical college
         if stats["colleges_list"]:
             st.subheader("Participating Colleges")
             for college in stats["colleges_list"]:
-                if college != "Unknown":
-                    st.write(f"• {college}")
+                teams_from = stats["college_team_counts"].get(college, 0)
+                st.write(f"• {college} ({teams_from} team{'s' if teams_from != 1 else ''})")
+
+        # Near-duplicate submissions across all teams
+        st.subheader("Duplicate Submission Check")
+        if st.button("🔁 Run Similarity Report"):
+            report = cached_read("similarity_report")
+            if report:
+                st.dataframe(pd.DataFrame(report), use_container_width=True)
+            else:
+                st.success(f"No submission pairs above {Config.SIMILARITY_THRESHOLD:.0%} similarity.")
+
+        # Bulk registration from coordinators' spreadsheets
+        with st.expander("📥 Import Teams from Spreadsheet"):
+            st.caption("Columns: team_name, members (separated by ';'), email, college, contact_number. "
+                       "Separate member_1, member_2, … columns also work.")
+            upload = st.file_uploader("CSV or XLSX file", type=["csv", "xlsx"], key="team_upload")
+            all_or_nothing = st.checkbox("Import only if every row is valid", key="team_upload_strict")
+            if upload is not None and st.button("Import Teams"):
+                from bulk_import import read_table
+                try:
+                    result = data_manager.register_teams(read_table(upload, upload.name), all_or_nothing)
+                except Exception as e:
+                    st.error(f"Could not read {upload.name}: {e}")
+                else:
+                    if result["registered"]:
+                        st.success(f"✅ Registered {len(result['registered'])} teams")
+                    elif result["errors"] and all_or_nothing:
+                        st.error("Nothing was imported. Fix the rows below and upload again.")
+                    if result["errors"]:
+                        st.warning(f"⚠️ {len(result['errors'])} rows were not imported")
+                        st.dataframe(pd.DataFrame([
+                            {"Row": e["row"], "Team": e["team_name"], "Problems": "; ".join(e["errors"])}
+                            for e in result["errors"]
+                        ]), use_container_width=True)
+
+        # Display registered teams
+        st.subheader("Registered Teams")
+        team_search = st.text_input("Search Teams", placeholder="Team, member, college or email")
+        result = paged_query("admin_teams", "query_teams", search=team_search)
+        for team in result["items"]:
+            with st.expander(f"{team['team_name']} ({team.get('college', 'Not specified')})"):
+                st.write(f"**Members:** {', '.join(team.get('members', []))}")
+                st.write(f"**Email:** {team.get('email', 'Not specified')}")
+                st.write(f"**Registered:** {team.get('registered_at', 'Unknown')}")
+        page_controls("admin_teams", result)
 
     with tab2:
         st.subheader("Manage Problem Statements")
@@ -578,13 +793,20 @@ def admin_panel():
 
         # Display existing problems
         st.subheader("Existing Problems")
-        problems = data_manager.get_problems()
-        for problem in problems:
+        col1, col2 = st.columns(2)
+        with col1:
+            problem_category = st.selectbox("Category Filter", ["All"] + COMPETITION_CATEGORIES)
+        with col2:
+            problem_search = st.text_input("Search Problems", key="admin_problem_search")
+        result = paged_query("admin_problems", "query_problems",
+                             category=problem_category, search=problem_search)
+        for problem in result["items"]:
             with st.expander(f"{problem['title']} ({problem.get('category', 'General')})"):
                 st.write(problem['description'])
                 st.write(f"**Difficulty:** {problem.get('difficulty', 'Medium')}")
                 if problem.get('tech_stack'):
                     st.write(f"**Tech Stack:** {', '.join(problem['tech_stack'])}")
+        page_controls("admin_problems", result)
 
     with tab3:
         st.subheader("Outreach Management")
@@ -609,32 +831,179 @@ def admin_panel():
                 else:
                     st.error("Please fill in required fields")
 
-        # Display outreach data
-        outreach_data = data_manager.get_outreach_data()
-        if outreach_data:
-            st.subheader("Outreach Contacts")
-            for contact in outreach_data:
-                with st.expander(f"{contact['college_name']} - {contact['contact_person']}"):
-                    st.write(f"**Email:** {contact['contact_email']}")
-                    st.write(f"**Phone:** {contact.get('contact_phone', 'Not provided')}")
-                    st.write(f"**Method:** {contact.get('outreach_method', 'Not specified')}")
-                    st.write(f"**Status:** {contact.get('status', 'contacted')}")
-
-                    # Update status
-                    new_status = st.selectbox(
-                        "Update Status",
-                        ["contacted", "responded", "interested", "registered", "declined"],
-                        index=["contacted", "responded", "interested", "registered", "declined"].index(contact.get('status', 'contacted')),
-                        key=f"status_{contact['id']}"
-                    )
-                    response_note = st.text_input("Response Note", key=f"note_{contact['id']}")
+        # Conversion funnel, maintained incrementally by the outreach indexes
+        st.subheader("Outreach Funnel")
+        funnel = cached_read("get_outreach_funnel")
+        if funnel["total"]:
+            columns = st.columns(len(funnel["stages"]) + 1)
+            for column, stage in zip(columns, funnel["stages"]):
+                with column:
+                    conversion = f"{stage['conversion']:.0f}% move on" if stage["conversion"] is not None else None
+                    st.metric(stage["stage"].title(), stage["reached"], conversion, delta_color="off")
+            with columns[-1]:
+                st.metric("Declined", funnel["declined"])
+            st.dataframe(pd.DataFrame([
+                {"Stage": s["stage"].title(), "Reached": s["reached"], "Currently Here": s["current"],
+                 "Declined Here": s["declined_here"], "Avg Days in Stage": s["avg_days_in_stage"]}
+                for s in funnel["stages"]
+            ]), use_container_width=True, hide_index=True)
+
+            with st.expander("Registrations by Outreach College"):
+                st.dataframe(pd.DataFrame(cached_read("get_outreach_attribution")).rename(columns={
+                    "college": "College", "contacts": "Contacts", "furthest_stage": "Furthest Stage",
+                    "first_contacted_at": "First Contacted", "teams_registered": "Teams",
+                    "teams_after_contact": "Teams After Contact"
+                }).drop(columns="college_id", errors="ignore"), use_container_width=True, hide_index=True)
 
-                    if st.button("Update", key=f"update_{contact['id']}"):
-                        data_manager.update_outreach_status(contact['id'], new_status, response_note)
-                        st.success("Status updated!")
-                        st.experimental_rerun()
+        # Display outreach data
+        st.subheader("Outreach Contacts")
+        col1, col2 = st.columns(2)
+        with col1:
+            status_filter = st.selectbox("Status Filter", ["All"] + OUTREACH_STATUSES)
+        with col2:
+            outreach_search = st.text_input("Search Contacts", placeholder="College, person or email")
+        result = paged_query("admin_outreach", "query_outreach",
+                             status=status_filter, search=outreach_search)
+        if result["items"]:
+            st.dataframe(pd.DataFrame([
+                {"College": c["college_name"], "Contact": c["contact_person"], "Email": c["contact_email"],
+                 "Phone": c.get("contact_phone", ""), "Method": c.get("outreach_method", ""),
+                 "Status": c.get("status", "contacted"), "Notes": len([r for r in c.get("responses", []) if r.get("note")])}
+                for c in result["items"]
+            ]), use_container_width=True, hide_index=True)
+        page_controls("admin_outreach", result)
+
+        # One update form for the contact picked from this page
+        if result["items"]:
+            contacts = {c["id"]: c for c in result["items"]}
+            # Picked outside the form so the status below starts from the chosen contact's current status
+            contact_id = st.selectbox("Contact", list(contacts),
+                                      format_func=lambda i: f"{contacts[i]['college_name']} - {contacts[i]['contact_person']}")
+            current_status = contacts[contact_id].get("status", "contacted")
+            with st.form("update_outreach"):
+                new_status = st.selectbox("New Status", OUTREACH_STATUSES, key=f"outreach_status_{contact_id}",
+                                          index=OUTREACH_STATUSES.index(current_status)
+                                          if current_status in OUTREACH_STATUSES else 0)
+                response_note = st.text_input("Response Note")
+                if st.form_submit_button("Update Status"):
+                    data_manager.update_outreach_status(contact_id, new_status, response_note)
+                    st.success("Status updated!")
+                    st.rerun()
+
+    with tab5:
+        st.subheader("Judging Schedule")
+        st.write(f"Judging window: {Config.JUDGING_START}–{Config.JUDGING_END}")
+
+        with st.form("judge_schedule"):
+            judges_text = st.text_area(
+                "Judges (one per line: Name | College | Expertise categories)",
+                placeholder="Dr. Rajesh Kumar | IIT Delhi | AI/ML, Web3/Blockchain",
+                height=150
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                judges_per_team = st.number_input("Judges per Team", min_value=1, max_value=5, value=2)
+            with col2:
+                slot_minutes = st.number_input("Slot Length (minutes)", min_value=1, max_value=60,
+                                               value=Config.JUDGE_SLOT_MINUTES)
+
+            if st.form_submit_button("Generate Schedule"):
+                judges = []
+                for line in judges_text.splitlines():
+                    parts = [part.strip() for part in line.split("|")]
+                    if parts[0]:
+                        judges.append({
+                            "name": parts[0],
+                            "college": parts[1] if len(parts) > 1 else "",
+                            "expertise": [c.strip() for c in parts[2].split(",")] if len(parts) > 2 else []
+                        })
+
+                if not judges:
+                    st.error("Please enter at least one judge")
+                else:
+                    schedule = data_manager.generate_judge_schedule(judges, judges_per_team, slot_minutes)
+                    st.success(f"Scheduled {len(schedule['assignments'])} evaluations "
+                               f"in {schedule['slots']} slots, ending at {schedule['ends_at']}")
+                    if schedule["overruns_window"]:
+                        st.warning(f"⚠️ Schedule runs past {Config.JUDGING_END}. "
+                                   "Add judges or shorten the slot length.")
+                    for team_name, missing in schedule["unfilled"].items():
+                        st.warning(f"⚠️ {team_name} is short of {missing} judge(s) without a conflict")
+
+        # Completion against submitted scores
+        progress = cached_read("get_judging_progress")
+        if progress["total_assignments"]:
+            st.metric("Schedule Completion", f"{progress['completion_rate']:.1f}%",
+                      help=f"{progress['completed_assignments']}/{progress['total_assignments']} evaluations scored")
+            st.dataframe(pd.DataFrame([
+                {"Judge": judge, "Assigned": p["assigned"], "Scored": p["completed"]}
+                for judge, p in progress["judges"].items()
+            ]), use_container_width=True)
+            with st.expander("Full Schedule"):
+                st.dataframe(pd.DataFrame(cached_read("get_judge_assignments")), use_container_width=True)
+
+    with tab6:
+        st.subheader("Leaderboard at a Point in Time")
+        col1, col2 = st.columns(2)
+        with col1:
+            as_of_date = st.date_input("Date", value=datetime.now().date())
+        with col2:
+            as_of_time = st.time_input("Time", value=datetime.now().time().replace(second=0, microsecond=0))
+        if st.button("⏪ Replay Leaderboard"):
+            as_of = datetime.combine(as_of_date, as_of_time).isoformat()
+            past = data_manager.get_leaderboard_at(as_of)
+            if past:
+                st.dataframe(pd.DataFrame([
+                    {"Rank": e["rank"], "Team": e["team_name"], "Project": e["project_title"],
+                     "Average Score": e["total_average"], "Judges": e["judge_count"]}
+                    for e in past
+                ]), use_container_width=True)
+            else:
+                st.info(f"No teams had registered by {as_of}.")
+
+        st.subheader("Recent Changes")
+        changes = data_manager.get_recent_changes(50)
+        if changes:
+            st.dataframe(pd.DataFrame([
+                {"#": e["seq"], "Time": e["timestamp"], "Event": e["type"],
+                 "Collection": e["collection"], "Record": e.get("id", f"{len(e.get('records', []))} records")}
+                for e in changes
+            ]), use_container_width=True)
+        else:
+            st.info("No changes recorded yet.")
 
     with tab4:
+        st.subheader("Events")
+        st.write(f"**Current event:** {data_manager.event_id}")
+        with st.form("create_event"):
+            new_event_id = st.text_input("New Event ID", placeholder="spring-2025",
+                                         help="Lowercase letters, digits, '-' and '_'")
+            if st.form_submit_button("Create Event"):
+                try:
+                    if Config.event_exists(new_event_id):
+                        st.error(f"Event '{new_event_id}' already exists")
+                    else:
+                        Config.create_data_directory(Config.validate_event_id(new_event_id))
+                        st.success(f"Event '{new_event_id}' created. Select it in the sidebar.")
+                except ValueError as e:
+                    st.error(str(e))
+
+        st.subheader("Colleges")
+        st.caption("Spellings of the same college ('IIT Delhi', 'Indian Institute of Technology Delhi') "
+                   "are merged under one canonical name for statistics, outreach and judge conflicts.")
+        with st.expander("Canonical Colleges"):
+            colleges = data_manager.get_colleges()
+            if colleges:
+                st.dataframe(pd.DataFrame([
+                    {"College": c["name"], "Spellings": ", ".join(c["aliases"]), "Id": college_id}
+                    for college_id, c in colleges.items()
+                ]), use_container_width=True, hide_index=True)
+            else:
+                st.info("No colleges yet.")
+        if st.button("🏫 Save Canonical College IDs"):
+            filled = data_manager.backfill_college_ids()
+            st.success(f"Saved college IDs on {filled} older records" if filled else "Every record already has a college ID")
+
         st.subheader("System Settings")
         st.write("**Current Configuration:**")
         st.write(f"• Hackathon Name: {Config.HACKATHON_NAME}")
@@ -651,6 +1020,9 @@ def admin_panel():
 def main():
     """Main application with navigation"""
 
+    # Event selection; the data manager for the next rerun follows this choice
+    st.sidebar.selectbox("🎪 Event", Config.list_events(), key="event_id")
+
     # Sidebar navigation
     display_system_status()
 
@@ -679,7 +1051,7 @@ def main():
     st.sidebar.markdown("Need help? Contact the organizers!")
 
     # Quick stats in sidebar
-    stats = data_manager.get_statistics()
+    stats = cached_read("get_statistics")
     st.sidebar.markdown("### 📊 Quick Stats")
     st.sidebar.metric("Teams", stats["total_teams"])
     st.sidebar.metric("Submissions", stats["total_submissions"])
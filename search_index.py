@@ -0,0 +1,269 @@
+"""
+Full-text search for HackaAIverse
+Inverted index with BM25 ranking over problem statements and project submissions
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "their", "this", "to", "with", "you"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms"""
+    return [t for t in _WORD.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class SearchIndex:
+    """
+    BM25-ranked inverted index persisted as an append-only operation log.
+
+    Every mutation ends by compiling the changed terms' postings into NumPy
+    slot/tf arrays, along with the length norms and per-type masks, so a query
+    only gathers and scores arrays that already exist.
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.sources: Dict[str, Optional[List[int]]] = {}
+        self.total_length = 0
+        # Each document owns a stable slot so postings can be scored as NumPy arrays
+        self._slots: Dict[str, int] = {}
+        self._slot_keys: List[Optional[str]] = []
+        self._slot_lengths: List[int] = []
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._stale: set = set()
+        self._type_masks: Dict[str, np.ndarray] = {}
+        self._norms: Optional[np.ndarray] = None
+        self._log_entries = 0
+        self._lock = threading.RLock()
+        self._load()
+
+    # Persistence
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._apply(json.loads(line))
+                        self._log_entries += 1
+            self._refresh()
+        except Exception as e:
+            print(f"Error loading search index {self.index_path}: {e}")
+            # Forget everything so every source is rebuilt on the next search
+            self.postings, self.doc_terms, self.doc_lengths = {}, {}, {}
+            self.sources, self.total_length = {}, 0
+            self._slots, self._slot_keys, self._slot_lengths = {}, [], []
+            self._invalidate(None)
+
+    def _append(self, entries: List[Dict[str, Any]]):
+        try:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._log_entries += len(entries)
+        except Exception as e:
+            print(f"Error saving search index {self.index_path}: {e}")
+
+        # Compact once superseded entries outnumber live documents
+        if self._log_entries > 2 * len(self.doc_terms) + 100:
+            self._compact()
+
+    def _compact(self):
+        entries = [{"op": "source", "type": t, "signature": s} for t, s in self.sources.items()]
+        entries += [{"op": "put", "key": k, "terms": terms} for k, terms in self.doc_terms.items()]
+        try:
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(temp_path, self.index_path)
+            self._log_entries = len(entries)
+        except Exception as e:
+            print(f"Error compacting search index {self.index_path}: {e}")
+
+    def _apply(self, entry: Dict[str, Any]):
+        op = entry.get("op")
+        if op == "put":
+            self._put(entry["key"], entry["terms"])
+        elif op == "del":
+            self._delete(entry["key"])
+        elif op == "clear":
+            for key in [k for k in self.doc_terms if k.startswith(f"{entry['type']}:")]:
+                self._delete(key)
+        elif op == "source":
+            self.sources[entry["type"]] = entry["signature"]
+
+    # In-memory maintenance
+    def _invalidate(self, terms: Optional[Iterable[str]], slots_changed: bool = True):
+        if terms is None:
+            self._compiled, self._stale = {}, set()
+        else:
+            self._stale.update(terms)
+        if slots_changed:
+            self._type_masks = {}
+        self._norms = None
+
+    def _refresh(self):
+        """Compile the posting arrays, length norms and type masks invalidated since the last call"""
+        for term in self._stale:
+            posting = self.postings.get(term)
+            if not posting:
+                self._compiled.pop(term, None)
+                continue
+            slots = np.fromiter((self._slots[k] for k in posting), dtype=np.int64, count=len(posting))
+            tfs = np.fromiter(posting.values(), dtype=np.float64, count=len(posting))
+            self._compiled[term] = (slots, tfs)
+        self._stale = set()
+
+        if self._norms is None and self.doc_terms:
+            avg_length = self.total_length / len(self.doc_terms) or 1.0
+            lengths = np.asarray(self._slot_lengths, dtype=np.float64)
+            self._norms = self.K1 * (1 - self.B + self.B * lengths / avg_length)
+        if not self._type_masks and self._slot_keys:
+            types = np.array([k.partition(":")[0] if k else "" for k in self._slot_keys])
+            self._type_masks = {t: types == t for t in set(types.tolist()) if t}
+
+    def _put(self, key: str, terms: Dict[str, int]):
+        self._delete(key)
+        self.doc_terms[key] = terms
+        length = sum(terms.values())
+        self.doc_lengths[key] = length
+        self.total_length += length
+
+        slot = self._slots.get(key)
+        new_slot = slot is None or self._slot_keys[slot] is None
+        if slot is None:
+            slot = self._slots[key] = len(self._slot_keys)
+            self._slot_keys.append(key)
+            self._slot_lengths.append(length)
+        else:
+            self._slot_keys[slot] = key
+            self._slot_lengths[slot] = length
+
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[key] = tf
+        self._invalidate(terms, slots_changed=new_slot)
+
+    def _delete(self, key: str):
+        terms = self.doc_terms.pop(key, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_lengths.pop(key, 0)
+        slot = self._slots[key]
+        self._slot_keys[slot] = None
+        self._slot_lengths[slot] = 0
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self.postings[term]
+        self._invalidate(terms)
+
+    @staticmethod
+    def _term_counts(text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    # Public API
+    def is_current(self, doc_type: str, signature: Optional[List[int]]) -> bool:
+        """Check whether the index reflects the given version of a source file"""
+        with self._lock:
+            return doc_type in self.sources and self.sources[doc_type] == signature
+
+    def add(self, doc_type: str, doc_id: str, text: str, signature: Optional[List[int]] = None):
+        """Index (or re-index) one document and record the source version it came from"""
+        with self._lock:
+            entries = [{"op": "put", "key": f"{doc_type}:{doc_id}", "terms": self._term_counts(text)}]
+            if signature is not None:
+                entries.append({"op": "source", "type": doc_type, "signature": signature})
+            for entry in entries:
+                self._apply(entry)
+            self._refresh()
+            self._append(entries)
+
+    def remove(self, doc_type: str, doc_id: str):
+        """Drop one document from the index"""
+        with self._lock:
+            entry = {"op": "del", "key": f"{doc_type}:{doc_id}"}
+            self._apply(entry)
+            self._refresh()
+            self._append([entry])
+
+    def rebuild(self, doc_type: str, documents: Iterable[Tuple[str, str]],
+                signature: Optional[List[int]]):
+        """Replace every document of one type, e.g. after the source file changed externally"""
+        with self._lock:
+            entries = [{"op": "clear", "type": doc_type}]
+            entries += [{"op": "put", "key": f"{doc_type}:{doc_id}", "terms": self._term_counts(text)}
+                        for doc_id, text in documents]
+            entries.append({"op": "source", "type": doc_type, "signature": signature})
+            for entry in entries:
+                self._apply(entry)
+            self._refresh()
+            self._append(entries)
+
+    def search(self, query: str, doc_type: str = None, limit: Optional[int] = 10) -> List[Tuple[str, str, float]]:
+        """Rank documents against a query, returning (doc_type, doc_id, score) tuples"""
+        with self._lock:
+            doc_count = len(self.doc_terms)
+            if not doc_count:
+                return []
+
+            self._refresh()  # no-op unless a failed load left it unprepared
+            norms = self._norms
+
+            scores = np.zeros(len(self._slot_keys), dtype=np.float64)
+            matched = False
+            for term in set(tokenize(query)):
+                arrays = self._compiled.get(term)
+                if arrays is None:
+                    continue
+                slots, tfs = arrays
+                df = len(slots)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                scores[slots] += idf * (self.K1 + 1) * tfs / (tfs + norms[slots])
+                matched = True
+
+            if not matched:
+                return []
+            if doc_type:
+                mask = self._type_masks.get(doc_type)
+                if mask is None:
+                    return []
+                scores[~mask] = 0.0
+
+            candidates = np.flatnonzero(scores > 0)
+            if limit and len(candidates) > limit:
+                top = np.argpartition(scores[candidates], -limit)[-limit:]
+                candidates = candidates[top]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            ranked = [(self._slot_keys[slot], float(scores[slot])) for slot in order]
+
+        results = []
+        for key, score in ranked:
+            kind, _, doc_id = key.partition(":")
+            results.append((kind, doc_id, round(score, 4)))
+        return results
@@ -0,0 +1,167 @@
+"""
+Submission similarity for HackaAIverse
+Hashed n-gram vectors and cosine nearest-neighbour search for duplicate detection
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Iterable, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class SimilarityIndex:
+    """Row-per-project matrix of L2-normalised hashed n-gram vectors"""
+
+    def __init__(self, vectors_path: str, n_features: int = 2048):
+        self.vectors_path = vectors_path
+        self.meta_path = f"{vectors_path}.json"
+        self.n_features = n_features
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.signature: Optional[List[int]] = None
+        self.matrix = np.zeros((0, n_features), dtype=np.float32)
+        self._lock = threading.RLock()
+        self._load()
+
+    # Vectorisation
+    def vectorize(self, texts: Iterable[str]) -> np.ndarray:
+        """Hash word unigrams/bigrams and character trigrams into unit-length rows"""
+        texts = list(texts)
+        rows = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD.findall((text or "").lower())
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            for word in words:
+                padded = f" {word} "
+                features.extend(f"#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+            if not features:
+                continue
+
+            hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features),
+                                 dtype=np.uint64, count=len(features))
+            buckets = (hashes % self.n_features).astype(np.int64)
+            # The top hash bit picks a sign so collisions cancel out on average
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(rows[row], buckets, signs)
+
+        # Sublinear term frequency, then cosine normalisation
+        rows = np.sign(rows) * np.log1p(np.abs(rows))
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return rows / norms
+
+    # Persistence
+    def _load(self):
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.vectors_path)):
+            return
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("n_features") != self.n_features:
+                return
+            vectors = np.fromfile(self.vectors_path, dtype=np.float32)
+            rows = len(meta["ids"])
+            self.matrix = vectors[:rows * self.n_features].reshape(rows, self.n_features).copy()
+            self.ids = list(meta["ids"])
+            self.positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+            self.signature = meta.get("signature")
+        except Exception as e:
+            print(f"Error loading similarity index {self.vectors_path}: {e}")
+            self.ids, self.positions, self.signature = [], {}, None
+            self.matrix = np.zeros((0, self.n_features), dtype=np.float32)
+
+    def _save_meta(self):
+        temp_path = f"{self.meta_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"n_features": self.n_features, "ids": self.ids, "signature": self.signature}, f)
+        os.replace(temp_path, self.meta_path)
+
+    def _save_all(self):
+        temp_path = f"{self.vectors_path}.tmp"
+        self.matrix.astype(np.float32).tofile(temp_path)
+        os.replace(temp_path, self.vectors_path)
+        self._save_meta()
+
+    # Maintenance
+    def is_current(self, signature: Optional[List[int]]) -> bool:
+        with self._lock:
+            return self.signature is not None and self.signature == signature
+
+    def rebuild(self, documents: Iterable[Tuple[str, str]], signature: Optional[List[int]]):
+        """Re-vectorise every document, e.g. after the projects file changed externally"""
+        documents = list(documents)
+        with self._lock:
+            self.ids = [doc_id for doc_id, _ in documents]
+            self.positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+            self.matrix = self.vectorize(text for _, text in documents)
+            self.signature = signature
+            try:
+                self._save_all()
+            except Exception as e:
+                print(f"Error saving similarity index {self.vectors_path}: {e}")
+
+    def upsert(self, doc_id: str, vector: np.ndarray, signature: Optional[List[int]] = None):
+        """Store one vector, writing only its row to disk"""
+        with self._lock:
+            position = self.positions.get(doc_id)
+            try:
+                if position is None:
+                    position = self.positions[doc_id] = len(self.ids)
+                    self.ids.append(doc_id)
+                    self.matrix = np.vstack([self.matrix, vector[None, :]])
+                else:
+                    self.matrix[position] = vector
+                mode = "r+b" if os.path.exists(self.vectors_path) else "wb"
+                with open(self.vectors_path, mode) as f:
+                    f.seek(position * self.n_features * 4)
+                    f.write(vector.astype(np.float32).tobytes())
+                if signature is not None:
+                    self.signature = signature
+                self._save_meta()
+            except Exception as e:
+                print(f"Error saving similarity index {self.vectors_path}: {e}")
+
+    # Queries
+    def nearest(self, vector: np.ndarray, k: int = 5, threshold: float = 0.0,
+                exclude: str = None) -> List[Tuple[str, float]]:
+        """Most similar stored documents to a vector, best first"""
+        with self._lock:
+            if not self.ids:
+                return []
+            scores = self.matrix @ vector
+            if exclude in self.positions:
+                scores[self.positions[exclude]] = -1.0
+            candidates = np.flatnonzero(scores >= threshold)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.ids[i], round(float(scores[i]), 4)) for i in order]
+
+    def similar_to(self, doc_id: str, k: int = 5, threshold: float = 0.0) -> List[Tuple[str, float]]:
+        with self._lock:
+            position = self.positions.get(doc_id)
+            if position is None:
+                return []
+            return self.nearest(self.matrix[position], k, threshold, exclude=doc_id)
+
+    def all_pairs(self, threshold: float, block_size: int = 1024) -> List[Tuple[str, str, float]]:
+        """Every pair at or above threshold, computed block by block to bound memory"""
+        with self._lock:
+            matrix, ids = self.matrix, list(self.ids)
+        pairs = []
+        n = len(ids)
+        for start in range(0, n, block_size):
+            block = matrix[start:start + block_size]
+            # Only the upper triangle: this block against itself and everything after it
+            scores = block @ matrix[start:].T
+            rows, cols = np.nonzero(np.triu(scores >= threshold, k=1))
+            for r, c in zip(rows, cols):
+                pairs.append((ids[start + r], ids[start + c], round(float(scores[r, c]), 4)))
+        pairs.sort(key=lambda pair: pair[2], reverse=True)
+        return pairs
@@ -0,0 +1,46 @@
+from event_store import EventStore
+
+
+def test_put_after_replace_overwrites_record(tmp_path):
+    store = EventStore(str(tmp_path / "events.jsonl"), str(tmp_path / "snapshots"))
+    store.append("teams_rewritten", "teams", records=[{"id": "a", "college": "IIT Delhi"},
+                                                     {"id": "b", "college": "DTU"}])
+    store.append("team_updated", "teams", {"id": "b", "college": "Delhi Technological University"})
+
+    teams = store.state_at()["teams"]
+    assert sorted(team["id"] for team in teams) == ["a", "b"]
+    assert {team["id"]: team["college"] for team in teams}["b"] == "Delhi Technological University"
+
+
+def test_replay_after_replace_matches_live_state(tmp_path):
+    store = EventStore(str(tmp_path / "events.jsonl"), str(tmp_path / "snapshots"), snapshot_every=2)
+    store.append("teams_rewritten", "teams", records=[{"id": "a", "status": "registered"}])
+    store.append("team_updated", "teams", {"id": "a", "status": "submitted"})
+    event = store.append("team_registered", "teams", {"id": "c", "status": "registered"})
+
+    replayed = store.state_at(event["timestamp"])["teams"]
+    reopened = EventStore(str(tmp_path / "events.jsonl"), str(tmp_path / "snapshots")).state_at()["teams"]
+    assert replayed == reopened == store.state_at()["teams"]
+    assert [team["status"] for team in replayed] == ["submitted", "registered"]
+
+
+def _scan(store):
+    return [event for event, _ in store._events_from(0)]
+
+
+def test_recent_and_history_match_a_full_scan(tmp_path):
+    events_path, snapshot_dir = str(tmp_path / "events.jsonl"), str(tmp_path / "snapshots")
+    store = EventStore(events_path, snapshot_dir, snapshot_every=7)
+    for i in range(40):
+        store.append("score_submitted", "scores", {"id": f"s{i % 5}", "total": i})
+    store.append_many("teams_imported", "teams", [{"id": f"t{i}"} for i in range(10)])
+    with open(events_path, "ab") as f:
+        f.write(b'{"seq": 51, "torn')  # crash mid-write
+
+    for reader in (store, EventStore(events_path, snapshot_dir, snapshot_every=7)):
+        everything = _scan(reader)
+        assert reader.recent(12, block_size=64) == list(reversed(everything))[:12]
+        assert reader.recent(1000, block_size=64) == list(reversed(everything))
+        assert reader.history("scores", "s3") == [e for e in everything
+                                                  if e["collection"] == "scores" and e["id"] == "s3"]
+        assert reader.history("teams", "missing") == []
@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+
+from adaptive_agent import ingest, storage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(ingest, "DATA_DIR", str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def applied(monkeypatch):
+    """Record what reaches each stage instead of touching the weight store and logs"""
+    calls = {"weights": [], "log": []}
+    monkeypatch.setattr(ingest, "update_weights", lambda events, alpha: calls["weights"].extend(e[0] for e in events))
+    monkeypatch.setattr(ingest, "log_feedback_rows", lambda rows: calls["log"].extend(row[1] for row in rows))
+    return calls
+
+
+def run(ingestor, *suggestion_ids):
+    # window=0 takes whatever is queued, so nothing below depends on timing
+    try:
+        for sid in suggestion_ids:
+            ingestor.submit(sid, "how do I deploy?", "Use Docker", 1)
+        assert ingestor.flush(timeout=30)
+    finally:
+        ingestor.close()
+
+
+def test_flush_returns_when_apply_keeps_failing(data_dir, monkeypatch):
+    attempts = []
+
+    def failing_apply(self, stage, events):
+        attempts.append(len(events))
+        raise RuntimeError("weights unavailable")
+
+    monkeypatch.setattr(ingest.FeedbackIngestor, "_apply", failing_apply)
+    ingestor = ingest.FeedbackIngestor(window=0, retries=1, retry_delay=0)
+    run(ingestor, "s1", "s2")
+
+    assert sum(attempts) == 2 * 2  # both events, first try plus one retry
+    with open(os.path.join(data_dir, "ingest-dead-letter.jsonl"), encoding="utf-8") as f:
+        dead = [json.loads(line)["pending"] for line in f]
+    assert [event[1] for entry in dead for event in entry["weights"]] == ["s1", "s2"]
+    assert [event[1] for entry in dead for event in entry["log"]] == ["s1", "s2"]
+    # Handled batches leave nothing behind to replay on the next start
+    assert not os.path.exists(ingestor.wal_path)
+
+
+def test_failed_log_stage_is_retried_without_reapplying_weights(data_dir, applied, monkeypatch):
+    log_rows = ingest.log_feedback_rows
+    failures = []
+
+    def flaky_log(rows):
+        if not failures:
+            failures.append(rows)
+            raise OSError("disk full")
+        log_rows(rows)
+
+    monkeypatch.setattr(ingest, "log_feedback_rows", flaky_log)
+    run(ingest.FeedbackIngestor(window=0, retries=1, retry_delay=0), "s1", "s2", "s3")
+
+    assert failures
+    assert applied["weights"] == ["s1", "s2", "s3"]
+    assert applied["log"] == ["s1", "s2", "s3"]
+    assert not os.path.exists(os.path.join(data_dir, "ingest-dead-letter.jsonl"))
+
+
+def test_replay_skips_stages_marked_done(data_dir, applied):
+    events = [["2024-08-15T10:00:00", sid, "how do I deploy?", "Use Docker", 1, None] for sid in ("s1", "s2", "s3")]
+    # A process died after applying the weights of its first two events
+    wal_path = os.path.join(data_dir, "ingest-0.wal")
+    with open(wal_path, "w", encoding="utf-8") as f:
+        for line in events[:2] + [{"done": "weights", "start": 0, "end": 2}] + events[2:]:
+            f.write(json.dumps(line) + "\n")
+
+    ingest.FeedbackIngestor(window=0).close()
+
+    assert applied["weights"] == ["s3"]
+    assert applied["log"] == ["s1", "s2", "s3"]
+    assert not os.path.exists(wal_path)
@@ -0,0 +1,51 @@
+import multiprocessing as mp
+import os
+import random
+
+from adaptive_agent import storage
+from adaptive_agent.tuner import clamp
+
+ALPHA = 0.05
+PROCESSES = 3
+UPDATES = 40
+
+
+def _worker(seed: int, data_root: str):
+    os.chdir(data_root)
+    from adaptive_agent.tuner import update_weight
+    from adaptive_agent.weight_store import get_store
+
+    rng = random.Random(seed)
+    # Few arms so the processes keep colliding on the same rows
+    ids = list(get_store().ids)[:3]
+    for _ in range(UPDATES):
+        update_weight(rng.choice(ids), rng.choice((1, -1)), alpha=ALPHA)
+    get_store().flush()
+
+
+def test_concurrent_processes_keep_weights_and_log_consistent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    initial = storage.load_weights().set_index("suggestion_id")["weight"].to_dict()
+
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=_worker, args=(seed, str(tmp_path))) for seed in range(PROCESSES)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        if p.is_alive():
+            p.terminate()
+    assert [p.exitcode for p in procs] == [0] * PROCESSES
+
+    final = storage.load_weights().set_index("suggestion_id")["weight"].to_dict()
+    log = storage.load_improvements()
+    assert len(log) == PROCESSES * UPDATES
+    assert not os.path.getsize(os.path.join(storage.DATA_DIR, "weights.csv.journal"))
+
+    # Every logged step starts where the previous one for that suggestion ended
+    replayed = dict(initial)
+    for sid, prev, reward, new in log[["suggestion_id", "prev_weight", "reward", "new_weight"]].itertuples(index=False):
+        assert abs(replayed[sid] - prev) < 1e-9
+        replayed[sid] = clamp(replayed[sid] + ALPHA * reward)
+        assert abs(replayed[sid] - new) < 1e-9
+    assert all(abs(final[sid] - replayed[sid]) < 1e-9 for sid in final)